@@ -0,0 +1,235 @@
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from cancellation import REQUESTS
+from fast_boot import lazy_import
+from memory_budget import MEMORY
+
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+
+# Parallel Aggregation Configuration
+AGGREGATION_CONFIG = {
+    # "1" runs large group-bys as partial aggregates over blocks of rows on a thread pool
+    'enabled': os.environ.get('DASH_PARALLEL_AGG', '') == '1',
+    'workers': int(os.environ.get('DASH_AGG_WORKERS', os.cpu_count() or 1)),
+    # Below this many rows one pandas group-by is faster than splitting
+    'min_rows': 200_000,
+    'min_partition_rows': 100_000,
+    # Largest key space kept as dense per-group arrays; larger ones go to pandas
+    'dense_limit': 2_000_000,
+    'functions': ('sum', 'count', 'mean', 'min', 'max', 'nunique', 'first')
+}
+
+def merge_partials(partials, func):
+    # Dense partials add up; min/max/first partials are sparse Series merged per group;
+    # distinct partials are sets of (group, value) pairs, as a bitmap or sorted array, merged by union
+    if func in ('sum', 'count', 'size'):
+        return sum(partials)
+    if func == 'nunique':
+        if partials[0].dtype == bool:
+            return np.logical_or.reduce(partials)
+        return np.unique(np.concatenate(partials))
+    merged = pd.concat(partials)
+    return merged.groupby(level=0).max() if func == 'max' else merged.groupby(level=0).min()
+
+class AggregationEngine:
+    # Group-bys over the loaded frame or rows of it (filter_data results): keys are integer-coded
+    # once per data version, so each partition only counts into arrays indexed by group number
+    def __init__(self, get_df):
+        self.get_df = get_df
+        self._lock = threading.Lock()
+        self._source = None
+        # Integer codes per column, evictable under the shared memory budget
+        self._codes = MEMORY.cache('key_codes')
+        self._pool = None
+        # id of a filtered frame -> the loaded frame its rows were selected from, while it lives
+        self._origins = {}
+
+    def codes(self, full, column):
+        with self._lock:
+            if self._source is not full:
+                self._codes.clear()
+                self._source = full
+        cached = self._codes.get(column)
+        if cached is None:
+            started = time.perf_counter()
+            codes, uniques = pd.factorize(full[column], sort=True)
+            cached = (codes.astype(np.int64), uniques)
+            with self._lock:
+                if self._source is full:
+                    self._codes.put(column, cached, time.perf_counter() - started)
+        return cached
+
+    def track(self, frame, source):
+        # Records which loaded frame a filter_data result was sliced from; its index holds row
+        # positions in that frame, which are only valid for the key codes of the same frame
+        if frame is not source:
+            self._origins[id(frame)] = source
+            weakref.finalize(frame, self._origins.pop, id(frame), None)
+        return frame
+
+    def pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=AGGREGATION_CONFIG['workers'],
+                                                thread_name_prefix='aggregate')
+            return self._pool
+
+    def aggregate(self, frame, keys, spec, rows_of=None):
+        # Same result as frame.groupby(keys).agg(spec).reset_index(). rows_of is the tracked
+        # frame whose rows frame has, when frame only adds columns to it
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        plan = self.plan(frame, keys, spec, frame if rows_of is None else rows_of)
+        if plan is None:
+            return frame.groupby(keys).agg(spec).reset_index()
+        return self.run(frame, keys, spec, *plan)
+
+    def plan(self, frame, keys, spec, rows_of):
+        if not AGGREGATION_CONFIG['enabled'] or len(frame) < AGGREGATION_CONFIG['min_rows']:
+            return None
+        full = self.get_df()
+        # Rows selected before a data refresh swapped the frame are left to pandas
+        if self._origins.get(id(rows_of), rows_of) is not full:
+            return None
+        if frame is full:
+            positions = None
+        elif isinstance(full.index, pd.RangeIndex) and full.index.start == 0 and full.index.step == 1:
+            positions = frame.index.to_numpy()
+        else:
+            return None
+        if any(k not in full.columns for k in keys):
+            return None
+        for funcs in spec.values():
+            funcs = funcs if isinstance(funcs, list) else [funcs]
+            if any(f not in AGGREGATION_CONFIG['functions'] for f in funcs):
+                return None
+        key_codes = [self.codes(full, k) for k in keys]
+        sizes = [max(len(uniques), 1) for _, uniques in key_codes]
+        if np.prod(sizes, dtype=float) > AGGREGATION_CONFIG['dense_limit']:
+            return None
+        return full, positions, key_codes, sizes
+
+    def run(self, frame, keys, spec, full, positions, key_codes, sizes):
+        groups = int(np.prod(sizes))
+        strides = [int(np.prod(sizes[i + 1:])) for i in range(len(sizes))]
+        columns = {column: (funcs if isinstance(funcs, list) else [funcs]) for column, funcs in spec.items()}
+        values = {column: frame[column].to_numpy() for column in columns}
+        # Value codes for distinct counts: cached per version for loaded columns, else per call
+        distinct = {}
+        for column, funcs in columns.items():
+            if 'nunique' in funcs:
+                if column in full.columns:
+                    codes, uniques = self.codes(full, column)
+                    distinct[column] = (codes, len(uniques), True)
+                else:
+                    codes, uniques = pd.factorize(frame[column])
+                    distinct[column] = (codes.astype(np.int64), len(uniques), False)
+
+        # Partitions run on pool threads, so they check the request that started them
+        checkpoint = REQUESTS.checkpoint()
+
+        def partial(bounds):
+            checkpoint('partition')
+            lo, hi = bounds
+            rows = positions[lo:hi] if positions is not None else slice(lo, hi)
+            code = np.zeros(hi - lo, dtype=np.int64)
+            valid = np.ones(hi - lo, dtype=bool)
+            for (codes, _), stride in zip(key_codes, strides):
+                part = codes[rows]
+                valid &= part >= 0
+                code += part * stride
+            # Missing keys drop out, as with groupby's dropna
+            code = code[valid]
+            result = {('', 'size'): np.bincount(code, minlength=groups)}
+            for column, funcs in columns.items():
+                column_values = values[column][lo:hi][valid]
+                if funcs == ['nunique']:
+                    present = None
+                elif column_values.dtype.kind in 'iub':
+                    present = slice(None)
+                elif column_values.dtype.kind == 'f':
+                    present = ~np.isnan(column_values)
+                elif column_values.dtype == object and column in full.columns:
+                    # Missing text has code -1, which is cheaper than scanning the objects
+                    present = self.codes(full, column)[0][rows][valid] >= 0
+                else:
+                    present = ~pd.isna(column_values)
+                if 'count' in funcs or 'mean' in funcs:
+                    result[(column, 'count')] = np.bincount(code[present], minlength=groups)
+                if 'sum' in funcs or 'mean' in funcs:
+                    result[(column, 'sum')] = np.bincount(code[present], weights=column_values[present].astype(float),
+                                                          minlength=groups)
+                for func in ('min', 'max'):
+                    if func in funcs:
+                        series = pd.Series(column_values[present]).groupby(code[present])
+                        result[(column, func)] = series.min() if func == 'min' else series.max()
+                if 'first' in funcs:
+                    # Earliest non-missing row per group, as a position in the frame
+                    order = np.arange(lo, hi)[valid][present]
+                    result[(column, 'first')] = pd.Series(order).groupby(code[present]).min()
+                if 'nunique' in funcs:
+                    codes, n_values, in_full = distinct[column]
+                    value_codes = codes[rows] if in_full else codes[lo:hi]
+                    value_codes = value_codes[valid]
+                    counted = value_codes >= 0
+                    n_values = max(n_values, 1)
+                    pairs = code[counted] * n_values + value_codes[counted]
+                    if groups * n_values <= AGGREGATION_CONFIG['dense_limit']:
+                        # Small enough for a bitmap of seen (group, value) pairs
+                        result[(column, 'nunique')] = (np.bincount(pairs, minlength=groups * n_values) > 0, n_values)
+                    else:
+                        result[(column, 'nunique')] = (np.unique(pairs), n_values)
+            return result
+
+        n_partitions = max(1, min(AGGREGATION_CONFIG['workers'], len(frame) // AGGREGATION_CONFIG['min_partition_rows']))
+        edges = np.linspace(0, len(frame), n_partitions + 1).astype(int)
+        bounds = list(zip(edges[:-1], edges[1:]))
+        partials = list(self.pool().map(partial, bounds)) if n_partitions > 1 else [partial(bounds[0])]
+        checkpoint('merge')
+
+        merged = {}
+        for name in partials[0]:
+            if name[1] == 'nunique':
+                seen, n_values = merge_partials([p[name][0] for p in partials], 'nunique'), partials[0][name][1]
+                if seen.dtype == bool:
+                    merged[name] = seen.reshape(groups, n_values).sum(axis=1)
+                else:
+                    merged[name] = np.bincount(seen // n_values, minlength=groups)
+            else:
+                merged[name] = merge_partials([p[name] for p in partials], name[1])
+
+        # Groups that had at least one row, in sorted key order like groupby
+        present = np.flatnonzero(merged[('', 'size')])
+        out = {}
+        for key, (_, uniques), stride, size in zip(keys, key_codes, strides, sizes):
+            out[key] = np.asarray(uniques)[(present // stride) % size]
+        # A list of functions for any column gives every column a (column, function) name
+        multi = any(isinstance(funcs, list) for funcs in spec.values())
+        for column, funcs in columns.items():
+            dtype = frame[column].dtype
+            for func in funcs:
+                if func == 'sum':
+                    result = merged[(column, 'sum')][present]
+                    if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+                        result = result.astype(np.int64)
+                elif func == 'mean':
+                    with np.errstate(invalid='ignore', divide='ignore'):
+                        result = merged[(column, 'sum')][present] / merged[(column, 'count')][present]
+                elif func in ('count', 'nunique'):
+                    result = merged[(column, func)][present]
+                elif func == 'first':
+                    first = merged[(column, 'first')].reindex(present)
+                    result = frame[column].iloc[first.fillna(0).astype(np.int64).to_numpy()].to_numpy()
+                    if first.isna().any():
+                        result = pd.Series(result).where(first.notna().to_numpy()).to_numpy()
+                else:
+                    result = merged[(column, func)].reindex(present).to_numpy()
+                out[(column, func) if multi else column] = result
+
+        if multi:
+            out = {name if isinstance(name, tuple) else (name, ''): value for name, value in out.items()}
+        return pd.DataFrame(out)
@@ -0,0 +1,235 @@
+import functools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from fast_boot import lazy_import
+from memory_budget import MEMORY
+
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+
+# Approximate Query Configuration
+APPROX_CONFIG = {
+    # "1" answers the summary callbacks from a stratified sample first, then refines exactly
+    'enabled': os.environ.get('DASH_APPROXIMATE', '') == '1',
+    # Histories smaller than this are always answered exactly
+    'min_rows': int(os.environ.get('DASH_APPROX_MIN_ROWS', 500_000)),
+    # Time one sampled aggregation may take; the sample grows or shrinks to fit it
+    'latency_budget_seconds': float(os.environ.get('DASH_APPROX_BUDGET_MS', 100)) / 1000,
+    'initial_fraction': 0.01,
+    'min_fraction': 0.001,
+    'max_fraction': 0.25,
+    # Every stratum keeps at least this many rows, so small strata still have a variance estimate
+    'min_per_stratum': 5,
+    'strata': ['Region', 'Category', 'Month Year'],
+    'columns': ['Order Date', 'Month Year', 'Region', 'Category', 'Sub-Category', 'Segment',
+                'Sales', 'Profit', 'Quantity'],
+    # 95% confidence intervals
+    'z': 1.96,
+    # How often the browser polls for the exact result
+    'refine_interval_ms': 250,
+    'seed': 42
+}
+
+_mode = threading.local()
+
+@contextmanager
+def exact_only():
+    # Used by the background refinement so the same callback body computes the exact answer
+    _mode.exact = True
+    try:
+        yield
+    finally:
+        _mode.exact = False
+
+def exact_requested():
+    return getattr(_mode, 'exact', False)
+
+def approximate_active(n_rows):
+    return (APPROX_CONFIG['enabled'] and not exact_requested() and
+            n_rows >= APPROX_CONFIG['min_rows'])
+
+class StratifiedSampler:
+    # Each row gets a fixed random priority once per data version, so resizing the sample is a
+    # mask over the priorities rather than a new pass over the strata
+    def __init__(self, get_df):
+        self.get_df = get_df
+        self.fraction = APPROX_CONFIG['initial_fraction']
+        self.throughput = None
+        self._rates = deque(maxlen=20)
+        self._lock = threading.RLock()
+        self._resizing = False
+        self._source = None
+        self._sample = None
+        self._memory = MEMORY.cache('approximate_sample')
+
+    def _account(self, seconds):
+        # The sampler keeps its per-row arrays and the current sample itself; they are counted
+        # against the memory budget but not evicted
+        self._memory.put('sample', (self._codes, self._priority, self._rank, self._sample), seconds, pinned=True)
+
+    def _prepare(self, df):
+        codes = df.groupby(APPROX_CONFIG['strata'], sort=False, observed=True).ngroup().to_numpy()
+        priority = np.random.default_rng(APPROX_CONFIG['seed']).random(len(df))
+
+        # Rank of each row inside its stratum by priority
+        order = np.lexsort((priority, codes))
+        sorted_codes = codes[order]
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+        counts = np.diff(np.r_[starts, len(df)])
+        rank = np.empty(len(df), dtype=np.int64)
+        rank[order] = np.arange(len(df)) - np.repeat(starts, counts)
+
+        self._source = df
+        self._codes = codes
+        self._priority = priority
+        self._rank = rank
+        self._stratum_sizes = np.bincount(codes)
+
+    def _draw(self, fraction):
+        mask = (self._priority < fraction) | (self._rank < APPROX_CONFIG['min_per_stratum'])
+        codes = self._codes[mask]
+        sampled = np.bincount(codes, minlength=len(self._stratum_sizes))
+        sample = self._source.loc[mask, APPROX_CONFIG['columns']].reset_index(drop=True)
+        sample['_stratum'] = codes
+        return {'frame': sample, 'sampled': sampled, 'sizes': self._stratum_sizes, 'fraction': fraction}
+
+    def sample(self):
+        df = self.get_df()
+        with self._lock:
+            if self._source is not df:
+                started = time.perf_counter()
+                self._prepare(df)
+                self._sample = self._draw(self.fraction)
+                self._account(time.perf_counter() - started)
+            return self._sample
+
+    def warm_async(self):
+        threading.Thread(target=self.sample, name='sample-warmup', daemon=True).start()
+
+    def _adapt(self, sample, elapsed):
+        # Sized so the slowest recent query shape (grouped estimates cost more than plain
+        # totals) still fits the budget
+        self._rates.append(len(sample['frame']) / max(elapsed, 1e-6))
+        self.throughput = min(self._rates)
+        target = APPROX_CONFIG['latency_budget_seconds'] * self.throughput / len(self._source)
+        target = min(max(target, APPROX_CONFIG['min_fraction']), APPROX_CONFIG['max_fraction'])
+        if self._resizing or 0.5 <= target / self.fraction <= 2:
+            return
+        self._resizing = True
+        threading.Thread(target=self._resize, args=(target,), name='sample-resize', daemon=True).start()
+
+    def _resize(self, fraction):
+        try:
+            with self._lock:
+                source = self._source
+            resized = self._draw(fraction)
+            with self._lock:
+                if self._source is source:
+                    self._sample = resized
+                    self.fraction = fraction
+                    self._account(0.0)
+        finally:
+            self._resizing = False
+
+    def estimate(self, group_by, columns, start_date=None, end_date=None, regions=None,
+                 categories=None, ratio=None):
+        # Stratified estimates of column totals per group, with 95% margins of error.
+        # "Rows" counts rows; ratio=(numerator, denominator) adds a ratio estimate as "Ratio"
+        started = time.perf_counter()
+        sample = self.sample()
+        frame = sample['frame']
+
+        in_domain = np.ones(len(frame), dtype=bool)
+        if start_date and end_date:
+            in_domain &= ((frame['Order Date'] >= start_date) & (frame['Order Date'] <= end_date)).to_numpy()
+        if regions:
+            in_domain &= frame['Region'].isin(regions).to_numpy()
+        if categories:
+            in_domain &= frame['Category'].isin(categories).to_numpy()
+        domain = frame[in_domain]
+
+        values = {}
+        for column in columns:
+            values[column] = np.ones(len(domain)) if column == 'Rows' else domain[column].to_numpy(dtype=float)
+        result = self._totals(domain, sample, values, group_by)
+
+        if ratio is not None:
+            numerator, denominator = ratio
+            result['Ratio'] = result[numerator] / result[denominator]
+            # Linearized variance: the total of residuals y - R * x carries the ratio's error
+            r = result['Ratio'].to_numpy() if not group_by else domain[group_by].merge(
+                result[group_by + ['Ratio']], how='left', on=group_by)['Ratio'].to_numpy()
+            residuals = self._totals(domain, sample, {'Residual': (
+                domain[numerator].to_numpy(dtype=float) - r * domain[denominator].to_numpy(dtype=float))}, group_by)
+            result['Ratio MOE'] = residuals['Residual MOE'].to_numpy() / result[denominator].abs().to_numpy()
+
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._adapt(sample, elapsed)
+        result.attrs['sample_rows'] = len(frame)
+        result.attrs['sample_fraction'] = sample['fraction']
+        return result
+
+    def _totals(self, domain, sample, values, group_by):
+        # Horvitz-Thompson per stratum: total = sum N_h / n_h * y, variance from the within-stratum
+        # variance of y * 1[row in domain and group], with the finite population correction
+        keys = ['_stratum'] + list(group_by)
+        sums = pd.DataFrame({name: v for name, v in values.items()}, index=domain.index)
+        squares = sums.pow(2).add_suffix(' sq')
+        grouped = pd.concat([domain[keys], sums, squares], axis=1).groupby(keys, observed=True).sum()
+
+        strata = grouped.index.get_level_values('_stratum').to_numpy()
+        N = sample['sizes'][strata].astype(float)
+        n = sample['sampled'][strata].astype(float)
+        weight = N / n
+        fpc = np.clip(1 - n / N, 0, 1)
+
+        parts = {}
+        for name in values:
+            s1 = grouped[name].to_numpy()
+            s2 = grouped[name + ' sq'].to_numpy()
+            variance = np.where(n > 1, (s2 - s1 ** 2 / n) / np.maximum(n - 1, 1), 0.0)
+            parts[name] = weight * s1
+            parts[name + ' var'] = N ** 2 * fpc * np.maximum(variance, 0) / n
+        parts = pd.DataFrame(parts, index=grouped.index)
+
+        if group_by:
+            totals = parts.groupby(level=list(group_by), observed=True).sum().reset_index()
+        else:
+            totals = parts.sum().to_frame().T
+        for name in values:
+            totals[name + ' MOE'] = APPROX_CONFIG['z'] * np.sqrt(totals.pop(name + ' var'))
+        return totals
+
+def register_exact_refinement(app, func, outputs, inputs, get_df, cached=None):
+    # Same inputs, duplicated outputs: the exact result is computed in a background worker and
+    # replaces the approximate one when it lands. cached(name, args) returns an exact result
+    # the server already holds (None if it has none), which then needs no second computation
+    from dash import Output
+    from dash.exceptions import PreventUpdate
+
+    @functools.wraps(func)
+    def refine(*args):
+        if not approximate_active(len(get_df())):
+            # The regular callback already answered exactly
+            raise PreventUpdate
+        if cached is not None:
+            result = cached(func.__name__, list(args))
+            if result is not None:
+                return result
+        with exact_only():
+            return func(*args)
+
+    dash_outputs = [Output(component_id, prop, allow_duplicate=True) for component_id, prop in outputs]
+    app.callback(
+        dash_outputs if len(dash_outputs) > 1 else dash_outputs[0],
+        inputs,
+        background=True,
+        interval=APPROX_CONFIG['refine_interval_ms'],
+        prevent_initial_call='initial_duplicate'
+    )(refine)
+    return refine
@@ -0,0 +1,13 @@
+// Numbers the callback requests of this page load, so the server can skip requests the
+// renderer has already replaced (DASH_CANCEL_SUPERSEDED=1, see app/cancellation.py).
+
+(function () {
+    var page = Date.now().toString(36) + Math.random().toString(36).slice(2);
+    var sequence = 0;
+    window.dashCancellation = {
+        requestPre: function (payload) {
+            payload.cancelPage = page;
+            payload.cancelSequence = ++sequence;
+        }
+    };
+})();
@@ -0,0 +1,225 @@
+// Clientside filtering over the aggregate store built by clientside.py (DASH_CLIENTSIDE=1).
+// Each function mirrors the server callback of the same view in dashboard.py.
+
+(function () {
+    var noUpdate = function () { return window.dash_clientside.no_update; };
+
+    function lastDayOfMonth(date) {
+        var year = parseInt(date.slice(0, 4), 10);
+        var month = parseInt(date.slice(5, 7), 10);
+        return new Date(Date.UTC(year, month, 0)).getUTCDate();
+    }
+
+    // The first and last month a date range covers, or null when it cuts through a month and
+    // only the row-level data on the server can answer it
+    function monthRange(store, startDate, endDate) {
+        // Dates only filter when both are set, as in filter_data
+        if (!startDate || !endDate) {
+            return {first: null, last: null};
+        }
+        var start = startDate.slice(0, 10);
+        var end = endDate.slice(0, 10);
+        var startAligned = start <= store.min_date || start.slice(8, 10) === '01';
+        var endAligned = end >= store.max_date || parseInt(end.slice(8, 10), 10) === lastDayOfMonth(end);
+        if (!startAligned || !endAligned) {
+            return null;
+        }
+        return {first: start.slice(0, 7), last: end.slice(0, 7)};
+    }
+
+    function codeSet(values, selected) {
+        if (!selected || !selected.length) {
+            return null;
+        }
+        var codes = {};
+        selected.forEach(function (value) {
+            var code = values.indexOf(value);
+            if (code >= 0) {
+                codes[code] = true;
+            }
+        });
+        return codes;
+    }
+
+    // Indices of the aggregate rows inside the filters, or null when they need the server
+    function selectRows(store, startDate, endDate, regions, categories) {
+        if (!store) {
+            return null;
+        }
+        var range = monthRange(store, startDate, endDate);
+        if (range === null) {
+            return null;
+        }
+        var months = store.values['Month Year'];
+        var columns = store.columns;
+        var regionCodes = codeSet(store.values.Region, regions);
+        var categoryCodes = codeSet(store.values.Category, categories);
+        var rows = [];
+        for (var i = 0; i < columns.Rows.length; i++) {
+            var month = months[columns['Month Year'][i]];
+            if ((range.first !== null && month < range.first) || (range.last !== null && month > range.last)) {
+                continue;
+            }
+            if (regionCodes && !regionCodes[columns.Region[i]]) {
+                continue;
+            }
+            if (categoryCodes && !categoryCodes[columns.Category[i]]) {
+                continue;
+            }
+            rows.push(i);
+        }
+        return rows;
+    }
+
+    // Sums of the measures per value of one dimension, in the dimension's sorted order
+    function groupSums(store, rows, dimension, measures) {
+        var groups = {};
+        rows.forEach(function (i) {
+            var code = store.columns[dimension][i];
+            var group = groups[code];
+            if (!group) {
+                group = groups[code] = {};
+                measures.forEach(function (m) { group[m] = 0; });
+            }
+            measures.forEach(function (m) { group[m] += store.columns[m][i]; });
+        });
+        var codes = Object.keys(groups).map(Number).sort(function (a, b) { return a - b; });
+        return codes.map(function (code) {
+            var group = groups[code];
+            group.label = store.values[dimension][code];
+            return group;
+        });
+    }
+
+    function formatNumber(value, decimals) {
+        return value.toLocaleString('en-US', {minimumFractionDigits: decimals, maximumFractionDigits: decimals});
+    }
+
+    function layout(store, title, extra) {
+        return Object.assign({template: store.template, title: {text: title}, legend: {tracegroupgap: 0}}, extra);
+    }
+
+    function kpiCards(store, startDate, endDate, regions, categories) {
+        var rows = selectRows(store, startDate, endDate, regions, categories);
+        if (rows === null) {
+            return [noUpdate(), noUpdate(), noUpdate(), noUpdate()];
+        }
+        var sales = 0, profit = 0, orders = 0;
+        rows.forEach(function (i) {
+            sales += store.columns.Sales[i];
+            profit += store.columns.Profit[i];
+            orders += store.columns.Rows[i];
+        });
+        var margin = profit / sales * 100;
+        return ['$' + formatNumber(sales, 2),
+                '$' + formatNumber(profit, 2),
+                formatNumber(orders, 0),
+                (isNaN(margin) ? 'nan' : margin.toFixed(1)) + '%'];
+    }
+
+    function salesTrend(store, startDate, endDate, regions, categories) {
+        var rows = selectRows(store, startDate, endDate, regions, categories);
+        if (rows === null) {
+            return noUpdate();
+        }
+        var monthly = groupSums(store, rows, 'Month Year', ['Sales']);
+        return {
+            data: [{
+                type: 'scatter',
+                mode: 'lines',
+                x: monthly.map(function (g) { return g.label; }),
+                y: monthly.map(function (g) { return g.Sales; }),
+                showlegend: false,
+                hovertemplate: 'Month Year=%{x}<br>Sales=%{y}<extra></extra>'
+            }],
+            layout: layout(store, 'Monthly Sales Trend', {
+                xaxis: {title: {text: 'Month'}},
+                yaxis: {title: {text: 'Sales ($)'}},
+                hovermode: 'x unified',
+                showlegend: true
+            })
+        };
+    }
+
+    function regionalSales(store, startDate, endDate, categories) {
+        var rows = selectRows(store, startDate, endDate, null, categories);
+        if (rows === null) {
+            return noUpdate();
+        }
+        var regional = groupSums(store, rows, 'Region', ['Sales', 'Profit']);
+        var regions = regional.map(function (g) { return g.label; });
+        return {
+            data: ['Sales', 'Profit'].map(function (measure) {
+                return {
+                    type: 'bar',
+                    name: measure,
+                    legendgroup: measure,
+                    offsetgroup: measure,
+                    x: regions,
+                    y: regional.map(function (g) { return g[measure]; }),
+                    hovertemplate: 'variable=' + measure + '<br>Region=%{x}<br>value=%{y}<extra></extra>'
+                };
+            }),
+            layout: layout(store, 'Sales and Profit by Region', {
+                barmode: 'group',
+                xaxis: {title: {text: 'Region'}},
+                yaxis: {title: {text: 'value'}},
+                legend: {title: {text: 'variable'}, tracegroupgap: 0}
+            })
+        };
+    }
+
+    function categoryPerformance(store, startDate, endDate, regions) {
+        var rows = selectRows(store, startDate, endDate, regions, null);
+        if (rows === null) {
+            return noUpdate();
+        }
+        var categories = groupSums(store, rows, 'Category', ['Sales']);
+        var ids = [], labels = [], parents = [], values = [];
+        categories.forEach(function (category) {
+            var inCategory = rows.filter(function (i) {
+                return store.values.Category[store.columns.Category[i]] === category.label;
+            });
+            groupSums(store, inCategory, 'Sub-Category', ['Sales']).forEach(function (sub) {
+                ids.push(category.label + '/' + sub.label);
+                labels.push(sub.label);
+                parents.push(category.label);
+                values.push(sub.Sales);
+            });
+            ids.push(category.label);
+            labels.push(category.label);
+            parents.push('');
+            values.push(category.Sales);
+        });
+        return {
+            data: [{
+                type: 'sunburst',
+                ids: ids,
+                labels: labels,
+                parents: parents,
+                values: values,
+                branchvalues: 'total',
+                hovertemplate: 'labels=%{label}<br>Sales=%{value}<br>parent=%{parent}<br>id=%{id}<extra></extra>'
+            }],
+            layout: layout(store, 'Category and Sub-Category Performance', {})
+        };
+    }
+
+    // Forwards the filters to the server fallbacks only when the aggregate cannot answer them
+    function routeFilters(store, startDate, endDate, regions, categories) {
+        if (!store || monthRange(store, startDate, endDate) !== null) {
+            return noUpdate();
+        }
+        return {start_date: startDate, end_date: endDate, regions: regions, categories: categories};
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        aggregates: {
+            kpiCards: kpiCards,
+            salesTrend: salesTrend,
+            regionalSales: regionalSales,
+            categoryPerformance: categoryPerformance,
+            routeFilters: routeFilters
+        }
+    });
+})();
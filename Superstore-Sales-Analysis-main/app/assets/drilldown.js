@@ -0,0 +1,20 @@
+// Order drill-down table helpers; both run in the browser so they add no server round trip.
+
+(function () {
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        drilldown: {
+            // Any change of what the table shows starts again on the first page
+            firstPage: function () {
+                return 0;
+            },
+            // Clicking a customer in the top customers chart lists that customer's orders
+            customerOrders: function (clickData) {
+                if (!clickData || !clickData.points || !clickData.points.length) {
+                    return window.dash_clientside.no_update;
+                }
+                var name = String(clickData.points[0].x).replace(/"/g, '\\"');
+                return '{Customer Name} eq "' + name + '"';
+            }
+        }
+    });
+})();
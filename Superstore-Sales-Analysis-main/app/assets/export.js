@@ -0,0 +1,24 @@
+// Keeps the export links in step with the filters; mirrors export_url in export.py.
+
+(function () {
+    function exportUrl(route, format, startDate, endDate, regions, categories) {
+        var params = [['format', format]];
+        if (startDate && endDate) {
+            params.push(['start_date', startDate.slice(0, 10)], ['end_date', endDate.slice(0, 10)]);
+        }
+        (regions || []).forEach(function (region) { params.push(['region', region]); });
+        (categories || []).forEach(function (category) { params.push(['category', category]); });
+        return route + '?' + params.map(function (p) {
+            return encodeURIComponent(p[0]) + '=' + encodeURIComponent(p[1]);
+        }).join('&');
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        exports: {
+            orderLinks: function (startDate, endDate, regions, categories, route) {
+                return [exportUrl(route, 'csv', startDate, endDate, regions, categories),
+                        exportUrl(route, 'parquet', startDate, endDate, regions, categories)];
+            }
+        }
+    });
+})();
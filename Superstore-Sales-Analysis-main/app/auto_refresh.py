@@ -0,0 +1,219 @@
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from fast_boot import lazy_import
+from result_cache import FILTER_NAMES
+
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+
+# Auto-Refresh Configuration
+REFRESH_CONFIG = {
+    # "1" reloads the data when its source changes and has open dashboards pick it up
+    'enabled': os.environ.get('DASH_AUTO_REFRESH', '') == '1',
+    # How often each browser asks for the data version, and how often the source is checked
+    'poll_seconds': float(os.environ.get('DASH_REFRESH_SECONDS', 10)),
+    'check_seconds': float(os.environ.get('DASH_REFRESH_CHECK_SECONDS', 5)),
+    'route': '/_data-version',
+    # Columns that identify an order line when working out which rows a reload changed
+    'row_key': ['Order ID', 'Product ID', 'Order Date', 'Region', 'Category', 'Sales', 'Quantity',
+                'Discount', 'Profit'],
+    # Deltas kept for clients that missed a few polls
+    'history': 50
+}
+
+def changed_rows(old_df, new_df):
+    # Rows added or removed by a reload, found by hashing each row's key columns; None when
+    # the row counts do not add up (e.g. a copy of an existing row), so nothing can be skipped
+    columns = [c for c in REFRESH_CONFIG['row_key'] if c in old_df.columns and c in new_df.columns]
+    old_hashes = pd.util.hash_pandas_object(old_df[columns], index=False).to_numpy()
+    new_hashes = pd.util.hash_pandas_object(new_df[columns], index=False).to_numpy()
+    added = new_df.loc[~np.isin(new_hashes, old_hashes)]
+    removed = old_df.loc[~np.isin(old_hashes, new_hashes)]
+    if len(new_df) - len(old_df) != len(added) - len(removed):
+        return None
+    return pd.concat([added, removed])
+
+def summarize_delta(rows):
+    if rows is None:
+        return None
+    if rows.empty:
+        return {'rows': 0}
+    return {
+        'rows': len(rows),
+        'start_date': rows['Order Date'].min().strftime('%Y-%m-%d'),
+        'end_date': rows['Order Date'].max().strftime('%Y-%m-%d'),
+        'regions': set(rows['Region'].unique()),
+        'categories': set(rows['Category'].unique())
+    }
+
+def affects(delta, state):
+    # Whether rows in the delta can fall inside a callback's filters
+    if delta is None:
+        return True
+    if not delta['rows']:
+        return False
+    start_date, end_date = state.get('start_date'), state.get('end_date')
+    if start_date and end_date and (delta['end_date'] < str(start_date)[:10] or
+                                    delta['start_date'] > str(end_date)[:10]):
+        return False
+    if state.get('regions') and not delta['regions'] & set(state['regions']):
+        return False
+    if state.get('categories') and not delta['categories'] & set(state['categories']):
+        return False
+    return True
+
+class AutoRefresh:
+    def __init__(self, get_df, source_version, load, publish):
+        self.get_df = get_df
+        self.source_version = source_version
+        # load reads the new frame; publish(new_df, changed rows) swaps it in
+        self.load = load
+        self.publish = publish
+        self._changes = OrderedDict()
+        self._lock = threading.Lock()
+        self._check_lock = threading.Lock()
+        self._watcher_pid = None
+
+    def version(self):
+        # The source's version, not the loaded frame's: workers reload at different times, and
+        # a client polling several of them must not flip between versions
+        return self.source_version()
+
+    def record(self, previous, version, delta):
+        with self._lock:
+            self._changes[version] = (previous, delta)
+            while len(self._changes) > REFRESH_CONFIG['history']:
+                self._changes.popitem(last=False)
+
+    def delta_between(self, previous, version):
+        # Union of the deltas from previous to version, or None when the chain is unknown
+        # (server restarted, or the client is older than the history)
+        deltas = []
+        with self._lock:
+            while version != previous:
+                if version not in self._changes:
+                    return None
+                version, delta = self._changes[version]
+                if delta is None:
+                    return None
+                deltas.append(delta)
+        deltas = [d for d in deltas if d['rows']]
+        if not deltas:
+            return {'rows': 0}
+        return {
+            'rows': sum(d['rows'] for d in deltas),
+            'start_date': min(d['start_date'] for d in deltas),
+            'end_date': max(d['end_date'] for d in deltas),
+            'regions': set().union(*(d['regions'] for d in deltas)),
+            'categories': set().union(*(d['categories'] for d in deltas))
+        }
+
+    def check(self):
+        # Run by the watcher and by requests that need the current version; one load at a time
+        if self.source_version() == self.get_df().attrs.get('version'):
+            return False
+        with self._check_lock:
+            return self._check()
+
+    def _check(self):
+        old_df = self.get_df()
+        if self.source_version() == old_df.attrs.get('version'):
+            return False
+        new_df = self.load()
+        if new_df is None:
+            return False
+        rows = changed_rows(old_df, new_df)
+        self.publish(new_df, rows)
+        delta = summarize_delta(rows)
+        self.record(old_df.attrs.get('version'), new_df.attrs.get('version'), delta)
+        print(f"Data reloaded: version {new_df.attrs.get('version')}, "
+              f"{delta['rows'] if delta else 'unknown number of'} rows changed")
+        return True
+
+    def _watch(self):
+        while True:
+            time.sleep(REFRESH_CONFIG['check_seconds'])
+            try:
+                self.check()
+            except Exception as e:
+                print(f"Error checking for new data: {str(e)}")
+
+    def ensure_watcher(self):
+        # One watcher per process; forked workers start their own on their first request
+        if self._watcher_pid != os.getpid():
+            self._watcher_pid = os.getpid()
+            threading.Thread(target=self._watch, name='data-watcher', daemon=True).start()
+
+def install_auto_refresh(app, refresh):
+    # Installed before the other callback hooks, so its gate is the outermost wrapper: a callback
+    # whose filters the new rows cannot reach returns no_update without running at all
+    import dash
+    from dash import Output, Input, State, callback_context
+    from dash.exceptions import PreventUpdate
+
+    register_callback = app.callback
+
+    # Registered before the hook below, so it does not depend on its own output
+    @register_callback(
+        [Output('data-version', 'data'),
+         Output('data-change', 'data')],
+        Input('refresh-interval', 'n_intervals'),
+        State('data-version', 'data')
+    )
+    def poll_data_version(_, known_version):
+        version = refresh.version()
+        if known_version == version:
+            raise PreventUpdate
+        # This worker may not have reloaded yet; the figures the client asks for next must
+        # come from the version it is told about
+        refresh.check()
+        if known_version is None:
+            # First poll after the page loaded: the figures are already current
+            return version, dash.no_update
+        return version, {'previous': known_version, 'version': version}
+
+    def callback(*args, **kwargs):
+        if kwargs.get('background') or 'inputs' in kwargs or len(args) < 2:
+            return register_callback(*args, **kwargs)
+
+        outputs = args[0]
+        dependencies = []
+        for arg in args[1:]:
+            dependencies.extend(arg if isinstance(arg, (list, tuple)) else [arg])
+        inputs = [d for d in dependencies if isinstance(d, Input)]
+        states = [d for d in dependencies if isinstance(d, State)]
+        names = [FILTER_NAMES.get((d.component_id, d.component_property)) for d in inputs + states]
+        decorator = register_callback(outputs, inputs + [Input('data-change', 'data')], states, **kwargs)
+        no_update = [dash.no_update] * len(outputs) if isinstance(outputs, list) else dash.no_update
+
+        def register(func):
+            @functools.wraps(func)
+            def gate(*values):
+                change = values[len(inputs)]
+                values = values[:len(inputs)] + values[len(inputs) + 1:]
+                if change:
+                    # Another worker announced the version; catch up before answering
+                    refresh.check()
+                if change and set(callback_context.triggered_prop_ids) == {'data-change.data'}:
+                    state = {name: value for name, value in zip(names, values) if name}
+                    if not affects(refresh.delta_between(change['previous'], change['version']), state):
+                        return no_update
+                return func(*values)
+            return decorator(gate)
+        return register
+
+    app.callback = callback
+
+    @app.server.route(REFRESH_CONFIG['route'])
+    def data_version():
+        return {'version': refresh.version()}
+
+    @app.server.before_request
+    def start_data_watcher():
+        refresh.ensure_watcher()
+
+    return app
@@ -0,0 +1,132 @@
+import functools
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import flask
+from dash.exceptions import PreventUpdate
+
+from instrumentation import METRICS, STAGE_CHECKS, Counter
+
+# Cancellation Configuration
+CANCELLATION_CONFIG = {
+    # "1" skips callback requests the browser has already replaced with a newer one
+    'enabled': os.environ.get('DASH_CANCEL_SUPERSEDED', '') == '1',
+    # Fields the renderer hook in assets/cancellation.js adds to every callback request
+    'page_field': 'cancelPage',
+    'sequence_field': 'cancelSequence',
+    # Latest sequence numbers kept per worker, for the most recently active (page, output) pairs
+    'max_entries': 10000
+}
+
+SUPERSEDED = Counter('dash_superseded_total', "Callback requests abandoned for a newer request of the same page "
+                     "and output, by where they stopped", ('callback', 'stage'))
+METRICS.append(SUPERSEDED)
+
+# Dash's default renderer, with the hook that numbers each callback request of a page load
+RENDERER = 'var renderer = new DashRenderer({request_pre: window.dashCancellation.requestPre});'
+
+class Superseded(PreventUpdate):
+    # The browser discards responses to requests it has since sent again, so answering this
+    # one with no update loses nothing
+    pass
+
+class RequestSequencer:
+    # Every page load numbers its callback requests; a worker remembers the latest number seen
+    # per (page, output). A request whose number is lower stops at its next stage boundary,
+    # or before it starts if the newer one arrived first
+    def __init__(self):
+        self._latest = OrderedDict()
+        self._lock = threading.Lock()
+        self._current = threading.local()
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._latest = OrderedDict()
+        self._lock = threading.Lock()
+
+    def begin(self, name):
+        # The (callback, slot, sequence) token of the request being served, or None outside
+        # callback requests (warm-ups, refinements) and for pages without the renderer hook
+        if not flask.has_request_context():
+            return None
+        body = flask.request.get_json(silent=True) or {}
+        page = body.get(CANCELLATION_CONFIG['page_field'])
+        sequence = body.get(CANCELLATION_CONFIG['sequence_field'])
+        if page is None or not isinstance(sequence, int):
+            return None
+        slot = (page, body.get('output'))
+        with self._lock:
+            latest = self._latest.get(slot, -1)
+            if sequence > latest:
+                self._latest[slot] = sequence
+                self._latest.move_to_end(slot)
+                while len(self._latest) > CANCELLATION_CONFIG['max_entries']:
+                    self._latest.popitem(last=False)
+        return name, slot, sequence
+
+    def token(self):
+        return getattr(self._current, 'token', None)
+
+    def superseded(self, token):
+        return token is not None and self._latest.get(token[1], -1) > token[2]
+
+    def check(self, stage_name, token=None):
+        # Raises Superseded once a newer request for the same page and output has arrived;
+        # token defaults to the request this thread serves
+        token = token or self.token()
+        if self.superseded(token):
+            SUPERSEDED.inc((token[0], stage_name))
+            raise Superseded()
+
+    @contextmanager
+    def serving(self, token):
+        # Makes token the request this thread serves, e.g. on a pool thread working for it
+        previous = self.token()
+        self._current.token = token
+        try:
+            yield
+        finally:
+            self._current.token = previous
+
+    def checkpoint(self):
+        # A check bound to the current request, for work it hands to other threads
+        token = self.token()
+        if token is None:
+            return lambda stage_name: None
+        return lambda stage_name: self.check(stage_name, token)
+
+    def wrap(self, func):
+        name = func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            token = self.begin(name)
+            if token is None:
+                return func(*args, **kwargs)
+            self.check('queued', token)
+            with self.serving(token):
+                return func(*args, **kwargs)
+        return wrapper
+
+# One sequencer per worker process; stage() boundaries and the aggregation engine check it
+REQUESTS = RequestSequencer()
+
+def install_cancellation(app):
+    # Same hook as instrument_app; background callbacks are cancelled by the renderer itself
+    app.renderer = RENDERER
+    STAGE_CHECKS.append(REQUESTS.check)
+    register_callback = app.callback
+
+    def callback(*args, **kwargs):
+        decorator = register_callback(*args, **kwargs)
+        if kwargs.get('background'):
+            return decorator
+
+        def register(func):
+            return decorator(REQUESTS.wrap(func))
+        return register
+
+    app.callback = callback
+    return app
@@ -0,0 +1,125 @@
+import functools
+import inspect
+import os
+import threading
+import time
+
+from approximate import exact_only
+from fast_boot import lazy_import
+from memory_budget import MEMORY
+
+pd = lazy_import('pandas')
+
+# Clientside Filtering Configuration
+CLIENTSIDE_CONFIG = {
+    # "1" ships a month x Region x Category x Sub-Category aggregate to the browser and filters
+    # the KPI cards, sales trend, regional and category charts there (assets/clientside.js)
+    'enabled': os.environ.get('DASH_CLIENTSIDE', '') == '1',
+    'namespace': 'aggregates',
+    'dimensions': ['Month Year', 'Region', 'Category', 'Sub-Category'],
+    'measures': ['Sales', 'Profit'],
+    # Sums are rounded before they are sent; the source values have at most 4 decimals
+    'decimals': 4,
+    'template': 'plotly_white'
+}
+
+class AggregateStore:
+    # The aggregate is built once per data version and shared by every page load
+    def __init__(self, get_df):
+        self.get_df = get_df
+        self._lock = threading.Lock()
+        self._source = None
+        self._cache = MEMORY.cache('aggregate_store')
+
+    def data(self):
+        df = self.get_df()
+        with self._lock:
+            data = self._cache.get('data') if self._source is df else None
+            if data is None:
+                started = time.perf_counter()
+                data = self._cache.put('data', build_aggregate(df), time.perf_counter() - started)
+                self._source = df
+            return data
+
+def build_aggregate(df):
+    # Columnar and dictionary-encoded: each dimension is a list of codes into its value list
+    import plotly.io as pio
+
+    dimensions = CLIENTSIDE_CONFIG['dimensions']
+    grouped = df.groupby(dimensions, observed=True).agg(
+        **{m: (m, 'sum') for m in CLIENTSIDE_CONFIG['measures']},
+        Rows=('Sales', 'size')
+    ).reset_index()
+
+    data = {
+        'version': df.attrs.get('version'),
+        'min_date': df['Order Date'].min().strftime('%Y-%m-%d'),
+        'max_date': df['Order Date'].max().strftime('%Y-%m-%d'),
+        'template': pio.templates[CLIENTSIDE_CONFIG['template']].to_plotly_json(),
+        'values': {},
+        'columns': {}
+    }
+    for column in dimensions:
+        codes = pd.Categorical(grouped[column], categories=sorted(grouped[column].unique()))
+        data['values'][column] = codes.categories.tolist()
+        data['columns'][column] = codes.codes.tolist()
+    for column in CLIENTSIDE_CONFIG['measures']:
+        data['columns'][column] = grouped[column].round(CLIENTSIDE_CONFIG['decimals']).tolist()
+    data['columns']['Rows'] = grouped['Rows'].tolist()
+    return data
+
+def register_aggregate_store(app, get_df, filter_inputs):
+    # Two stores: the aggregate itself, filled once per page load, and the filters the browser
+    # cannot answer from it (date ranges that cut through a month), which go to the server
+    from dash import ClientsideFunction, Output, Input
+
+    store = AggregateStore(get_df)
+
+    # The id never changes, so this only fires when the page loads
+    @app.callback(Output('aggregate-store', 'data'), Input('aggregate-store', 'id'))
+    def update_aggregate_store(_):
+        return store.data()
+
+    app.clientside_callback(
+        ClientsideFunction(CLIENTSIDE_CONFIG['namespace'], 'routeFilters'),
+        Output('server-filters', 'data'),
+        [Input('aggregate-store', 'data')] + filter_inputs
+    )
+    return store
+
+def clientside_view(app, function_name, outputs, inputs):
+    # Registers func as a regular callback, or, in clientside mode, as the browser function
+    # plus a server fallback that only runs on filters the aggregate cannot answer exactly
+    from dash import ClientsideFunction, Output, Input
+    from dash.exceptions import PreventUpdate
+
+    def decorator(func):
+        if not CLIENTSIDE_CONFIG['enabled']:
+            return app.callback(outputs, inputs)(func)
+
+        app.clientside_callback(
+            ClientsideFunction(CLIENTSIDE_CONFIG['namespace'], function_name),
+            outputs,
+            [Input('aggregate-store', 'data')] + inputs
+        )
+
+        names = list(inspect.signature(func).parameters)
+
+        @functools.wraps(func)
+        def fallback(filters):
+            if not filters:
+                raise PreventUpdate
+            # Browser answers are exact, so the fallback skips the approximate path as well
+            with exact_only():
+                return func(*[filters.get(name) for name in names])
+
+        dash_outputs = [Output(o.component_id, o.component_property, allow_duplicate=True)
+                        for o in (outputs if isinstance(outputs, list) else [outputs])]
+        app.callback(
+            dash_outputs if isinstance(outputs, list) else dash_outputs[0],
+            Input('server-filters', 'data'),
+            prevent_initial_call=True
+        )(fallback)
+        func.clientside_function = function_name
+        return func
+    return decorator
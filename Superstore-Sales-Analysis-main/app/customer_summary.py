@@ -0,0 +1,219 @@
+import threading
+import time
+
+from fast_boot import lazy_import
+from memory_budget import MEMORY, estimate_size
+
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+
+# Customer Summary Configuration
+SUMMARY_CONFIG = {
+    'customer': 'Customer Name',
+    'month': 'Month Year',
+    'measures': ['Sales', 'Profit', 'Quantity'],
+    # RFM scores are quintiles; segments are read off (recency score, frequency/monetary score)
+    'rfm_bins': 5,
+    'rfm_segments': [
+        ('Champions', lambda r, fm: (r >= 4) & (fm >= 4)),
+        ('Loyal', lambda r, fm: (r >= 3) & (fm >= 3)),
+        ('Promising', lambda r, fm: (r >= 4) & (fm < 3)),
+        ('At Risk', lambda r, fm: (r <= 2) & (fm >= 3)),
+        ('Needs Attention', lambda r, fm: r == 3),
+        ('Hibernating', lambda r, fm: r == 2)
+    ],
+    'cohort_months': 24
+}
+
+def summarize(rows, category_bits):
+    # Two tables at (customer, month, region) grain: measure sums per category, and order counts
+    # per set of categories the order contains, so distinct orders stay exact under any
+    # category filter (an order has one date, customer and region)
+    customer, month = SUMMARY_CONFIG['customer'], SUMMARY_CONFIG['month']
+    cells = rows.groupby([customer, month, 'Region', 'Category'], observed=True).agg(
+        **{m: (m, 'sum') for m in SUMMARY_CONFIG['measures']}
+    ).reset_index()
+
+    lines = rows[['Order ID', 'Category']].drop_duplicates()
+    masks = (lines['Category'].map(category_bits).groupby(lines['Order ID']).sum()).rename('Mask')
+    order_rows = rows.groupby('Order ID').agg(**{
+        customer: (customer, 'first'), month: (month, 'first'),
+        'Region': ('Region', 'first'), 'Order Date': ('Order Date', 'first')
+    }).join(masks)
+    orders = order_rows.groupby([customer, month, 'Region', 'Mask'], observed=True).agg(
+        Orders=('Order Date', 'size'), First=('Order Date', 'min'), Last=('Order Date', 'max')
+    ).reset_index()
+    return cells, orders
+
+def merge(state, cells, orders):
+    customer, month = SUMMARY_CONFIG['customer'], SUMMARY_CONFIG['month']
+    cells = pd.concat([state['cells'], cells], ignore_index=True).groupby(
+        [customer, month, 'Region', 'Category'], observed=True
+    )[SUMMARY_CONFIG['measures']].sum().reset_index()
+    orders = pd.concat([state['orders'], orders], ignore_index=True).groupby(
+        [customer, month, 'Region', 'Mask'], observed=True
+    ).agg(Orders=('Orders', 'sum'), First=('First', 'min'), Last=('Last', 'max')).reset_index()
+    return cells, orders
+
+class CustomerSummary:
+    # Customer analytics read this summary instead of the order lines; only the partial months
+    # at the edges of a date range go back to the raw rows
+    def __init__(self, get_df):
+        self.get_df = get_df
+        self._lock = threading.Lock()
+        # Rebuilt from the loaded frame if the memory budget evicts it
+        self._states = MEMORY.cache('customer_summary')
+
+    def _build(self, df):
+        started = time.perf_counter()
+        categories = sorted(df['Category'].unique())
+        category_bits = {c: 1 << i for i, c in enumerate(categories)}
+        cells, orders = summarize(df, category_bits)
+        return self._index(df, category_bits, cells, orders, started)
+
+    def _index(self, df, category_bits, cells, orders, started):
+        dates = df['Order Date'].to_numpy()
+        date_order = np.argsort(dates, kind='stable')
+        return {
+            'source': df, 'category_bits': category_bits, 'cells': cells, 'orders': orders,
+            'date_order': date_order, 'sorted_dates': dates[date_order],
+            'min_date': df['Order Date'].min(), 'max_date': df['Order Date'].max(),
+            'build_seconds': time.perf_counter() - started
+        }
+
+    def _store(self, state):
+        # The frame itself is not the summary's to account for
+        size = estimate_size({k: v for k, v in state.items() if k != 'source'})
+        return self._states.put('state', state, state['build_seconds'], size=size)
+
+    def current(self):
+        df = self.get_df()
+        with self._lock:
+            state = self._states.get('state')
+            if state is None or state['source'] is not df:
+                state = self._store(self._build(df))
+            return state
+
+    def warm_async(self):
+        threading.Thread(target=self.current, name='customer-summary', daemon=True).start()
+
+    def update(self, new_df, changed):
+        # Incremental refresh on ingest: only customers with added or removed rows are
+        # summarized again; everything else is carried over from the previous version
+        state = self._states.peek('state')
+        if state is None or changed is None or not set(new_df['Category'].unique()) <= set(state['category_bits']):
+            with self._lock:
+                self._store(self._build(new_df))
+            return
+        started = time.perf_counter()
+        customer = SUMMARY_CONFIG['customer']
+        appended = len(new_df) - len(state['source']) == len(changed)
+        if appended and not state['source']['Order ID'].isin(changed['Order ID'].unique()).any():
+            # Only new orders were added: their totals merge into the existing cells
+            cells, orders = merge(state, *summarize(changed, state['category_bits']))
+        else:
+            affected = set(changed[customer].unique())
+            cells, orders = summarize(new_df[new_df[customer].isin(affected)], state['category_bits'])
+            cells = pd.concat([state['cells'][~state['cells'][customer].isin(affected)], cells], ignore_index=True)
+            orders = pd.concat([state['orders'][~state['orders'][customer].isin(affected)], orders], ignore_index=True)
+        updated = self._index(new_df, state['category_bits'], cells, orders, started)
+        # Priced as a full build, which is what recreating it after an eviction costs
+        updated['build_seconds'] = max(updated['build_seconds'], state['build_seconds'])
+        with self._lock:
+            self._store(updated)
+
+    def select(self, start_date=None, end_date=None, regions=None, categories=None):
+        # Summary rows for whole months in the range, plus the edge months summarized from the
+        # raw rows that fall inside it; dates only filter when both are set, as in filter_data
+        state = self.current()
+        cells, orders = state['cells'], state['orders']
+        month = SUMMARY_CONFIG['month']
+        edge_rows = 0
+
+        if start_date and end_date:
+            start = pd.Timestamp(str(start_date)[:10])
+            end = pd.Timestamp(str(end_date)[:10])
+            # Months the range covers completely, with nothing outside the data counted as a gap
+            first_full = start.to_period('M') if start.day == 1 or start <= state['min_date'] else start.to_period('M') + 1
+            last_full = end.to_period('M') if end.is_month_end or end >= state['max_date'] else end.to_period('M') - 1
+            full_cells = (cells[month] >= str(first_full)) & (cells[month] <= str(last_full))
+            full_orders = (orders[month] >= str(first_full)) & (orders[month] <= str(last_full))
+            parts = [(cells[full_cells], orders[full_orders])]
+
+            edges = []
+            if start.to_period('M') < first_full:
+                edges.append((start, min(end, start.to_period('M').end_time.normalize())))
+            if end.to_period('M') > last_full and end.to_period('M') != start.to_period('M'):
+                edges.append((max(start, end.to_period('M').start_time), end))
+            for edge_start, edge_end in edges:
+                if edge_start > edge_end:
+                    continue
+                lo = np.searchsorted(state['sorted_dates'], edge_start.to_datetime64(), 'left')
+                hi = np.searchsorted(state['sorted_dates'], edge_end.to_datetime64(), 'right')
+                rows = state['source'].iloc[state['date_order'][lo:hi]]
+                edge_rows += len(rows)
+                if len(rows):
+                    parts.append(summarize(rows, state['category_bits']))
+            cells = pd.concat([p[0] for p in parts], ignore_index=True)
+            orders = pd.concat([p[1] for p in parts], ignore_index=True)
+
+        if regions:
+            cells = cells[cells['Region'].isin(regions)]
+            orders = orders[orders['Region'].isin(regions)]
+        if categories:
+            bits = sum(state['category_bits'].get(c, 0) for c in categories)
+            cells = cells[cells['Category'].isin(categories)]
+            orders = orders[(orders['Mask'] & bits) != 0]
+        return cells, orders, edge_rows
+
+    def customers(self, start_date=None, end_date=None, regions=None, categories=None):
+        # One row per customer: measure totals, distinct orders and first/last order dates
+        customer = SUMMARY_CONFIG['customer']
+        cells, orders, edge_rows = self.select(start_date, end_date, regions, categories)
+        totals = cells.groupby(customer)[SUMMARY_CONFIG['measures']].sum()
+        activity = orders.groupby(customer).agg(
+            Orders=('Orders', 'sum'), First=('First', 'min'), Last=('Last', 'max'))
+        result = totals.join(activity, how='inner').reset_index()
+        result.attrs['rows_read'] = len(cells) + len(orders) + edge_rows
+        return result
+
+    def top_customers(self, start_date=None, end_date=None, regions=None, categories=None, limit=15):
+        result = self.customers(start_date, end_date, regions, categories)
+        top = result.nlargest(limit, 'Sales').rename(columns={'Orders': 'Order ID'})
+        top = top[[SUMMARY_CONFIG['customer'], 'Sales', 'Profit', 'Order ID', 'Quantity']].reset_index(drop=True)
+        top.attrs = result.attrs
+        return top
+
+    def rfm(self, start_date=None, end_date=None, regions=None, categories=None):
+        result = self.customers(start_date, end_date, regions, categories)
+        if result.empty:
+            return result
+        # Recency is measured from the end of the selected range, or of the data
+        reference = pd.Timestamp(str(end_date)[:10]) if start_date and end_date else self.current()['max_date']
+        result['Recency'] = (reference - result['Last']).dt.days
+        bins = SUMMARY_CONFIG['rfm_bins']
+        score = lambda values: np.ceil(values.rank(method='first') / len(values) * bins).astype(int)
+        result['R'] = score(-result['Recency'])
+        result['F'] = score(result['Orders'])
+        result['M'] = score(result['Sales'])
+        fm = (result['F'] + result['M']) / 2
+        result['RFM Segment'] = 'Lost'
+        for name, rule in reversed(SUMMARY_CONFIG['rfm_segments']):
+            result.loc[rule(result['R'], fm), 'RFM Segment'] = name
+        return result
+
+    def cohorts(self, start_date=None, end_date=None, regions=None, categories=None):
+        # Share of each first-order-month cohort that ordered again n months later
+        customer, month = SUMMARY_CONFIG['customer'], SUMMARY_CONFIG['month']
+        _, orders, _ = self.select(start_date, end_date, regions, categories)
+        active = orders[[customer, month]].drop_duplicates()
+        if active.empty:
+            return pd.DataFrame()
+        period = pd.PeriodIndex(active[month], freq='M')
+        index = period.year * 12 + period.month
+        first = pd.Series(index, index=active.index).groupby(active[customer]).transform('min')
+        active = active.assign(Cohort=pd.PeriodIndex.from_ordinals(
+            (first - 1970 * 12 - 1).to_numpy(), freq='M').astype(str), Offset=index - first.to_numpy())
+        active = active[active['Offset'] < SUMMARY_CONFIG['cohort_months']]
+        counts = active.groupby(['Cohort', 'Offset'])[customer].nunique().unstack(fill_value=0)
+        return counts.div(counts[0], axis=0) * 100
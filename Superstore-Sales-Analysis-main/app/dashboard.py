@@ -1,22 +1,48 @@
 try:
     import dash
-    from dash import dcc, html, callback_context
+    from dash import dcc, html, dash_table, callback_context, DiskcacheManager, ClientsideFunction
     from dash.dependencies import Input, Output, State
-    import pandas as pd
+    from dash.exceptions import PreventUpdate
+    import diskcache
     import plotly.graph_objects as go
-    import plotly.express as px
-    from prophet import Prophet
-    import numpy as np
+    import functools
     import os
     from datetime import datetime
+    from fast_boot import (BOOT_CONFIG, lazy_import, finish_imports, BackgroundLoader,
+                           build_metadata, load_runtime_metadata, save_runtime_metadata)
+    from instrumentation import instrument_app, stage, record_rows, record_error, record_approximate
+    from query_backend import QUERY_CONFIG, create_backend
+    from partitioned_store import PARTITION_CONFIG, load_partitions, read_manifest, overlapping_rows
+    from approximate import (APPROX_CONFIG, StratifiedSampler, approximate_active,
+                             register_exact_refinement)
+    from clientside import CLIENTSIDE_CONFIG, register_aggregate_store, clientside_view
+    from result_cache import RESULT_CACHE_CONFIG, ResultCache, install_result_cache
+    from profiling import install_dash_profiling
+    from export import EXPORT_CONFIG, export_url, install_export_route
+    from drilldown import DRILLDOWN_CONFIG, OrderIndex, table_columns
+    from auto_refresh import REFRESH_CONFIG, AutoRefresh, install_auto_refresh
+    from customer_summary import CustomerSummary
+    from aggregation import AggregationEngine
+    from memory_budget import install_memory_route
+    from single_flight import SINGLE_FLIGHT_CONFIG, SingleFlight, install_single_flight
+    from cancellation import CANCELLATION_CONFIG, install_cancellation
+    from tab_executor import TabExecutor, shared
+    import fast_figures as ff
+    # pandas and Plotly Express dominate import time and are first needed by the data load
+    # and the callbacks, so they are only imported on first use
+    pd = lazy_import('pandas')
+    px = lazy_import('plotly.express')
+    np = lazy_import('numpy')
 except ImportError as e:
     print(f"Error importing dependencies: {str(e)}")
     print("Please install required packages using:")
-    print("pip install dash pandas plotly prophet numpy")
+    print("pip install dash[diskcache] pandas plotly prophet numpy")
     raise
 
 # Data Configuration
 DATA_CONFIG = {
+    # "csv" reads file_path; "partitioned" reads the year/month Parquet store (partitioned_store.py)
+    'layout': os.environ.get('DASH_DATA_LAYOUT', 'csv'),
     'file_path': os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '1. data', 'processed', 'cleaned superstore dataset.csv'),
     'columns': {
         'order_date': 'Order Date',
@@ -37,16 +63,71 @@ DATA_CONFIG = {
     }
 }
 
+# Forecast Configuration
+FORECAST_CONFIG = {
+    'cache_dir': os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cache', 'forecast'),
+    'horizon_days': 90,
+    # Fitted models and forecasts are kept for a week; the data version in the key handles refreshes
+    'expire_seconds': 7 * 24 * 3600,
+    'series': ['Sales', 'Profit', 'Quantity'],
+    # Prophet fits allowed at once across all background jobs; further jobs wait for a slot
+    'max_concurrent_fits': int(os.environ.get('DASH_FORECAST_WORKERS', 2)),
+    # A slot held by a job that died is given back once the counter has not changed for this long
+    'fit_slot_expire_seconds': 30 * 60
+}
+
+# Prophet fits run in background worker processes; their results share a local disk cache,
+# and a semaphore kept in that cache bounds how many of the processes fit at the same time
+forecast_cache = diskcache.Cache(FORECAST_CONFIG['cache_dir'])
+background_callback_manager = DiskcacheManager(forecast_cache)
+forecast_slots = diskcache.BoundedSemaphore(forecast_cache, 'prophet-fit-slots',
+                                            value=FORECAST_CONFIG['max_concurrent_fits'],
+                                            expire=FORECAST_CONFIG['fit_slot_expire_seconds'])
+
 # Initialize the Dash app with custom theme
 app = dash.Dash(__name__, 
     meta_tags=[
         {"name": "viewport", "content": "width=device-width, initial-scale=1.0"}
-    ]
+    ],
+    background_callback_manager=background_callback_manager
 )
 
 # Enable the app to be imported by a WSGI server (e.g. gunicorn)
 server = app.server
 
+# Live refresh (DASH_AUTO_REFRESH=1): reloads changed data and lets open dashboards skip
+# figures the new rows do not touch. Installed first so its check runs before everything else
+auto_refresh = AutoRefresh(lambda: get_df(), lambda: source_version(), lambda: load_data(),
+                           lambda new_df, changed: publish_data(new_df, changed))
+if REFRESH_CONFIG['enabled']:
+    install_auto_refresh(app, auto_refresh)
+
+# Superseded requests (DASH_CANCEL_SUPERSEDED=1): each page load numbers its callback requests,
+# and a request the page has already sent again for the same output stops at its next stage
+# boundary. Installed outside the instrumentation, so skipped requests are not timed
+if CANCELLATION_CONFIG['enabled']:
+    install_cancellation(app)
+
+# Time every callback registered below and expose the results on /metrics
+instrument_app(app)
+
+# Opt-in per-request profiles (DASH_PROFILE=1, or DASH_PROFILE=header and the X-Dash-Profile header),
+# listed on /_profiles; nothing is installed otherwise
+install_dash_profiling(app)
+
+# Caches, indexes and rollups share one per-worker memory budget (DASH_MEMORY_BUDGET_MB);
+# bytes held, hit rates and evictions per cache are on /_memory and /metrics
+install_memory_route(app)
+
+# Single-flight (DASH_SINGLE_FLIGHT=1): identical requests that arrive while one is being
+# computed wait for it and share its result, across worker processes too. Keys include the
+# data version. Loads of the same source version are coalesced within each worker only, as
+# pickling the whole frame for other workers would cost about as much as parsing it
+callback_flights = SingleFlight(version=lambda: get_df().attrs.get('version'))
+load_flights = SingleFlight(shared=False)
+if SINGLE_FLIGHT_CONFIG['enabled']:
+    install_single_flight(app, callback_flights)
+
 # Custom color scheme
 COLORS = {
     'primary': '#1f77b4',
@@ -56,19 +137,67 @@ COLORS = {
     'text': '#2c3e50'
 }
 
+# Path the last resolution returned ('' before the first), so a missing file is reported when
+# the resolution changes rather than on every check of the refresh watcher
+resolved_data_path = ''
+
+def resolve_data_path():
+    # Not cached: a configured file that appears or disappears is picked up on the next call,
+    # and the exists() checks are cheap next to the os.stat the watcher does anyway
+    global resolved_data_path
+    configured_path = DATA_CONFIG['file_path']
+    data_path = configured_path
+    if not os.path.exists(configured_path):
+        # Try alternative path for deployment
+        alt_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dataset', 'cleaned superstore dataset.csv')
+        data_path = alt_path if os.path.exists(alt_path) else None
+        if data_path != resolved_data_path:
+            print(f"Data file not found at: {configured_path}")
+    resolved_data_path = data_path
+    return data_path
+
+def metadata_source():
+    # What the fast-boot layout metadata was built from: the partition store or the data file
+    if DATA_CONFIG['layout'] == 'partitioned':
+        return PARTITION_CONFIG['root']
+    return resolve_data_path()
+
+def source_version():
+    # Identifies a copy of the data in cache keys; changes whenever the file is rewritten
+    if DATA_CONFIG['layout'] == 'partitioned':
+        # The manifest version changes with every ingest
+        manifest = read_manifest()
+        return manifest['version'] if manifest else None
+    data_path = resolve_data_path()
+    if data_path is None:
+        return None
+    stat = os.stat(data_path)
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+def read_source():
+    if DATA_CONFIG['layout'] == 'partitioned':
+        return load_partitions()
+    data_path = resolve_data_path()
+    if data_path is None:
+        return None
+    df = pd.read_csv(data_path)
+    df.attrs['version'] = source_version()
+    return df
+
 def load_data():
+    if SINGLE_FLIGHT_CONFIG['enabled']:
+        # Threads of a worker loading together (background boot, watcher, a catching-up
+        # request) parse the source once
+        return load_flights.run('load_data', (DATA_CONFIG['layout'], resolve_data_path(), source_version()),
+                                parse_data)
+    return parse_data()
+
+def parse_data():
     try:
-        data_path = DATA_CONFIG['file_path']
-        if not os.path.exists(data_path):
-            print(f"Data file not found at: {data_path}")
-            # Try alternative path for deployment
-            alt_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '1. data', 'processed', 'cleaned superstore dataset.csv')
-            if os.path.exists(alt_path):
-                data_path = alt_path
-            else:
-                return None
+        df = read_source()
+        if df is None:
+            return None
             
-        df = pd.read_csv(data_path)
         df['Order Date'] = pd.to_datetime(df[DATA_CONFIG['columns']['order_date']])
         df['Order Year'] = df['Order Date'].dt.year
         df['Order Month'] = df['Order Date'].dt.month
@@ -86,13 +215,157 @@ def load_data():
         print(f"Error loading data: {str(e)}")
         return None
 
-# Load data
-df = load_data()
-if df is None:
-    raise Exception("Failed to load data")
+def set_data(new_df):
+    # Swap in a freshly loaded frame (data refreshes, benchmarks); callbacks read the global
+    global df
+    df = new_df
+    result_cache.refresh()
+
+def get_df():
+    if df is None:
+        data_loader.get(BOOT_CONFIG['load_timeout_seconds'])
+        if df is None:
+            raise Exception("Failed to load data")
+    return df
+
+# Approximate mode (DASH_APPROXIMATE=1): summary callbacks on large histories answer from a
+# stratified sample first, and background callbacks replace them with exact results
+approx_sampler = StratifiedSampler(get_df)
+
+# Date index and per-column sort permutations behind the paginated order table
+order_index = OrderIndex(get_df)
+
+# Customer-by-month totals behind the Customer Analysis tab, so its views cost O(customers)
+customer_summary = CustomerSummary(get_df)
+
+# Parallel aggregation (DASH_PARALLEL_AGG=1): group-bys over large selections run as partial
+# aggregates per block of rows on a thread pool, over integer-coded keys, and are then merged
+aggregation_engine = AggregationEngine(get_df)
+
+# Result cache (DASH_RESULT_CACHE=1): callback results per data version, precomputed for the
+# default filters, each single region/category and the most requested combinations. Sampled
+# answers are not kept; the exact result is cached under their key instead
+result_cache = ResultCache(get_df)
+if RESULT_CACHE_CONFIG['enabled']:
+    install_result_cache(app, result_cache)
+
+def warm_sampler(new_df):
+    if approximate_active(len(new_df)):
+        approx_sampler.warm_async()
+
+def publish_data(new_df, changed):
+    # Called by the refresh watcher with the rows the reload added or removed; the customer
+    # summary is brought up to date for only those customers before the frame is swapped in
+    customer_summary.update(new_df, changed)
+    set_data(new_df)
+    warm_sampler(new_df)
+    order_index.warm_async()
+    if BOOT_CONFIG['enabled']:
+        save_runtime_metadata(build_metadata(new_df), metadata_source())
+
+def on_background_load(new_df):
+    set_data(new_df)
+    warm_sampler(new_df)
+    order_index.warm_async()
+    customer_summary.warm_async()
+    # Keep the metadata the next fast boot renders from in step with the data
+    try:
+        save_runtime_metadata(build_metadata(new_df), metadata_source())
+    except OSError as e:
+        print(f"Could not update layout metadata: {str(e)}")
+
+# Load data; with DASH_FAST_BOOT=1 the layout renders from precomputed metadata while the
+# dataset loads in a background thread
+df = None
+layout_metadata = load_runtime_metadata(metadata_source()) if BOOT_CONFIG['enabled'] else None
+if layout_metadata is not None:
+    data_loader = BackgroundLoader(load_data, on_loaded=on_background_load,
+                                   imports=(pd, np, px)).start()
+    # Plotly's JSON encoder looks pandas up in sys.modules, so no request may run while
+    # the loader thread is still half-way through importing it
+    server.before_request(lambda: finish_imports(pd, np, px))
+else:
+    df = load_data()
+    if df is None:
+        raise Exception("Failed to load data")
+    layout_metadata = build_metadata(df)
+    if BOOT_CONFIG['enabled']:
+        save_runtime_metadata(layout_metadata, metadata_source())
+    warm_sampler(df)
+    order_index.warm_async()
+    customer_summary.warm_async()
+
+def filter_data(start_date, end_date, regions=None, categories=None):
+    # Shared by all callbacks; returns the global frame itself when nothing is filtered,
+    # so callers must not modify the result in place. The views of one tab request share it
+    key = ('filter', start_date, end_date, tuple(regions or ()), tuple(categories or ()))
+    return shared(key, lambda: select_rows(start_date, end_date, regions, categories))
+
+def select_rows(start_date, end_date, regions=None, categories=None):
+    with stage('filter'):
+        full_df = get_df()
+        filtered_df = full_df
+        
+        # Partitioned layout: only the rows of the months that overlap the dates are scanned
+        ranges = full_df.attrs.get('partition_ranges')
+        if start_date and end_date and ranges and ranges[-1][3] == len(full_df):
+            spans = overlapping_rows(ranges, start_date, end_date)
+            filtered_df = full_df.iloc[np.concatenate(
+                [np.arange(first, stop) for first, stop in spans] or [np.empty(0, dtype=np.int64)])]
+        scanned = len(filtered_df)
+        
+        if start_date and end_date:
+            filtered_df = filtered_df[
+                (filtered_df['Order Date'] >= start_date) &
+                (filtered_df['Order Date'] <= end_date)
+            ]
+        
+        if regions:
+            filtered_df = filtered_df[filtered_df['Region'].isin(regions)]
+        
+        if categories:
+            filtered_df = filtered_df[filtered_df['Category'].isin(categories)]
+    
+    record_rows(scanned=scanned)
+    return aggregation_engine.track(filtered_df, full_df)
+
+def estimate(group_by, columns, start_date, end_date, regions=None, categories=None, ratio=None):
+    # Sampled totals with margins of error, or None when the exact path should run
+    if not approximate_active(len(get_df())):
+        return None
+    with stage('sample'):
+        result = approx_sampler.estimate(group_by, columns, start_date, end_date, regions,
+                                         categories, ratio)
+    record_rows(scanned=result.attrs['sample_rows'], result=len(result))
+    record_approximate()
+    return result
+
+def approximate_title(title, result):
+    if 'sample_fraction' not in result.attrs:
+        return title
+    return f"{title} (estimated from a {result.attrs['sample_fraction']:.1%} sample, refining...)"
+
+# Grouped queries that can be pushed down to SQL (DASH_QUERY_BACKEND=sqlite) go through this:
+# Top Customers and the margin analysis only. The other views still need the in-memory frame,
+# so it is loaded either way. The data path is resolved on every query, as get_df does
+query_backend = create_backend(QUERY_CONFIG['backend'], filter_data, resolve_data_path)
+
+# Filtered orders stream from /export/orders as CSV or Parquet
+install_export_route(app, get_df)
 
 # Create the layout
 app.layout = html.Div([
+    # Only filled in clientside mode (DASH_CLIENTSIDE=1): the aggregate the browser filters,
+    # and the filters it hands back to the server
+    dcc.Store(id='aggregate-store'),
+    dcc.Store(id='server-filters'),
+    # Auto-refresh (DASH_AUTO_REFRESH=1): polls the data version, and data-change tells the
+    # figure callbacks which version they are catching up from
+    dcc.Interval(id='refresh-interval', interval=REFRESH_CONFIG['poll_seconds'] * 1000,
+                 disabled=not REFRESH_CONFIG['enabled']),
+    dcc.Store(id='data-version'),
+    dcc.Store(id='data-change'),
+    
     # Header
     html.Div([
         html.H1("Superstore Sales Analytics Dashboard", 
@@ -108,24 +381,34 @@ app.layout = html.Div([
             html.H3("Filters", style={'color': COLORS['text']}),
             dcc.DatePickerRange(
                 id='date-range',
-                start_date=df['Order Date'].min(),
-                end_date=df['Order Date'].max(),
+                start_date=layout_metadata['start_date'],
+                end_date=layout_metadata['end_date'],
                 style={'marginBottom': '10px'}
             ),
             dcc.Dropdown(
                 id='region-filter',
-                options=[{'label': x, 'value': x} for x in df['Region'].unique()],
+                options=[{'label': x, 'value': x} for x in layout_metadata['regions']],
                 multi=True,
                 placeholder="Select Region(s)",
                 style={'marginBottom': '10px'}
             ),
             dcc.Dropdown(
                 id='category-filter',
-                options=[{'label': x, 'value': x} for x in df['Category'].unique()],
+                options=[{'label': x, 'value': x} for x in layout_metadata['categories']],
                 multi=True,
                 placeholder="Select Category(s)",
                 style={'marginBottom': '10px'}
-            )
+            ),
+            html.Div([
+                html.Span("Download filtered orders: "),
+                html.A("CSV", id='export-csv', download='',
+                       href=export_url(layout_metadata['start_date'], layout_metadata['end_date'])),
+                html.Span(" | "),
+                html.A("Parquet", id='export-parquet', download='',
+                       href=export_url(layout_metadata['start_date'], layout_metadata['end_date'], fmt='parquet'))
+            ], style={'color': COLORS['text']}),
+            # Read by the export links' clientside callback
+            dcc.Store(id='export-route', data=EXPORT_CONFIG['route'])
         ], style={'padding': '20px', 'backgroundColor': 'white', 'borderRadius': '5px',
                   'boxShadow': '0 2px 4px rgba(0,0,0,0.1)', 'marginBottom': '20px'}),
         
@@ -133,24 +416,24 @@ app.layout = html.Div([
         html.Div([
             html.Div([
                 html.H4("Total Sales"),
-                html.H2(id='total-sales', children=f"${df['Sales'].sum():,.2f}")
+                html.H2(id='total-sales', children=f"${layout_metadata['kpis']['total_sales']:,.2f}")
             ], className='kpi-card'),
             html.Div([
                 html.H4("Total Profit"),
-                html.H2(id='total-profit', children=f"${df['Profit'].sum():,.2f}")
+                html.H2(id='total-profit', children=f"${layout_metadata['kpis']['total_profit']:,.2f}")
             ], className='kpi-card'),
             html.Div([
                 html.H4("Total Orders"),
-                html.H2(id='total-orders', children=f"{len(df):,}")
+                html.H2(id='total-orders', children=f"{layout_metadata['kpis']['total_orders']:,}")
             ], className='kpi-card'),
             html.Div([
                 html.H4("Avg. Profit Margin"),
-                html.H2(id='avg-margin', children=f"{df['Profit Margin'].mean():.1f}%")
+                html.H2(id='avg-margin', children=f"{layout_metadata['kpis']['avg_margin']:.1f}%")
             ], className='kpi-card')
         ], style={'display': 'flex', 'justifyContent': 'space-between', 'marginBottom': '20px'}),
         
         # Tabs for different analyses
-        dcc.Tabs([
+        dcc.Tabs(id='main-tabs', children=[
             # Sales Analysis Tab
             dcc.Tab(label='Sales Analysis', children=[
                 html.Div([
@@ -182,6 +465,27 @@ app.layout = html.Div([
                     dcc.Graph(id='customer-segments'),
                     html.H3("Top Customers"),
                     dcc.Graph(id='top-customers'),
+                    html.H3("RFM Segments"),
+                    dcc.Graph(id='rfm-segments'),
+                    html.H3("Cohort Retention"),
+                    dcc.Graph(id='cohort-retention'),
+                    html.H3("Order Details"),
+                    html.P("Click a customer above to list their orders; sorting, filtering and paging run on the server",
+                           style={'color': COLORS['text']}),
+                    dash_table.DataTable(
+                        id='order-table',
+                        columns=table_columns(),
+                        page_current=0,
+                        page_size=DRILLDOWN_CONFIG['page_size'],
+                        page_action='custom',
+                        sort_action='custom',
+                        sort_mode='single',
+                        sort_by=[],
+                        filter_action='custom',
+                        filter_query='',
+                        style_table={'overflowX': 'auto'},
+                        style_cell={'textAlign': 'left', 'fontSize': '12px'}
+                    ),
                     html.H3("Customer Geography"),
                     dcc.Graph(id='customer-geography')
                 ])
@@ -205,6 +509,30 @@ app.layout = html.Div([
                     html.H3("Margin Analysis"),
                     dcc.Graph(id='margin-analysis')
                 ])
+            ]),
+            
+            # Forecast Tab
+            dcc.Tab(label='Forecast', value='forecast', children=[
+                html.Div([
+                    html.H3("Prophet Forecast"),
+                    html.Div([
+                        dcc.Dropdown(
+                            id='forecast-series',
+                            options=[{'label': x, 'value': x} for x in FORECAST_CONFIG['series']],
+                            value='Sales',
+                            clearable=False,
+                            style={'width': '200px', 'marginRight': '20px'}
+                        ),
+                        dcc.Slider(
+                            id='forecast-horizon',
+                            min=30, max=365, step=None,
+                            marks={30: '30 days', 90: '90 days', 180: '180 days', 365: '1 year'},
+                            value=FORECAST_CONFIG['horizon_days']
+                        )
+                    ], style={'display': 'grid', 'gridTemplateColumns': '220px 1fr', 'alignItems': 'center'}),
+                    html.P(id='forecast-status', style={'color': COLORS['text']}),
+                    dcc.Graph(id='forecast-graph')
+                ])
             ])
         ])
     ], style={'padding': '20px'})
@@ -212,99 +540,115 @@ app.layout = html.Div([
 
 # Add error handling decorator
 def handle_callback_error(func):
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
         try:
             return func(*args, **kwargs)
+        except PreventUpdate:
+            raise
         except Exception as e:
             print(f"Error in {func.__name__}: {str(e)}")
-            # Return an empty figure with error message
-            return go.Figure().add_annotation(
-                text=f"Error loading chart: {str(e)}",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False
-            )
+            # Keeps the error figure out of the result cache
+            record_error()
+            return error_figure(e)
     return wrapper
 
+def error_figure(e):
+    # Return an empty figure with error message
+    return go.Figure().add_annotation(
+        text=f"Error loading chart: {str(e)}",
+        xref="paper", yref="paper",
+        x=0.5, y=0.5, showarrow=False
+    )
+
+# In clientside mode the browser computes these views from the aggregate store and the
+# server only answers date ranges that cut through a month
+filter_inputs = [Input('date-range', 'start_date'),
+                 Input('date-range', 'end_date'),
+                 Input('region-filter', 'value'),
+                 Input('category-filter', 'value')]
+if CLIENTSIDE_CONFIG['enabled']:
+    register_aggregate_store(app, get_df, filter_inputs)
+
+# The export links only depend on the filters, so they are rebuilt in the browser
+app.clientside_callback(
+    ClientsideFunction('exports', 'orderLinks'),
+    [Output('export-csv', 'href'),
+     Output('export-parquet', 'href')],
+    filter_inputs + [Input('export-route', 'data')]
+)
+
 # Update callbacks with error handling
-@app.callback(
+@clientside_view(app, 'kpiCards',
     [Output('total-sales', 'children'),
      Output('total-profit', 'children'),
      Output('total-orders', 'children'),
      Output('avg-margin', 'children')],
-    [Input('date-range', 'start_date'),
-     Input('date-range', 'end_date'),
-     Input('region-filter', 'value'),
-     Input('category-filter', 'value')]
+    filter_inputs
 )
 @handle_callback_error
 def update_kpi_cards(start_date, end_date, regions, categories):
-    filtered_df = df.copy()
-    
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['Order Date'] >= start_date) &
-            (filtered_df['Order Date'] <= end_date)
-        ]
-    
-    if regions:
-        filtered_df = filtered_df[filtered_df['Region'].isin(regions)]
-    
-    if categories:
-        filtered_df = filtered_df[filtered_df['Category'].isin(categories)]
-    
-    total_sales = f"${filtered_df['Sales'].sum():,.2f}"
-    total_profit = f"${filtered_df['Profit'].sum():,.2f}"
-    total_orders = f"{len(filtered_df):,}"
-    avg_margin = f"{(filtered_df['Profit'].sum() / filtered_df['Sales'].sum() * 100):.1f}%"
+    approx = estimate([], ['Sales', 'Profit', 'Rows'], start_date, end_date, regions, categories,
+                      ratio=('Profit', 'Sales'))
+    if approx is not None:
+        # Point estimates with their 95% margins of error
+        totals = approx.iloc[0]
+        return (f"≈${totals['Sales']:,.0f} ±{totals['Sales MOE']:,.0f}",
+                f"≈${totals['Profit']:,.0f} ±{totals['Profit MOE']:,.0f}",
+                f"≈{totals['Rows']:,.0f} ±{totals['Rows MOE']:,.0f}",
+                f"≈{totals['Ratio'] * 100:.1f}% ±{totals['Ratio MOE'] * 100:.1f}")
+    
+    filtered_df = filter_data(start_date, end_date, regions, categories)
+    
+    with stage('aggregate'):
+        total_sales = f"${filtered_df['Sales'].sum():,.2f}"
+        total_profit = f"${filtered_df['Profit'].sum():,.2f}"
+        total_orders = f"{len(filtered_df):,}"
+        avg_margin = f"{(filtered_df['Profit'].sum() / filtered_df['Sales'].sum() * 100):.1f}%"
     
     return total_sales, total_profit, total_orders, avg_margin
 
-@app.callback(
+@clientside_view(app, 'salesTrend',
     Output('sales-trend', 'figure'),
-    [Input('date-range', 'start_date'),
-     Input('date-range', 'end_date'),
-     Input('region-filter', 'value'),
-     Input('category-filter', 'value')]
+    filter_inputs
 )
 @handle_callback_error
 def update_sales_trend(start_date, end_date, regions, categories):
-    filtered_df = df.copy()
+    monthly_sales = estimate(['Month Year'], ['Sales'], start_date, end_date, regions, categories)
     
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['Order Date'] >= start_date) &
-            (filtered_df['Order Date'] <= end_date)
-        ]
-    
-    if regions:
-        filtered_df = filtered_df[filtered_df['Region'].isin(regions)]
-    
-    if categories:
-        filtered_df = filtered_df[filtered_df['Category'].isin(categories)]
-    
-    monthly_sales = filtered_df.groupby('Month Year').agg({
-        'Sales': 'sum',
-        'Order Date': 'first'  # Keep the date for proper sorting
-    }).reset_index()
-    
-    monthly_sales = monthly_sales.sort_values('Order Date')
-    
-    fig = px.line(monthly_sales, 
-                  x='Month Year', 
-                  y='Sales',
-                  title='Monthly Sales Trend',
-                  template='plotly_white')
-    
-    fig.update_layout(
-        xaxis_title="Month",
-        yaxis_title="Sales ($)",
-        hovermode='x unified',
-        showlegend=True
-    )
+    if monthly_sales is None:
+        filtered_df = filter_data(start_date, end_date, regions, categories)
+        
+        with stage('aggregate'):
+            monthly_sales = aggregation_engine.aggregate(filtered_df, 'Month Year', {
+                'Sales': 'sum',
+                'Order Date': 'first'  # Keep the date for proper sorting
+            })
+            
+            monthly_sales = monthly_sales.sort_values('Order Date')
+            record_rows(result=len(monthly_sales))
+    
+    with stage('figure'):
+        fig = ff.line(monthly_sales, 
+                      x='Month Year', 
+                      y='Sales',
+                      error_y='Sales MOE' if 'Sales MOE' in monthly_sales else None,
+                      title=approximate_title('Monthly Sales Trend', monthly_sales))
+        
+        ff.update_layout(fig,
+            xaxis={'title': {'text': "Month"}},
+            yaxis={'title': {'text': "Sales ($)"}},
+            hovermode='x unified',
+            showlegend=True
+        )
     
     return fig
 
-@app.callback(
+# Tab executor (DASH_TAB_EXECUTOR=1): the Product Analysis graphs are computed by one callback,
+# concurrently on a small thread pool and over one filtered frame per set of filters
+product_tab = TabExecutor(app, 'product_analysis', error_result=error_figure)
+
+@product_tab.view(
     Output('subcategory-analysis', 'figure'),
     [Input('date-range', 'start_date'),
      Input('date-range', 'end_date'),
@@ -313,35 +657,30 @@ def update_sales_trend(start_date, end_date, regions, categories):
 )
 @handle_callback_error
 def update_subcategory_analysis(start_date, end_date, regions, categories):
-    filtered_df = df.copy()
-    
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['Order Date'] >= start_date) &
-            (filtered_df['Order Date'] <= end_date)
-        ]
-    
-    if regions:
-        filtered_df = filtered_df[filtered_df['Region'].isin(regions)]
-    
-    if categories:
-        filtered_df = filtered_df[filtered_df['Category'].isin(categories)]
-    
-    subcategory_analysis = filtered_df.groupby(['Category', 'Sub-Category']).agg({
-        'Sales': 'sum',
-        'Profit': 'sum',
-        'Quantity': 'sum'
-    }).reset_index()
-    
-    fig = px.treemap(subcategory_analysis,
-                     path=[px.Constant("All Categories"), 'Category', 'Sub-Category'],
-                     values='Sales',
-                     color='Profit',
-                     title='Category and Sub-Category Analysis',
-                     template='plotly_white',
-                     color_continuous_scale='RdYlBu')
+    subcategory_analysis = estimate(['Category', 'Sub-Category'], ['Sales', 'Profit', 'Quantity'],
+                                    start_date, end_date, regions, categories)
     
-    fig.update_traces(textinfo="label+value")
+    if subcategory_analysis is None:
+        filtered_df = filter_data(start_date, end_date, regions, categories)
+        
+        with stage('aggregate'):
+            subcategory_analysis = aggregation_engine.aggregate(filtered_df, ['Category', 'Sub-Category'], {
+                'Sales': 'sum',
+                'Profit': 'sum',
+                'Quantity': 'sum'
+            })
+            record_rows(result=len(subcategory_analysis))
+    
+    with stage('figure'):
+        fig = ff.treemap(subcategory_analysis,
+                         path=['Category', 'Sub-Category'],
+                         root="All Categories",
+                         values='Sales',
+                         color='Profit',
+                         hover_data=['Sales MOE', 'Profit MOE'] if 'Sales MOE' in subcategory_analysis else None,
+                         title=approximate_title('Category and Sub-Category Analysis', subcategory_analysis),
+                         color_continuous_scale='RdYlBu',
+                         textinfo="label+value")
     
     return fig
 
@@ -353,8 +692,6 @@ def update_subcategory_analysis(start_date, end_date, regions, categories):
 )
 @handle_callback_error
 def update_customer_geography(start_date, end_date, categories):
-    filtered_df = df.copy()
-    
     # State name to abbreviation mapping
     state_abbrev = {
         'Alabama': 'AL', 'Alaska': 'AK', 'Arizona': 'AZ', 'Arkansas': 'AR', 'California': 'CA',
@@ -370,82 +707,74 @@ def update_customer_geography(start_date, end_date, categories):
         'Washington': 'WA', 'West Virginia': 'WV', 'Wisconsin': 'WI', 'Wyoming': 'WY'
     }
     
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['Order Date'] >= start_date) &
-            (filtered_df['Order Date'] <= end_date)
-        ]
-    
-    if categories:
-        filtered_df = filtered_df[filtered_df['Category'].isin(categories)]
-    
-    # Add state abbreviations
-    filtered_df['State_Code'] = filtered_df['State'].map(state_abbrev)
-    
-    # Aggregate data by state
-    geo_data = filtered_df.groupby(['State', 'State_Code']).agg({
-        'Sales': 'sum',
-        'Profit': 'sum',
-        'Order ID': 'count',
-        'Customer Name': 'nunique'
-    }).reset_index()
-    
-    # Calculate additional metrics
-    geo_data['Avg Order Value'] = geo_data['Sales'] / geo_data['Order ID']
-    geo_data['Profit Margin'] = (geo_data['Profit'] / geo_data['Sales'] * 100)
-    
-    # Create the choropleth map
-    fig = go.Figure(data=go.Choropleth(
-        locations=geo_data['State_Code'],
-        z=geo_data['Sales'],
-        locationmode='USA-states',
-        colorscale='Viridis',
-        colorbar_title="Sales ($)",
-        text=geo_data['State'],  # State names for hover text
-        customdata=np.stack((
-            geo_data['Sales'],
-            geo_data['Profit'],
-            geo_data['Profit Margin'],
-            geo_data['Customer Name'],
-            geo_data['Order ID'],
-            geo_data['Avg Order Value']
-        ), axis=-1)
-    ))
-
-    # Update the layout
-    fig.update_layout(
-        title={
-            'text': 'Sales Distribution by State',
-            'y':0.95,
-            'x':0.5,
-            'xanchor': 'center',
-            'yanchor': 'top'
-        },
-        geo=dict(
-            scope='usa',
-            showlakes=True,
-            lakecolor='rgb(255, 255, 255)',
-            showland=True,
-            landcolor='rgb(242, 242, 242)',
-            showcoastlines=True,
-            coastlinecolor='rgb(180, 180, 180)'
-        ),
-        template='plotly_white',
-        height=600,
-        margin=dict(l=0, r=0, t=30, b=0)
-    )
-
-    # Add comprehensive hover template
-    fig.update_traces(
-        hovertemplate="<b>%{text}</b><br>" +
-                      "Sales: $%{customdata[0]:,.0f}<br>" +
-                      "Profit: $%{customdata[1]:,.0f}<br>" +
-                      "Profit Margin: %{customdata[2]:.1f}%<br>" +
-                      "Unique Customers: %{customdata[3]:.0f}<br>" +
-                      "Total Orders: %{customdata[4]:.0f}<br>" +
-                      "Avg Order Value: $%{customdata[5]:,.2f}<br>" +
-                      "<extra></extra>"
-    )
+    filtered_df = filter_data(start_date, end_date, categories=categories)
+    
+    with stage('aggregate'):
+        # Aggregate data by state
+        geo_data = aggregation_engine.aggregate(filtered_df, 'State', {
+            'Sales': 'sum',
+            'Profit': 'sum',
+            'Order ID': 'count',
+            'Customer Name': 'nunique'
+        })
+        
+        # Add state abbreviations, per state rather than per order
+        geo_data.insert(1, 'State_Code', geo_data['State'].map(state_abbrev))
+        geo_data = geo_data.dropna(subset=['State_Code']).reset_index(drop=True)
+        
+        # Calculate additional metrics
+        geo_data['Avg Order Value'] = geo_data['Sales'] / geo_data['Order ID']
+        geo_data['Profit Margin'] = (geo_data['Profit'] / geo_data['Sales'] * 100)
+        
+        record_rows(result=len(geo_data))
+    
+    with stage('figure'):
+        # Create the choropleth map
+        fig = ff.figure([dict(
+            type='choropleth',
+            locations=geo_data['State_Code'].to_numpy(),
+            z=geo_data['Sales'].to_numpy(),
+            locationmode='USA-states',
+            colorscale=ff.colorscale('Viridis'),
+            colorbar={'title': {'text': "Sales ($)"}},
+            text=geo_data['State'].to_numpy(),  # State names for hover text
+            customdata=np.stack((
+                geo_data['Sales'],
+                geo_data['Profit'],
+                geo_data['Profit Margin'],
+                geo_data['Customer Name'],
+                geo_data['Order ID'],
+                geo_data['Avg Order Value']
+            ), axis=-1),
+            # Comprehensive hover template
+            hovertemplate="<b>%{text}</b><br>" +
+                          "Sales: $%{customdata[0]:,.0f}<br>" +
+                          "Profit: $%{customdata[1]:,.0f}<br>" +
+                          "Profit Margin: %{customdata[2]:.1f}%<br>" +
+                          "Unique Customers: %{customdata[3]:.0f}<br>" +
+                          "Total Orders: %{customdata[4]:.0f}<br>" +
+                          "Avg Order Value: $%{customdata[5]:,.2f}<br>" +
+                          "<extra></extra>"
+        )], dict(
+            title={
+                'text': 'Sales Distribution by State',
+                'y':0.95,
+                'x':0.5,
+                'xanchor': 'center',
+                'yanchor': 'top'
+            },
+            geo=dict(
+                scope='usa',
+                showlakes=True,
+                lakecolor='rgb(255, 255, 255)',
+                showland=True,
+                landcolor='rgb(242, 242, 242)',
+                showcoastlines=True,
+                coastlinecolor='rgb(180, 180, 180)'
+            ),
+            height=600,
+            margin=dict(l=0, r=0, t=30, b=0)
+        ))
     
     return fig
 
@@ -457,73 +786,59 @@ def update_customer_geography(start_date, end_date, categories):
 )
 @handle_callback_error
 def update_delivery_performance(start_date, end_date, regions):
-    filtered_df = df.copy()
+    filtered_df = filter_data(start_date, end_date, regions=regions)
     
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['Order Date'] >= start_date) &
-            (filtered_df['Order Date'] <= end_date)
-        ]
-    
-    if regions:
-        filtered_df = filtered_df[filtered_df['Region'].isin(regions)]
-    
-    # Calculate shipping days
-    filtered_df['Ship Date'] = pd.to_datetime(filtered_df['Ship Date'])
-    filtered_df['Shipping Days'] = (filtered_df['Ship Date'] - filtered_df['Order Date']).dt.days
-    
-    shipping_perf = filtered_df.groupby('Ship Mode').agg({
-        'Shipping Days': ['mean', 'min', 'max'],
-        'Order ID': 'count'
-    }).reset_index()
-    
-    fig = go.Figure()
-    
-    for mode in shipping_perf['Ship Mode']:
-        mode_data = shipping_perf[shipping_perf['Ship Mode'] == mode]
-        fig.add_trace(go.Box(
-            y=filtered_df[filtered_df['Ship Mode'] == mode]['Shipping Days'],
-            name=mode,
-            boxpoints='outliers'
+    with stage('aggregate'):
+        # Calculate shipping days
+        shipping_days = (pd.to_datetime(filtered_df['Ship Date']) - filtered_df['Order Date']).dt.days
+        shipping_df = filtered_df.assign(**{'Shipping Days': shipping_days})
+        
+        shipping_perf = aggregation_engine.aggregate(shipping_df, 'Ship Mode', {
+            'Shipping Days': ['mean', 'min', 'max'],
+            'Order ID': 'count'
+        }, rows_of=filtered_df)
+        record_rows(result=len(shipping_perf))
+    
+    with stage('figure'):
+        boxes = []
+        
+        for mode in shipping_perf['Ship Mode']:
+            boxes.append(dict(
+                type='box',
+                y=shipping_df['Shipping Days'].to_numpy()[(shipping_df['Ship Mode'] == mode).to_numpy()],
+                name=mode,
+                boxpoints='outliers'
+            ))
+        
+        fig = ff.figure(boxes, dict(
+            title={'text': 'Shipping Days Distribution by Ship Mode'},
+            yaxis={'title': {'text': 'Days to Ship'}},
+            showlegend=True
         ))
     
-    fig.update_layout(
-        title='Shipping Days Distribution by Ship Mode',
-        yaxis_title='Days to Ship',
-        showlegend=True,
-        template='plotly_white'
-    )
-    
     return fig
 
 # Callback for Regional Sales
-@app.callback(
+@clientside_view(app, 'regionalSales',
     Output('regional-sales', 'figure'),
     [Input('date-range', 'start_date'),
      Input('date-range', 'end_date'),
      Input('category-filter', 'value')]
 )
 def update_regional_sales(start_date, end_date, categories):
-    filtered_df = df.copy()
-    
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['Order Date'] >= start_date) &
-            (filtered_df['Order Date'] <= end_date)
-        ]
-    
-    if categories:
-        filtered_df = filtered_df[filtered_df['Category'].isin(categories)]
+    filtered_df = filter_data(start_date, end_date, categories=categories)
     
-    regional_sales = filtered_df.groupby('Region').agg({
-        'Sales': 'sum',
-        'Profit': 'sum'
-    }).reset_index()
+    with stage('aggregate'):
+        regional_sales = aggregation_engine.aggregate(filtered_df, 'Region', {
+            'Sales': 'sum',
+            'Profit': 'sum'
+        })
+        record_rows(result=len(regional_sales))
     
-    fig = px.bar(regional_sales, x='Region', y=['Sales', 'Profit'],
-                 title='Sales and Profit by Region',
-                 barmode='group',
-                 template='plotly_white')
+    with stage('figure'):
+        fig = ff.bar(regional_sales, x='Region', y=['Sales', 'Profit'],
+                     title='Sales and Profit by Region',
+                     barmode='group')
     
     return fig
 
@@ -535,59 +850,54 @@ def update_regional_sales(start_date, end_date, categories):
      Input('region-filter', 'value')]
 )
 def update_top_products(start_date, end_date, regions):
-    filtered_df = df.copy()
+    filtered_df = filter_data(start_date, end_date, regions=regions)
     
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['Order Date'] >= start_date) &
-            (filtered_df['Order Date'] <= end_date)
-        ]
+    with stage('aggregate'):
+        top_products = aggregation_engine.aggregate(filtered_df, 'Product Name', {
+            'Sales': 'sum',
+            'Quantity': 'sum'
+        }).sort_values('Sales', ascending=False).head(10).reset_index(drop=True)
+        record_rows(result=len(top_products))
     
-    if regions:
-        filtered_df = filtered_df[filtered_df['Region'].isin(regions)]
-    
-    top_products = filtered_df.groupby('Product Name').agg({
-        'Sales': 'sum',
-        'Quantity': 'sum'
-    }).sort_values('Sales', ascending=False).head(10).reset_index()
-    
-    fig = px.bar(top_products, x='Sales', y='Product Name',
-                 title='Top 10 Products by Sales',
-                 orientation='h',
-                 template='plotly_white')
+    with stage('figure'):
+        fig = ff.bar(top_products, x='Sales', y='Product Name',
+                     title='Top 10 Products by Sales',
+                     orientation='h')
     
     return fig
 
 # Callback for Category Performance
-@app.callback(
+@product_tab.view(
     Output('category-performance', 'figure'),
     [Input('date-range', 'start_date'),
      Input('date-range', 'end_date'),
-     Input('region-filter', 'value')]
+     Input('region-filter', 'value')],
+    clientside='categoryPerformance'
 )
 def update_category_performance(start_date, end_date, regions):
-    filtered_df = df.copy()
-    
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['Order Date'] >= start_date) &
-            (filtered_df['Order Date'] <= end_date)
-        ]
-    
-    if regions:
-        filtered_df = filtered_df[filtered_df['Region'].isin(regions)]
-    
-    category_perf = filtered_df.groupby('Category').agg({
-        'Sales': 'sum',
-        'Profit': 'sum',
-        'Quantity': 'sum'
-    }).reset_index()
-    
-    fig = px.sunburst(filtered_df, 
-                      path=['Category', 'Sub-Category'],
-                      values='Sales',
-                      title='Category and Sub-Category Performance',
-                      template='plotly_white')
+    approx = estimate(['Category', 'Sub-Category'], ['Sales'], start_date, end_date, regions)
+    if approx is not None:
+        with stage('figure'):
+            return ff.sunburst(approx,
+                               path=['Category', 'Sub-Category'],
+                               values='Sales',
+                               hover_data=['Sales MOE'],
+                               title=approximate_title('Category and Sub-Category Performance', approx))
+    
+    filtered_df = filter_data(start_date, end_date, regions=regions)
+    
+    with stage('aggregate'):
+        # The sunburst's leaves; its category totals are summed from them
+        category_perf = aggregation_engine.aggregate(filtered_df, ['Category', 'Sub-Category'], {
+            'Sales': 'sum'
+        })
+        record_rows(result=len(category_perf))
+    
+    with stage('figure'):
+        fig = ff.sunburst(category_perf, 
+                          path=['Category', 'Sub-Category'],
+                          values='Sales',
+                          title='Category and Sub-Category Performance')
     
     return fig
 
@@ -600,32 +910,27 @@ def update_category_performance(start_date, end_date, regions):
      Input('category-filter', 'value')]
 )
 def update_customer_segments(start_date, end_date, regions, categories):
-    filtered_df = df.copy()
-    
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['Order Date'] >= start_date) &
-            (filtered_df['Order Date'] <= end_date)
-        ]
-    
-    if regions:
-        filtered_df = filtered_df[filtered_df['Region'].isin(regions)]
-    
-    if categories:
-        filtered_df = filtered_df[filtered_df['Category'].isin(categories)]
+    segment_analysis = estimate(['Segment'], ['Sales', 'Profit'], start_date, end_date, regions, categories)
     
-    segment_analysis = filtered_df.groupby('Segment').agg({
-        'Sales': 'sum',
-        'Profit': 'sum',
-        'Customer Name': 'nunique'
-    }).reset_index()
-    
-    fig = px.pie(segment_analysis, 
-                 values='Sales', 
-                 names='Segment',
-                 title='Sales Distribution by Customer Segment',
-                 template='plotly_white',
-                 hole=0.4)
+    if segment_analysis is None:
+        filtered_df = filter_data(start_date, end_date, regions, categories)
+        
+        with stage('aggregate'):
+            segment_analysis = aggregation_engine.aggregate(filtered_df, 'Segment', {
+                'Sales': 'sum',
+                'Profit': 'sum',
+                'Customer Name': 'nunique'
+            })
+            record_rows(result=len(segment_analysis))
+    
+    with stage('figure'):
+        fig = px.pie(segment_analysis, 
+                     values='Sales', 
+                     names='Segment',
+                     hover_data=['Sales MOE'] if 'Sales MOE' in segment_analysis else None,
+                     title=approximate_title('Sales Distribution by Customer Segment', segment_analysis),
+                     template='plotly_white',
+                     hole=0.4)
     
     return fig
 
@@ -637,29 +942,22 @@ def update_customer_segments(start_date, end_date, regions, categories):
      Input('region-filter', 'value')]
 )
 def update_shipping_analysis(start_date, end_date, regions):
-    filtered_df = df.copy()
-    
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['Order Date'] >= start_date) &
-            (filtered_df['Order Date'] <= end_date)
-        ]
-    
-    if regions:
-        filtered_df = filtered_df[filtered_df['Region'].isin(regions)]
-    
-    shipping_analysis = filtered_df.groupby(['Ship Mode', 'Category']).agg({
-        'Sales': 'sum',
-        'Order ID': 'count'
-    }).reset_index()
-    
-    fig = px.bar(shipping_analysis, 
-                 x='Category', 
-                 y='Sales',
-                 color='Ship Mode',
-                 title='Sales by Shipping Mode and Category',
-                 template='plotly_white',
-                 barmode='group')
+    filtered_df = filter_data(start_date, end_date, regions=regions)
+    
+    with stage('aggregate'):
+        shipping_analysis = aggregation_engine.aggregate(filtered_df, ['Ship Mode', 'Category'], {
+            'Sales': 'sum',
+            'Order ID': 'count'
+        })
+        record_rows(result=len(shipping_analysis))
+    
+    with stage('figure'):
+        fig = ff.bar(shipping_analysis, 
+                     x='Category', 
+                     y='Sales',
+                     color='Ship Mode',
+                     title='Sales by Shipping Mode and Category',
+                     barmode='group')
     
     return fig
 
@@ -672,58 +970,47 @@ def update_shipping_analysis(start_date, end_date, regions):
      Input('category-filter', 'value')]
 )
 def update_profit_trends(start_date, end_date, regions, categories):
-    filtered_df = df.copy()
-    
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['Order Date'] >= start_date) &
-            (filtered_df['Order Date'] <= end_date)
-        ]
+    filtered_df = filter_data(start_date, end_date, regions, categories)
     
-    if regions:
-        filtered_df = filtered_df[filtered_df['Region'].isin(regions)]
-    
-    if categories:
-        filtered_df = filtered_df[filtered_df['Category'].isin(categories)]
-    
-    profit_trend = filtered_df.groupby('Month Year').agg({
-        'Profit': 'sum',
-        'Sales': 'sum'
-    }).reset_index()
-    
-    profit_trend['Profit Margin'] = (profit_trend['Profit'] / profit_trend['Sales']) * 100
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatter(
-        x=profit_trend['Month Year'],
-        y=profit_trend['Profit'],
-        name='Profit',
-        line=dict(color=COLORS['primary'])
-    ))
-    
-    fig.add_trace(go.Scatter(
-        x=profit_trend['Month Year'],
-        y=profit_trend['Profit Margin'],
-        name='Profit Margin %',
-        yaxis='y2',
-        line=dict(color=COLORS['accent'], dash='dash')
-    ))
-    
-    fig.update_layout(
-        title='Profit and Margin Trends',
-        template='plotly_white',
-        yaxis2=dict(
-            title='Profit Margin %',
-            overlaying='y',
-            side='right'
-        ),
-        hovermode='x unified'
-    )
+    with stage('aggregate'):
+        profit_trend = aggregation_engine.aggregate(filtered_df, 'Month Year', {
+            'Profit': 'sum',
+            'Sales': 'sum'
+        })
+        
+        profit_trend['Profit Margin'] = (profit_trend['Profit'] / profit_trend['Sales']) * 100
+        record_rows(result=len(profit_trend))
+    
+    with stage('figure'):
+        fig = ff.figure([
+            dict(
+                type='scatter',
+                x=profit_trend['Month Year'].to_numpy(),
+                y=profit_trend['Profit'].to_numpy(),
+                name='Profit',
+                line=dict(color=COLORS['primary'])
+            ),
+            dict(
+                type='scatter',
+                x=profit_trend['Month Year'].to_numpy(),
+                y=profit_trend['Profit Margin'].to_numpy(),
+                name='Profit Margin %',
+                yaxis='y2',
+                line=dict(color=COLORS['accent'], dash='dash')
+            )
+        ], dict(
+            title={'text': 'Profit and Margin Trends'},
+            yaxis2=dict(
+                title={'text': 'Profit Margin %'},
+                overlaying='y',
+                side='right'
+            ),
+            hovermode='x unified'
+        ))
     
     return fig
 
-@app.callback(
+@product_tab.view(
     Output('product-profitability', 'figure'),
     [Input('date-range', 'start_date'),
      Input('date-range', 'end_date'),
@@ -732,52 +1019,44 @@ def update_profit_trends(start_date, end_date, regions, categories):
 )
 @handle_callback_error
 def update_product_profitability(start_date, end_date, regions, categories):
-    filtered_df = df.copy()
-    
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['Order Date'] >= start_date) &
-            (filtered_df['Order Date'] <= end_date)
-        ]
-    
-    if regions:
-        filtered_df = filtered_df[filtered_df['Region'].isin(regions)]
-    
-    if categories:
-        filtered_df = filtered_df[filtered_df['Category'].isin(categories)]
-    
-    # Calculate product profitability metrics
-    product_profit = filtered_df.groupby('Product Name').agg({
-        'Sales': 'sum',
-        'Profit': 'sum',
-        'Quantity': 'sum'
-    }).reset_index()
-    
-    product_profit['Profit Margin'] = (product_profit['Profit'] / product_profit['Sales'] * 100)
-    product_profit['Profit per Unit'] = product_profit['Profit'] / product_profit['Quantity']
-    
-    # Sort by profit and get top 20 products
-    top_products = product_profit.nlargest(20, 'Profit')
-    
-    fig = px.scatter(top_products,
-                     x='Sales',
-                     y='Profit',
-                     size='Quantity',
-                     color='Profit Margin',
-                     hover_name='Product Name',
-                     hover_data=['Profit Margin', 'Profit per Unit'],
-                     title='Top 20 Products - Profitability Analysis',
-                     template='plotly_white',
-                     color_continuous_scale='RdYlBu')
-    
-    fig.update_layout(
-        xaxis_title="Total Sales ($)",
-        yaxis_title="Total Profit ($)",
-        coloraxis_colorbar_title="Profit Margin %"
-    )
+    filtered_df = filter_data(start_date, end_date, regions, categories)
+    
+    with stage('aggregate'):
+        # Calculate product profitability metrics
+        product_profit = aggregation_engine.aggregate(filtered_df, 'Product Name', {
+            'Sales': 'sum',
+            'Profit': 'sum',
+            'Quantity': 'sum'
+        })
+        
+        product_profit['Profit Margin'] = (product_profit['Profit'] / product_profit['Sales'] * 100)
+        product_profit['Profit per Unit'] = product_profit['Profit'] / product_profit['Quantity']
+        
+        # Sort by profit and get top 20 products
+        top_products = product_profit.nlargest(20, 'Profit')
+        record_rows(result=len(top_products))
+    
+    with stage('figure'):
+        fig = ff.scatter(top_products,
+                         x='Sales',
+                         y='Profit',
+                         size='Quantity',
+                         color='Profit Margin',
+                         hover_name='Product Name',
+                         hover_data=['Profit Margin', 'Profit per Unit'],
+                         title='Top 20 Products - Profitability Analysis',
+                         color_continuous_scale='RdYlBu')
+        
+        ff.update_layout(fig,
+            xaxis={'title': {'text': "Total Sales ($)"}},
+            yaxis={'title': {'text': "Total Profit ($)"}},
+            coloraxis={'colorbar': {'title': {'text': "Profit Margin %"}}}
+        )
     
     return fig
 
+product_tab.register()
+
 @app.callback(
     Output('top-customers', 'figure'),
     [Input('date-range', 'start_date'),
@@ -787,131 +1066,333 @@ def update_product_profitability(start_date, end_date, regions, categories):
 )
 @handle_callback_error
 def update_top_customers(start_date, end_date, regions, categories):
-    filtered_df = df.copy()
-    
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['Order Date'] >= start_date) &
-            (filtered_df['Order Date'] <= end_date)
-        ]
-    
-    if regions:
-        filtered_df = filtered_df[filtered_df['Region'].isin(regions)]
+    with stage('aggregate'):
+        # Top 15 customers by sales, with their metrics. Pushed down to the SQLite or Parquet
+        # backend when one is configured; otherwise read from the customer summary
+        if query_backend.name != 'pandas':
+            top_customers = query_backend.aggregate(
+                ['Customer Name'],
+                {
+                    'Sales': ('Sales', 'sum'),
+                    'Profit': ('Profit', 'sum'),
+                    'Order ID': ('Order ID', 'nunique'),
+                    'Quantity': ('Quantity', 'sum')
+                },
+                start_date, end_date, regions, categories,
+                order_by='Sales', limit=15
+            )
+        else:
+            top_customers = customer_summary.top_customers(start_date, end_date, regions, categories, limit=15)
+            record_rows(scanned=top_customers.attrs['rows_read'])
+        
+        top_customers['Avg Order Value'] = top_customers['Sales'] / top_customers['Order ID']
+        top_customers['Profit Margin'] = top_customers['Profit'] / top_customers['Sales'] * 100
+        record_rows(result=len(top_customers))
+    
+    with stage('figure'):
+        customers = top_customers['Customer Name'].to_numpy()
+        fig = ff.figure([
+            # Bars for sales
+            dict(
+                type='bar',
+                x=customers,
+                y=top_customers['Sales'].to_numpy(),
+                name='Sales',
+                marker=dict(color='#1f77b4')
+            ),
+            # Bars for profit
+            dict(
+                type='bar',
+                x=customers,
+                y=top_customers['Profit'].to_numpy(),
+                name='Profit',
+                marker=dict(color='#2ca02c')
+            ),
+            # Line for profit margin
+            dict(
+                type='scatter',
+                x=customers,
+                y=top_customers['Profit Margin'].to_numpy(),
+                name='Profit Margin %',
+                yaxis='y2',
+                line=dict(color='#ff7f0e', width=2)
+            )
+        ], dict(
+            title={'text': 'Top 15 Customers by Sales'},
+            xaxis={'title': {'text': "Customer"}, 'tickangle': -45},
+            yaxis={'title': {'text': "Amount ($)"}},
+            yaxis2=dict(
+                title={'text': 'Profit Margin %'},
+                overlaying='y',
+                side='right'
+            ),
+            barmode='group',
+            showlegend=True,
+            height=600
+        ))
     
-    if categories:
-        filtered_df = filtered_df[filtered_df['Category'].isin(categories)]
+    return fig
+
+@app.callback(
+    Output('rfm-segments', 'figure'),
+    [Input('date-range', 'start_date'),
+     Input('date-range', 'end_date'),
+     Input('region-filter', 'value'),
+     Input('category-filter', 'value')]
+)
+@handle_callback_error
+def update_rfm_segments(start_date, end_date, regions, categories):
+    with stage('aggregate'):
+        # Recency, frequency and monetary quintiles per customer, grouped into segments
+        rfm = customer_summary.rfm(start_date, end_date, regions, categories)
+        record_rows(scanned=rfm.attrs.get('rows_read', 0))
+        if rfm.empty:
+            segments = pd.DataFrame(columns=['RFM Segment', 'Customers', 'Sales', 'Avg Recency (days)'])
+        else:
+            segments = rfm.groupby('RFM Segment').agg(
+                Customers=('Customer Name', 'size'),
+                Sales=('Sales', 'sum'),
+                **{'Avg Recency (days)': ('Recency', 'mean')}
+            ).reset_index().sort_values('Sales', ascending=False)
+        record_rows(result=len(segments))
+    
+    with stage('figure'):
+        fig = ff.bar(segments,
+                     x='RFM Segment',
+                     y='Customers',
+                     color='Sales',
+                     hover_data=['Sales', 'Avg Recency (days)'],
+                     title='Customers by RFM Segment',
+                     color_continuous_scale='Blues')
     
-    # Calculate customer metrics
-    customer_analysis = filtered_df.groupby('Customer Name').agg({
-        'Sales': 'sum',
-        'Profit': 'sum',
-        'Order ID': 'nunique',
-        'Quantity': 'sum'
-    }).reset_index()
+    return fig
+
+@app.callback(
+    Output('cohort-retention', 'figure'),
+    [Input('date-range', 'start_date'),
+     Input('date-range', 'end_date'),
+     Input('region-filter', 'value'),
+     Input('category-filter', 'value')]
+)
+@handle_callback_error
+def update_cohort_retention(start_date, end_date, regions, categories):
+    with stage('aggregate'):
+        # Customers grouped by the month of their first order in the selection
+        retention = customer_summary.cohorts(start_date, end_date, regions, categories)
+        record_rows(result=retention.size)
+    
+    with stage('figure'):
+        if retention.empty:
+            return go.Figure(layout=dict(title='Monthly Cohort Retention', template='plotly_white'))
+        fig = px.imshow(retention,
+                        labels=dict(x='Months Since First Order', y='Cohort', color='Retention %'),
+                        title='Monthly Cohort Retention',
+                        template='plotly_white',
+                        color_continuous_scale='Blues',
+                        aspect='auto')
+        fig.update_layout(height=600)
     
-    customer_analysis['Avg Order Value'] = customer_analysis['Sales'] / customer_analysis['Order ID']
-    customer_analysis['Profit Margin'] = customer_analysis['Profit'] / customer_analysis['Sales'] * 100
+    return fig
+
+@app.callback(
+    Output('margin-analysis', 'figure'),
+    [Input('date-range', 'start_date'),
+     Input('date-range', 'end_date'),
+     Input('region-filter', 'value'),
+     Input('category-filter', 'value')]
+)
+@handle_callback_error
+def update_margin_analysis(start_date, end_date, regions, categories):
+    with stage('aggregate'):
+        # Calculate margins by category and sub-category
+        margin_analysis = query_backend.aggregate(
+            ['Category', 'Sub-Category'],
+            {
+                'Sales': ('Sales', 'sum'),
+                'Profit': ('Profit', 'sum'),
+                'Discount': ('Discount', 'mean'),
+                'Quantity': ('Quantity', 'sum')
+            },
+            start_date, end_date, regions, categories
+        )
+        
+        margin_analysis['Profit Margin'] = margin_analysis['Profit'] / margin_analysis['Sales'] * 100
+        margin_analysis['Revenue per Unit'] = margin_analysis['Sales'] / margin_analysis['Quantity']
+        margin_analysis['Profit per Unit'] = margin_analysis['Profit'] / margin_analysis['Quantity']
+        record_rows(result=len(margin_analysis))
+    
+    with stage('figure'):
+        fig = ff.sunburst(
+            margin_analysis,
+            path=['Category', 'Sub-Category'],
+            values='Sales',
+            color='Profit Margin',
+            hover_data=['Profit Margin', 'Discount', 'Revenue per Unit', 'Profit per Unit'],
+            title='Profit Margin Analysis by Category',
+            color_continuous_scale='RdYlBu'
+        )
+        
+        ff.update_layout(fig,
+            height=600,
+            coloraxis={'colorbar': {'title': {'text': "Profit Margin %"}}}
+        )
     
-    # Get top 15 customers
-    top_customers = customer_analysis.nlargest(15, 'Sales')
+    return fig
+
+# Exact refinement of the approximate callbacks; only registered in approximate mode
+if APPROX_CONFIG['enabled']:
+    for callback_func, outputs, inputs in [
+        (update_kpi_cards, [('total-sales', 'children'), ('total-profit', 'children'),
+                            ('total-orders', 'children'), ('avg-margin', 'children')], filter_inputs),
+        (update_sales_trend, [('sales-trend', 'figure')], filter_inputs),
+        (update_subcategory_analysis, [('subcategory-analysis', 'figure')], filter_inputs),
+        (update_category_performance, [('category-performance', 'figure')], filter_inputs[:3]),
+        (update_customer_segments, [('customer-segments', 'figure')], filter_inputs)
+    ]:
+        # Views computed in the browser are already exact
+        if hasattr(callback_func, 'clientside_function'):
+            continue
+        register_exact_refinement(app, callback_func, outputs, inputs, get_df,
+                                  cached=result_cache.get if RESULT_CACHE_CONFIG['enabled'] else None)
+
+# Order drill-down: only the requested page is read from the frame
+@app.callback(
+    [Output('order-table', 'data'),
+     Output('order-table', 'page_count')],
+    filter_inputs + [Input('order-table', 'page_current'),
+                     Input('order-table', 'page_size'),
+                     Input('order-table', 'sort_by'),
+                     Input('order-table', 'filter_query')]
+)
+def update_order_table(start_date, end_date, regions, categories, page_current, page_size, sort_by,
+                       filter_query):
+    with stage('page'):
+        records, page_count, matched = order_index.page(start_date, end_date, regions, categories,
+                                                        filter_query, sort_by, page_current, page_size)
+        record_rows(scanned=len(records), result=matched)
+    return records, page_count
+
+app.clientside_callback(
+    ClientsideFunction('drilldown', 'firstPage'),
+    Output('order-table', 'page_current'),
+    filter_inputs + [Input('order-table', 'sort_by'),
+                     Input('order-table', 'filter_query')],
+    prevent_initial_call=True
+)
+
+app.clientside_callback(
+    ClientsideFunction('drilldown', 'customerOrders'),
+    Output('order-table', 'filter_query'),
+    Input('top-customers', 'clickData'),
+    prevent_initial_call=True
+)
+
+def fit_prophet_forecast(series, start_date, end_date, regions, categories, horizon):
+    # Fitted models and forecasts are cached by (series, filter, data version)
+    key = ('prophet', series, start_date, end_date, tuple(sorted(regions or [])),
+           tuple(sorted(categories or [])), horizon, get_df().attrs.get('version'))
+    cached = forecast_cache.get(key)
+    if cached is not None:
+        return cached['forecast']
+
+    # Prophet is heavy to import, so only the background workers that fit models pay for it
+    from prophet import Prophet
+    from prophet.serialize import model_to_json
+
+    with forecast_slots:
+        # The same forecast may have been fitted while this job waited for a slot
+        cached = forecast_cache.get(key)
+        if cached is not None:
+            return cached['forecast']
+
+        filtered_df = filter_data(start_date, end_date, regions, categories)
+        
+        daily = filtered_df.groupby('Order Date')[series].sum().asfreq('D', fill_value=0).reset_index()
+        daily.columns = ['ds', 'y']
+        
+        model = Prophet(yearly_seasonality=True, weekly_seasonality=True, daily_seasonality=False)
+        model.fit(daily)
+        future = model.make_future_dataframe(periods=horizon)
+        forecast = model.predict(future)[['ds', 'yhat', 'yhat_lower', 'yhat_upper']]
+        forecast['y'] = daily.set_index('ds')['y'].reindex(forecast['ds']).values
+        
+        forecast_cache.set(key, {'model': model_to_json(model), 'forecast': forecast},
+                           expire=FORECAST_CONFIG['expire_seconds'])
+    return forecast
+
+@app.callback(
+    Output('forecast-graph', 'figure'),
+    [Input('date-range', 'start_date'),
+     Input('date-range', 'end_date'),
+     Input('region-filter', 'value'),
+     Input('category-filter', 'value'),
+     Input('forecast-series', 'value'),
+     Input('forecast-horizon', 'value'),
+     Input('main-tabs', 'value')],
+    background=True,
+    running=[(Output('forecast-status', 'children'), "Fitting forecast model...", "")]
+)
+@handle_callback_error
+def update_forecast(start_date, end_date, regions, categories, series, horizon, active_tab):
+    # Filter changes made on other tabs do not start a fit; opening the tab does
+    if active_tab != 'forecast':
+        raise PreventUpdate
+    forecast = fit_prophet_forecast(series, start_date, end_date, regions, categories, horizon)
+    history = forecast[forecast['y'].notna()]
     
     fig = go.Figure()
     
-    # Add bars for sales
-    fig.add_trace(go.Bar(
-        x=top_customers['Customer Name'],
-        y=top_customers['Sales'],
-        name='Sales',
-        marker_color='#1f77b4'
+    fig.add_trace(go.Scatter(
+        x=history['ds'],
+        y=history['y'],
+        name=f'Actual {series}',
+        mode='lines',
+        line=dict(color=COLORS['primary'], width=1)
     ))
     
-    # Add bars for profit
-    fig.add_trace(go.Bar(
-        x=top_customers['Customer Name'],
-        y=top_customers['Profit'],
-        name='Profit',
-        marker_color='#2ca02c'
+    fig.add_trace(go.Scatter(
+        x=forecast['ds'],
+        y=forecast['yhat_upper'],
+        mode='lines',
+        line=dict(width=0),
+        showlegend=False,
+        hoverinfo='skip'
     ))
     
-    # Add line for profit margin
     fig.add_trace(go.Scatter(
-        x=top_customers['Customer Name'],
-        y=top_customers['Profit Margin'],
-        name='Profit Margin %',
-        yaxis='y2',
-        line=dict(color='#ff7f0e', width=2)
+        x=forecast['ds'],
+        y=forecast['yhat_lower'],
+        name='Uncertainty',
+        mode='lines',
+        line=dict(width=0),
+        fill='tonexty',
+        fillcolor='rgba(255, 127, 14, 0.2)'
+    ))
+    
+    fig.add_trace(go.Scatter(
+        x=forecast['ds'],
+        y=forecast['yhat'],
+        name='Forecast',
+        mode='lines',
+        line=dict(color=COLORS['accent'], width=2)
     ))
     
     fig.update_layout(
-        title='Top 15 Customers by Sales',
-        xaxis_title="Customer",
-        yaxis_title="Amount ($)",
-        yaxis2=dict(
-            title='Profit Margin %',
-            overlaying='y',
-            side='right'
-        ),
-        barmode='group',
+        title=f'Daily {series} Forecast ({horizon} days ahead)',
+        xaxis_title="Date",
+        yaxis_title=series,
         template='plotly_white',
-        showlegend=True,
-        xaxis_tickangle=-45,
+        hovermode='x unified',
         height=600
     )
     
     return fig
 
-@app.callback(
-    Output('margin-analysis', 'figure'),
-    [Input('date-range', 'start_date'),
-     Input('date-range', 'end_date'),
-     Input('region-filter', 'value'),
-     Input('category-filter', 'value')]
-)
-@handle_callback_error
-def update_margin_analysis(start_date, end_date, regions, categories):
-    filtered_df = df.copy()
-    
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['Order Date'] >= start_date) &
-            (filtered_df['Order Date'] <= end_date)
-        ]
-    
-    if regions:
-        filtered_df = filtered_df[filtered_df['Region'].isin(regions)]
-    
-    if categories:
-        filtered_df = filtered_df[filtered_df['Category'].isin(categories)]
-    
-    # Calculate margins by category and sub-category
-    margin_analysis = filtered_df.groupby(['Category', 'Sub-Category']).agg({
-        'Sales': 'sum',
-        'Profit': 'sum',
-        'Discount': 'mean',
-        'Quantity': 'sum'
-    }).reset_index()
-    
-    margin_analysis['Profit Margin'] = margin_analysis['Profit'] / margin_analysis['Sales'] * 100
-    margin_analysis['Revenue per Unit'] = margin_analysis['Sales'] / margin_analysis['Quantity']
-    margin_analysis['Profit per Unit'] = margin_analysis['Profit'] / margin_analysis['Quantity']
-    
-    fig = px.sunburst(
-        margin_analysis,
-        path=['Category', 'Sub-Category'],
-        values='Sales',
-        color='Profit Margin',
-        hover_data=['Profit Margin', 'Discount', 'Revenue per Unit', 'Profit per Unit'],
-        title='Profit Margin Analysis by Category',
-        template='plotly_white',
-        color_continuous_scale='RdYlBu'
+if RESULT_CACHE_CONFIG['enabled']:
+    result_cache.start(
+        defaults={'start_date': layout_metadata['start_date'], 'end_date': layout_metadata['end_date']},
+        options={'regions': layout_metadata['regions'], 'categories': layout_metadata['categories']}
     )
-    
-    fig.update_layout(
-        height=600,
-        coloraxis_colorbar_title="Profit Margin %"
-    )
-    
-    return fig
 
 # Custom CSS
 app.index_string = '''
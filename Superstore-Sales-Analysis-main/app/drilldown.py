@@ -0,0 +1,185 @@
+import re
+import threading
+import time
+
+from fast_boot import lazy_import
+from memory_budget import MEMORY
+
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+
+# Order Drill-Down Configuration
+DRILLDOWN_CONFIG = {
+    'page_size': 25,
+    'columns': ['Order ID', 'Order Date', 'Customer Name', 'Segment', 'Region', 'State', 'City',
+                'Category', 'Sub-Category', 'Product Name', 'Sales', 'Quantity', 'Discount', 'Profit'],
+    'numeric_columns': ['Sales', 'Quantity', 'Discount', 'Profit']
+}
+
+OPERATORS = {
+    '=': 'eq', 'eq': 'eq', '!=': 'ne', 'ne': 'ne', '<': 'lt', 'lt': 'lt', '<=': 'le', 'le': 'le',
+    '>': 'gt', 'gt': 'gt', '>=': 'ge', 'ge': 'ge', 'contains': 'contains',
+    'datestartswith': 'datestartswith'
+}
+
+# One clause of a filter query: quoted values (which may contain "&&") or anything but "&&"
+FILTER_CLAUSE = re.compile(r'''(?:"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|`(?:\\.|[^`\\])*`|[^"'`&]|(?<!&)&(?!&))+''')
+FILTER_PART = re.compile(r'^\{(?P<column>[^}]+)\}\s+(?P<case>[si]?)(?P<operator>[^\s]+)\s+(?P<value>.+)$')
+
+def table_columns():
+    return [{'name': c, 'id': c, 'type': 'numeric' if c in DRILLDOWN_CONFIG['numeric_columns'] else 'text'}
+            for c in DRILLDOWN_CONFIG['columns']]
+
+def parse_filter_query(filter_query):
+    # DataTable's custom filtering sends e.g. '{Sales} > 100 && {Customer Name} icontains "smith"'
+    parts = []
+    for part in FILTER_CLAUSE.findall(filter_query or ''):
+        match = FILTER_PART.match(part.strip())
+        if not match or match['column'] not in DRILLDOWN_CONFIG['columns']:
+            continue
+        operator = OPERATORS.get(match['operator'])
+        if operator is None:
+            continue
+        value = match['value'].strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'`':
+            value = value[1:-1].replace('\\' + value[0], value[0])
+        elif match['column'] in DRILLDOWN_CONFIG['numeric_columns']:
+            try:
+                value = float(value)
+            except ValueError:
+                continue
+        parts.append((match['column'], operator, value, match['case'] == 'i'))
+    return parts
+
+def apply_filter(values, operator, value, ignore_case):
+    if operator in ('contains', 'datestartswith') or isinstance(value, str):
+        strings = pd.Series(values).astype(str)
+        value = str(value)
+        if ignore_case:
+            strings, value = strings.str.lower(), value.lower()
+        if operator == 'contains':
+            return strings.str.contains(value, regex=False).to_numpy()
+        if operator == 'datestartswith':
+            return strings.str.startswith(value).to_numpy()
+        values = strings.to_numpy()
+    return {
+        'eq': lambda: values == value, 'ne': lambda: values != value,
+        'lt': lambda: values < value, 'le': lambda: values <= value,
+        'gt': lambda: values > value, 'ge': lambda: values >= value
+    }[operator]()
+
+class OrderIndex:
+    # Row positions sorted by date answer date ranges with a binary search, and one stored
+    # permutation per column answers any sort; a page then reads only its own rows
+    def __init__(self, get_df):
+        self.get_df = get_df
+        self._lock = threading.Lock()
+        self._source = None
+        # Sort permutations and row selections of recent (filter, sort) combinations, so paging
+        # through one is O(page); both are evictable under the shared memory budget
+        self._permutations = MEMORY.cache('sort_permutations')
+        self._selections = MEMORY.cache('drilldown_selections')
+        self._index = MEMORY.cache('order_index')
+
+    def _current(self):
+        # The frame with its date index (positions sorted by date, sorted dates), taken together
+        # so a request never mixes them with those of a frame swapped in meanwhile
+        df = self.get_df()
+        with self._lock:
+            if self._source is not df:
+                started = time.perf_counter()
+                dates = df['Order Date'].to_numpy()
+                date_order = np.argsort(dates, kind='stable')
+                self._dates = (date_order, dates[date_order])
+                self._permutations.clear()
+                self._selections.clear()
+                # The date index is used by every page, so it is accounted for but never evicted
+                self._index.put('dates', self._dates, time.perf_counter() - started, pinned=True)
+                self._source = df
+            return df, self._dates
+
+    def _cached(self, cache, key, df):
+        # Entries belong to the current frame; a request still serving an older one recomputes
+        with self._lock:
+            return cache.get(key) if self._source is df else None
+
+    def permutation(self, column, df=None, dates=None):
+        if df is None:
+            df, dates = self._current()
+        if column == 'Order Date':
+            return dates[0]
+        permutation = self._cached(self._permutations, column, df)
+        if permutation is None:
+            # Sorted factor codes order mixed or missing values without comparing them
+            started = time.perf_counter()
+            permutation = np.argsort(pd.factorize(df[column], sort=True)[0], kind='stable')
+            with self._lock:
+                if self._source is df:
+                    self._permutations.put(column, permutation, time.perf_counter() - started)
+        return permutation
+
+    def warm_async(self):
+        # Sorting by any column is a lookup from the first click on
+        def precompute():
+            for column in DRILLDOWN_CONFIG['columns']:
+                self.permutation(column)
+        threading.Thread(target=precompute, name='order-index', daemon=True).start()
+
+    def selection(self, df, dates, start_date, end_date, regions, categories, filter_query, sort_by):
+        sort = sort_by[0] if sort_by else {}
+        key = (str(start_date)[:10] if start_date and end_date else None,
+               str(end_date)[:10] if start_date and end_date else None,
+               tuple(sorted(regions or [])), tuple(sorted(categories or [])),
+               filter_query or '', sort.get('column_id'), sort.get('direction'))
+        positions = self._cached(self._selections, key, df)
+        if positions is not None:
+            return positions
+
+        started = time.perf_counter()
+        # Same date semantics as filter_data: both ends inclusive, only when both are set
+        date_order, sorted_dates = dates
+        positions = date_order
+        if start_date and end_date:
+            lo = np.searchsorted(sorted_dates, pd.Timestamp(str(start_date)[:10]).to_datetime64(), 'left')
+            hi = np.searchsorted(sorted_dates, pd.Timestamp(str(end_date)[:10]).to_datetime64(), 'right')
+            positions = positions[lo:hi]
+        if regions:
+            positions = positions[np.isin(df['Region'].to_numpy()[positions], regions)]
+        if categories:
+            positions = positions[np.isin(df['Category'].to_numpy()[positions], categories)]
+        for column, operator, value, ignore_case in parse_filter_query(filter_query):
+            values = df[column].to_numpy()[positions]
+            if column == 'Order Date':
+                values = pd.DatetimeIndex(values).strftime('%Y-%m-%d').to_numpy()
+            positions = positions[apply_filter(values, operator, value, ignore_case)]
+
+        if sort.get('column_id') in DRILLDOWN_CONFIG['columns']:
+            # Walk the column's permutation and keep the selected rows, instead of sorting them
+            permutation = self.permutation(sort['column_id'], df, dates)
+            if len(positions) < len(df):
+                member = np.zeros(len(df), dtype=bool)
+                member[positions] = True
+                permutation = permutation[member[permutation]]
+            positions = permutation
+            if sort.get('direction') == 'desc':
+                positions = positions[::-1]
+        else:
+            # Newest orders first
+            positions = positions[::-1]
+
+        with self._lock:
+            if self._source is df:
+                self._selections.put(key, positions, time.perf_counter() - started)
+        return positions
+
+    def page(self, start_date, end_date, regions, categories, filter_query, sort_by,
+             page_current, page_size):
+        df, dates = self._current()
+        positions = self.selection(df, dates, start_date, end_date, regions, categories, filter_query, sort_by)
+        page_size = page_size or DRILLDOWN_CONFIG['page_size']
+        page_count = max(int(np.ceil(len(positions) / page_size)), 1)
+        page_current = min(page_current or 0, page_count - 1)
+        rows = df.iloc[positions[page_current * page_size:(page_current + 1) * page_size]]
+        rows = rows[DRILLDOWN_CONFIG['columns']].copy()
+        rows['Order Date'] = rows['Order Date'].dt.strftime('%Y-%m-%d')
+        return rows.to_dict('records'), page_count, len(positions)
@@ -0,0 +1,196 @@
+import io
+import os
+import threading
+import zlib
+from datetime import datetime
+from urllib.parse import urlencode
+
+from fast_boot import lazy_import
+
+pd = lazy_import('pandas')
+
+try:
+    import fcntl
+except ImportError:
+    # No advisory file locks (Windows): exports are capped inside each process only
+    fcntl = None
+
+# Export Configuration
+EXPORT_CONFIG = {
+    'route': '/export/orders',
+    'formats': {'csv': 'text/csv', 'parquet': 'application/vnd.apache.parquet'},
+    # Rows filtered and serialized per step; bounds the memory one download holds at a time
+    'chunk_rows': int(os.environ.get('DASH_EXPORT_CHUNK_ROWS', 100_000)),
+    'gzip_level': 6,
+    # Columns the dashboard derives on load are left out of the export
+    'exclude_columns': ['Order Year', 'Order Month', 'Sales_log', 'Month Year', 'Revenue', 'Profit Margin'],
+    # Exports streaming at once across the worker processes on this host. A download holds its
+    # worker until the client has read it all, so past this cap requests get 429 instead of
+    # tying up the workers the dashboard's callbacks need
+    'max_concurrent': int(os.environ.get('DASH_EXPORT_MAX_CONCURRENT', 2)),
+    'slot_dir': os.environ.get('DASH_EXPORT_SLOT_DIR', os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), '..', 'cache', 'export-slots')),
+    'retry_after_seconds': 30
+}
+
+class ExportSlots:
+    # A slot is an exclusive lock on one of max_concurrent files, so it is shared by every worker
+    # and freed by the OS if the worker holding it dies
+    def __init__(self, count, directory):
+        self.count = count
+        self.directory = directory
+        self._local = threading.BoundedSemaphore(count)
+
+    def acquire(self):
+        # Returns a release function, or None when every slot is taken
+        if fcntl is None:
+            if not self._local.acquire(blocking=False):
+                return None
+            return self._local.release
+        os.makedirs(self.directory, exist_ok=True)
+        for i in range(self.count):
+            lock_file = open(os.path.join(self.directory, f"slot-{i}.lock"), 'a')
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                continue
+
+            def release(lock_file=lock_file):
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                lock_file.close()
+            return release
+        return None
+
+def export_url(start_date=None, end_date=None, regions=None, categories=None, fmt='csv'):
+    params = [('format', fmt)]
+    if start_date and end_date:
+        params += [('start_date', str(start_date)[:10]), ('end_date', str(end_date)[:10])]
+    params += [('region', region) for region in regions or []]
+    params += [('category', category) for category in categories or []]
+    return f"{EXPORT_CONFIG['route']}?{urlencode(params)}"
+
+def filtered_chunks(df, start_date=None, end_date=None, regions=None, categories=None):
+    # Same filters as the dashboard's filter_data, applied one slice at a time so the full
+    # result never exists in memory
+    columns = [c for c in df.columns if c not in EXPORT_CONFIG['exclude_columns']]
+    if start_date and end_date:
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    for offset in range(0, len(df), EXPORT_CONFIG['chunk_rows']):
+        chunk = df.iloc[offset:offset + EXPORT_CONFIG['chunk_rows']]
+        mask = pd.Series(True, index=chunk.index)
+        if start_date and end_date:
+            mask &= (chunk['Order Date'] >= start) & (chunk['Order Date'] <= end)
+        if regions:
+            mask &= chunk['Region'].isin(regions)
+        if categories:
+            mask &= chunk['Category'].isin(categories)
+        if mask.any():
+            yield chunk.loc[mask, columns]
+
+def csv_stream(df, chunks):
+    header = True
+    for chunk in chunks:
+        out = chunk.copy()
+        out['Order Date'] = out['Order Date'].dt.strftime('%Y-%m-%d')
+        yield out.to_csv(index=False, header=header).encode('utf-8')
+        header = False
+    if header:
+        # Nothing matched: still a valid CSV with the column names
+        columns = [c for c in df.columns if c not in EXPORT_CONFIG['exclude_columns']]
+        yield (','.join(columns) + '\n').encode('utf-8')
+
+class _BufferSink(io.RawIOBase):
+    # Collects what the Parquet writer emits so each row group can be yielded as it is written
+    def __init__(self):
+        self.parts = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self.parts)
+        self.parts = []
+        return data
+
+def parquet_stream(df, chunks):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    columns = [c for c in df.columns if c not in EXPORT_CONFIG['exclude_columns']]
+    # Built before the first chunk is sent, so it must hold for every chunk: types come from
+    # the dtypes alone, and object columns are text even where the leading rows are all empty
+    schema = pa.Schema.from_pandas(df[columns].iloc[:0], preserve_index=False)
+    for column in columns:
+        if df[column].dtype == object:
+            schema = schema.set(schema.get_field_index(column), pa.field(column, pa.string()))
+    sink = _BufferSink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode='w'), schema)
+    try:
+        for chunk in chunks:
+            # One row group per chunk
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+def gzip_stream(stream):
+    compressor = zlib.compressobj(EXPORT_CONFIG['gzip_level'], zlib.DEFLATED, 31)
+    for data in stream:
+        compressed = compressor.compress(data)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def install_export_route(app, get_df):
+    import flask
+
+    server = app.server
+    slots = ExportSlots(EXPORT_CONFIG['max_concurrent'], EXPORT_CONFIG['slot_dir'])
+
+    @server.route(EXPORT_CONFIG['route'])
+    def export_orders():
+        args = flask.request.args
+        fmt = args.get('format', 'csv')
+        if fmt not in EXPORT_CONFIG['formats']:
+            return f"Unknown export format '{fmt}'", 400
+        try:
+            start_date = args.get('start_date') and pd.Timestamp(args['start_date']).strftime('%Y-%m-%d')
+            end_date = args.get('end_date') and pd.Timestamp(args['end_date']).strftime('%Y-%m-%d')
+        except ValueError as e:
+            return f"Invalid date: {str(e)}", 400
+
+        release = slots.acquire()
+        if release is None:
+            return ("Too many exports in progress, try again shortly", 429,
+                    {'Retry-After': str(EXPORT_CONFIG['retry_after_seconds'])})
+
+        try:
+            df = get_df()
+            chunks = filtered_chunks(df, start_date, end_date, args.getlist('region'), args.getlist('category'))
+            stream = csv_stream(df, chunks) if fmt == 'csv' else parquet_stream(df, chunks)
+
+            headers = {'Content-Disposition': f"attachment; filename=orders_{datetime.now():%Y%m%d}.{fmt}"}
+            # Parquet pages are already compressed; CSV is gzipped for clients that accept it
+            if fmt == 'csv' and 'gzip' in flask.request.headers.get('Accept-Encoding', ''):
+                stream = gzip_stream(stream)
+                headers['Content-Encoding'] = 'gzip'
+                headers['Vary'] = 'Accept-Encoding'
+            # The WSGI server pulls the next chunk only once the previous one has been sent, so a
+            # slow client holds back the filtering instead of letting output pile up in memory
+            response = flask.Response(stream, mimetype=EXPORT_CONFIG['formats'][fmt], headers=headers)
+        except Exception:
+            release()
+            raise
+        # Called when the transfer ends, completed or aborted
+        response.call_on_close(release)
+        return response
+
+    return app
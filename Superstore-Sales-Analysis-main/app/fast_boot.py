@@ -0,0 +1,174 @@
+import argparse
+import importlib
+import importlib.util
+import json
+import os
+import threading
+import types
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Fast Boot Configuration
+BOOT_CONFIG = {
+    # "1" builds the layout from the metadata file and loads the dataset in a background thread
+    'enabled': os.environ.get('DASH_FAST_BOOT', '') == '1',
+    # Build artifact, written only by `python fast_boot.py`
+    'metadata_path': os.path.join(BASE_DIR, '..', 'dataset', 'layout_metadata.json'),
+    # The dataset the build artifact describes; other sources never boot from it
+    'metadata_source': os.path.join(BASE_DIR, '..', 'dataset', 'cleaned superstore dataset.csv'),
+    # Untracked copy the dashboard keeps in step with the data it last loaded
+    'runtime_metadata_path': os.path.join(BASE_DIR, '..', 'cache', 'layout_metadata.json'),
+    # How long the first callbacks wait for the background load before failing
+    'load_timeout_seconds': 300
+}
+
+class LazyModule(types.ModuleType):
+    # Stands in for a module until one of its attributes is used
+    def __init__(self, name):
+        super().__init__(name)
+        self._lazy_name = name
+        self._lazy_module = None
+        self._lazy_lock = threading.Lock()
+
+    def _load(self):
+        if self._lazy_module is None:
+            with self._lazy_lock:
+                if self._lazy_module is None:
+                    self._lazy_module = importlib.import_module(self._lazy_name)
+        return self._lazy_module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+def lazy_import(name):
+    # Missing packages still fail at import time, only the module body is deferred
+    if importlib.util.find_spec(name) is None:
+        raise ImportError(f"No module named '{name}'")
+    return LazyModule(name)
+
+def finish_imports(*modules):
+    # Blocks until lazy modules that another thread may be importing are complete
+    for module in modules:
+        if isinstance(module, LazyModule):
+            module._load()
+
+class BackgroundLoader:
+    def __init__(self, load, on_loaded=None, imports=()):
+        self._load = load
+        self._on_loaded = on_loaded
+        self._imports = imports
+        self._thread = threading.Thread(target=self._run, name='data-loader', daemon=True)
+        self._lock = threading.Lock()
+        self.imports_done = threading.Event()
+        self.ready = threading.Event()
+        self.value = None
+        # Forking while the loader thread holds an import lock would deadlock the child, and a
+        # lock it holds at fork time would never be released there
+        os.register_at_fork(before=self._wait_for_imports, after_in_child=self._reset_lock)
+
+    def _wait_for_imports(self):
+        if self._thread.is_alive():
+            self.imports_done.wait(BOOT_CONFIG['load_timeout_seconds'])
+
+    def _reset_lock(self):
+        self._lock = threading.Lock()
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        with self._lock:
+            if self.ready.is_set():
+                return
+            try:
+                finish_imports(*self._imports)
+                self.imports_done.set()
+                self.value = self._load()
+                if self.value is not None and self._on_loaded is not None:
+                    self._on_loaded(self.value)
+            except Exception as e:
+                print(f"Error in background data load: {str(e)}")
+            finally:
+                self.imports_done.set()
+                self.ready.set()
+
+    def get(self, timeout=None):
+        # Forked workers (gunicorn, background callbacks) inherit the event but not the thread,
+        # so they load inline instead of waiting forever
+        if not self.ready.is_set() and not self._thread.is_alive():
+            self._run()
+        if not self.ready.wait(timeout):
+            raise TimeoutError(f"Data was not loaded within {timeout}s")
+        return self.value
+
+def build_metadata(df):
+    # Everything the layout needs before the first callback runs
+    return {
+        'start_date': df['Order Date'].min().strftime('%Y-%m-%d'),
+        'end_date': df['Order Date'].max().strftime('%Y-%m-%d'),
+        'regions': df['Region'].unique().tolist(),
+        'categories': df['Category'].unique().tolist(),
+        'kpis': {
+            'total_sales': float(df['Sales'].sum()),
+            'total_profit': float(df['Profit'].sum()),
+            'total_orders': int(len(df)),
+            'avg_margin': float(df['Profit Margin'].mean())
+        }
+    }
+
+def load_metadata(path=None):
+    path = path or BOOT_CONFIG['metadata_path']
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Layout metadata unavailable at {path}: {str(e)}")
+        return None
+
+def save_metadata(metadata, path=None):
+    # Only rewritten when the values change, so a checked-in file stays stable
+    path = path or BOOT_CONFIG['metadata_path']
+    if os.path.exists(path) and load_metadata(path) == metadata:
+        return False
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(metadata, f, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, path)
+    return True
+
+def same_source(a, b):
+    return a is not None and b is not None and os.path.realpath(a) == os.path.realpath(b)
+
+def load_runtime_metadata(source):
+    # The metadata saved by the last load of this source, else the build artifact if it was
+    # built from this source; None otherwise, so the caller loads the data and builds it
+    path = BOOT_CONFIG['runtime_metadata_path']
+    if os.path.exists(path):
+        metadata = load_metadata(path)
+        if metadata is not None and metadata.get('source') == source:
+            return metadata
+    if same_source(source, BOOT_CONFIG['metadata_source']):
+        return load_metadata()
+    return None
+
+def save_runtime_metadata(metadata, source):
+    # Tagged with the data file, so metadata of benchmark or synthetic data is never
+    # rendered for another source
+    os.makedirs(os.path.dirname(BOOT_CONFIG['runtime_metadata_path']), exist_ok=True)
+    return save_metadata(dict(metadata, source=source), BOOT_CONFIG['runtime_metadata_path'])
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Rebuild the layout metadata used by DASH_FAST_BOOT=1")
+    parser.add_argument('--output', default=BOOT_CONFIG['metadata_path'])
+    args = parser.parse_args()
+
+    import dashboard
+    if save_metadata(build_metadata(dashboard.get_df()), args.output):
+        print(f"Layout metadata written to {args.output}")
+    else:
+        print(f"Layout metadata at {args.output} is up to date")
@@ -0,0 +1,242 @@
+import functools
+
+from fast_boot import lazy_import
+
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+
+# Fast Figure Configuration
+FIGURE_CONFIG = {
+    'template': 'plotly_white',
+    # Marker area of the largest point in sized scatter plots, as in Plotly Express
+    'size_max': 20
+}
+
+# Plain dict figures with the same JSON as the Plotly Express and graph_objects calls they
+# replace, without building and validating figure objects. Only the chart forms the dashboard
+# uses are covered; tests/test_fast_figures.py compares both outputs for every view
+
+@functools.lru_cache(maxsize=None)
+def template(name):
+    # Shared by every figure using it; figures never modify their template
+    import plotly.io as pio
+    return pio.templates[name].to_plotly_json()
+
+@functools.lru_cache(maxsize=None)
+def colorscale(name):
+    import plotly.colors
+    return plotly.colors.get_colorscale(name)
+
+def colorway(name):
+    return template(name)['layout']['colorway']
+
+def update_layout(fig, **updates):
+    # Nested dicts are merged into the existing layout, as update_layout does
+    merge(fig['layout'], updates)
+    return fig
+
+def merge(target, updates):
+    for key, value in updates.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict) and key != 'template':
+            merge(target[key], value)
+        else:
+            target[key] = value
+    return target
+
+def figure(data, layout=None, template_name=None):
+    # The go.Figure(data, layout) equivalent; titles must be given as {'text': ...}
+    layout = dict(layout or {})
+    layout['template'] = template(template_name or FIGURE_CONFIG['template'])
+    return {'data': list(data), 'layout': layout}
+
+def hovertemplate(lines, hover_name=False):
+    text = '<br>'.join(f"{label}={ref}" for label, ref in lines)
+    if hover_name:
+        text = '<b>%{hovertext}</b><br><br>' + text
+    return text + '<extra></extra>'
+
+def hover_lines(shown, hover_data, customdata_columns, refs=None):
+    # Hover labels after the trace's own attributes: remaining hover_data columns read from
+    # customdata (or refs), at the position of their first occurrence
+    lines = list(shown)
+    labels = {label for label, _ in shown}
+    for column in hover_data or []:
+        if column not in labels:
+            labels.add(column)
+            ref = (refs or {}).get(column, f"%{{customdata[{customdata_columns.index(column)}]}}")
+            lines.append((column, ref))
+    return lines
+
+def cartesian_layout(x_title, y_title, title, legend=None, **layout):
+    layout = dict(
+        xaxis={'anchor': 'y', 'domain': [0.0, 1.0], 'title': {'text': x_title}},
+        yaxis={'anchor': 'x', 'domain': [0.0, 1.0], 'title': {'text': y_title}},
+        legend=dict(legend or {}, tracegroupgap=0),
+        **layout
+    )
+    if title is not None:
+        layout['title'] = {'text': title}
+    return layout
+
+def continuous_axis(column, scale):
+    return {'colorbar': {'title': {'text': column}}, 'colorscale': colorscale(scale or 'Plasma')}
+
+def line(frame, x, y, title=None, error_y=None, template_name=None):
+    # px.line with one y column
+    template_name = template_name or FIGURE_CONFIG['template']
+    trace = {
+        'hovertemplate': hovertemplate([(x, '%{x}'), (y, '%{y}')]),
+        'legendgroup': '', 'line': {'color': colorway(template_name)[0], 'dash': 'solid'},
+        'marker': {'symbol': 'circle'}, 'mode': 'lines', 'name': '', 'orientation': 'v',
+        'showlegend': False, 'x': frame[x].to_numpy(), 'xaxis': 'x', 'y': frame[y].to_numpy(), 'yaxis': 'y',
+        'type': 'scatter'
+    }
+    if error_y is not None:
+        trace['error_y'] = {'array': frame[error_y].to_numpy()}
+    return figure([trace], cartesian_layout(x, y, title), template_name)
+
+def bar(frame, x, y, color=None, orientation='v', barmode='relative', hover_data=None,
+        color_continuous_scale=None, title=None, template_name=None):
+    # px.bar: a list of y columns (wide form), a discrete color column (one trace per value,
+    # in order of appearance) or a numeric one (a color axis). Like px.bar, a frame without
+    # rows has no traces for y columns or color values, and so no legend title
+    template_name = template_name or FIGURE_CONFIG['template']
+    colors = colorway(template_name)
+    layout = {'barmode': barmode}
+
+    def trace(rows, name, y_column, shown, marker_color, **extra):
+        customdata = list(hover_data or [])
+        result = {'alignmentgroup': 'True'}
+        if customdata:
+            result['customdata'] = rows[customdata].to_numpy()
+        result.update({
+            'hovertemplate': hovertemplate(hover_lines(shown, hover_data, customdata)),
+            'legendgroup': name, 'marker': dict(marker_color, pattern={'shape': ''}), 'name': name,
+            'offsetgroup': name, 'orientation': orientation, 'showlegend': name != '', 'textposition': 'auto',
+            'x': rows[x].to_numpy(), 'xaxis': 'x', 'y': rows[y_column].to_numpy(), 'yaxis': 'y', 'type': 'bar'
+        })
+        result.update(extra)
+        return result
+
+    if isinstance(y, list):
+        data = [trace(frame, column, column,
+                      [('variable', column), (x, '%{x}'), ('value', '%{y}')],
+                      {'color': colors[i % len(colors)]})
+                for i, column in enumerate(y)] if len(frame) else []
+        legend = {'title': {'text': 'variable'}} if data else None
+        return figure(data, cartesian_layout(x, 'value', title, legend, **layout), template_name)
+
+    shown = [(x, '%{x}'), (y, '%{y}')]
+    if color is None:
+        data = [trace(frame, '', y, shown, {'color': colors[0]})]
+        legend = None
+    elif pd.api.types.is_numeric_dtype(frame[color]):
+        data = [trace(frame, '', y, shown + [(color, '%{marker.color}')],
+                      {'color': frame[color].to_numpy(), 'coloraxis': 'coloraxis'})]
+        layout['coloraxis'] = continuous_axis(color, color_continuous_scale)
+        legend = None
+    else:
+        data = []
+        for i, (value, rows) in enumerate(frame.groupby(color, sort=False)):
+            data.append(trace(rows, value, y, [(color, value)] + shown, {'color': colors[i % len(colors)]}))
+        legend = {'title': {'text': color}} if data else None
+    return figure(data, cartesian_layout(x, y, title, legend, **layout), template_name)
+
+def scatter(frame, x, y, size=None, color=None, hover_name=None, hover_data=None,
+            color_continuous_scale=None, title=None, template_name=None):
+    # px.scatter with an optional marker size and numeric color column
+    template_name = template_name or FIGURE_CONFIG['template']
+    shown = [(x, '%{x}'), (y, '%{y}')]
+    marker = {}
+    if color is not None:
+        marker.update(color=frame[color].to_numpy(), coloraxis='coloraxis')
+    else:
+        marker['color'] = colorway(template_name)[0]
+    if size is not None:
+        shown.append((size, '%{marker.size}'))
+        marker.update(size=frame[size].to_numpy(), sizemode='area',
+                      sizeref=frame[size].max() / FIGURE_CONFIG['size_max'] ** 2)
+    if color is not None:
+        shown.append((color, '%{marker.color}'))
+    marker['symbol'] = 'circle'
+
+    customdata = list(hover_data or [])
+    trace = {}
+    if customdata:
+        trace['customdata'] = frame[customdata].to_numpy()
+    trace['hovertemplate'] = hovertemplate(hover_lines(shown, hover_data, customdata), hover_name is not None)
+    if hover_name is not None:
+        trace['hovertext'] = frame[hover_name].to_numpy()
+    trace.update({
+        'legendgroup': '', 'marker': marker, 'mode': 'markers', 'name': '', 'orientation': 'v',
+        'showlegend': False, 'x': frame[x].to_numpy(), 'xaxis': 'x', 'y': frame[y].to_numpy(), 'yaxis': 'y',
+        'type': 'scatter'
+    })
+    layout = {'coloraxis': continuous_axis(color, color_continuous_scale)} if color is not None else {}
+    legend = {'itemsizing': 'constant'} if size is not None else None
+    return figure([trace], cartesian_layout(x, y, title, legend, **layout), template_name)
+
+def hierarchy(kind, frame, path, values, color=None, hover_data=None, color_continuous_scale=None,
+              title=None, root=None, template_name=None, **trace_options):
+    # px.sunburst / px.treemap over path columns (root: the label of a px.Constant first level).
+    # Each level sums values per node; a numeric color is averaged weighted by values, and
+    # other hover columns keep a node's value only if all its rows agree, else "(?)"
+    template_name = template_name or FIGURE_CONFIG['template']
+    hover_columns = list(hover_data or []) + ([color] if color is not None else [])
+    extra = list(dict.fromkeys(c for c in hover_columns if c != values and c != color))
+    rows = frame[list(path) + [values] + extra + ([color] if color is not None and color != values else [])]
+    levels = list(path)
+    if root is not None:
+        rows = rows.assign(**{'\0root': root})
+        levels = ['\0root'] + levels
+    rows = rows.assign(**{values: pd.to_numeric(rows[values])})
+    if color is not None:
+        rows = rows.assign(**{'\0weighted': rows[color] * rows[values]})
+
+    def agreed(column):
+        uniques = column.unique()
+        return uniques[0] if len(uniques) == 1 else '(?)'
+
+    reversed_levels = levels[::-1]
+    nodes = []
+    for i, level in enumerate(reversed_levels):
+        keys = reversed_levels[i:]
+        grouped = rows.groupby(keys)
+        node = grouped[values].sum().reset_index()
+        if color is not None:
+            node[color] = grouped['\0weighted'].sum().to_numpy() / node[values].to_numpy()
+        for column in extra:
+            node[column] = grouped[column].agg(agreed).to_numpy()
+        ancestors = [node[k].astype(str) for k in keys[:0:-1]]
+        node['labels'] = node[level].astype(str)
+        node['parent'] = functools.reduce(lambda a, b: a + '/' + b, ancestors) if ancestors else ''
+        node['id'] = node['parent'] + '/' + node['labels'] if ancestors else node['labels']
+        nodes.append(node)
+    tree = pd.concat(nodes, ignore_index=True)
+
+    # The color line takes the place of its column among hover_data, or comes last
+    lines = [('labels', '%{label}'), (values, '%{value}'), ('parent', '%{parent}'), ('id', '%{id}')]
+    trace = {'branchvalues': 'total'}
+    if hover_columns:
+        trace['customdata'] = tree[hover_columns].to_numpy()
+    trace.update({
+        'domain': {'x': [0.0, 1.0], 'y': [0.0, 1.0]},
+        'hovertemplate': hovertemplate(hover_lines(lines, hover_columns, hover_columns, {color: '%{color}'})),
+        'ids': tree['id'].to_numpy(), 'labels': tree['labels'].to_numpy()
+    })
+    if color is not None:
+        trace['marker'] = {'coloraxis': 'coloraxis', 'colors': tree[color].to_numpy()}
+    trace.update({'name': '', 'parents': tree['parent'].to_numpy(), 'values': tree[values].to_numpy(),
+                  'type': kind}, **trace_options)
+
+    layout = {'coloraxis': continuous_axis(color, color_continuous_scale)} if color is not None else {}
+    layout['legend'] = {'tracegroupgap': 0}
+    if title is not None:
+        layout['title'] = {'text': title}
+    return figure([trace], layout, template_name)
+
+def sunburst(frame, path, values, **options):
+    return hierarchy('sunburst', frame, path, values, **options)
+
+def treemap(frame, path, values, **options):
+    return hierarchy('treemap', frame, path, values, **options)
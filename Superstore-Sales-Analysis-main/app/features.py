@@ -0,0 +1,28 @@
+import pandas as pd
+
+# Calendar features the forecasting models were trained on (see notebook/modeling.ipynb)
+FEATURES = ['Year', 'Month', 'Quarter', 'Day', 'DayOfWeek', 'DayOfYear', 'WeekOfYear']
+
+def get_date_features(date):
+    return {
+        'Year': date.year,
+        'Month': date.month,
+        'Quarter': (date.month - 1) // 3 + 1,
+        'Day': date.day,
+        'DayOfWeek': date.weekday(),
+        'DayOfYear': date.timetuple().tm_yday,
+        'WeekOfYear': date.isocalendar().week
+    }
+
+def build_date_features(dates):
+    # Vectorized version of get_date_features for a whole column/index of dates
+    dates = pd.DatetimeIndex(pd.to_datetime(dates))
+    return pd.DataFrame({
+        'Year': dates.year,
+        'Month': dates.month,
+        'Quarter': dates.quarter,
+        'Day': dates.day,
+        'DayOfWeek': dates.weekday,
+        'DayOfYear': dates.dayofyear,
+        'WeekOfYear': dates.isocalendar().week.astype(int).values
+    })[FEATURES]
@@ -0,0 +1,200 @@
+try:
+    import argparse
+    import hashlib
+    import json
+    import os
+    import time
+    import uuid
+    from concurrent.futures import ProcessPoolExecutor
+
+    import joblib
+    import numpy as np
+    import pandas as pd
+    from xgboost import XGBRegressor
+
+    from features import build_date_features
+except ImportError as e:
+    print(f"Error importing dependencies: {str(e)}")
+    print("Please install required packages using:")
+    print("pip install pandas numpy xgboost joblib")
+    raise
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Hierarchical Forecast Configuration
+HIERARCHY_CONFIG = {
+    'data_path': os.path.join(BASE_DIR, '..', 'dataset', 'cleaned superstore dataset.csv'),
+    'cache_dir': os.path.join(BASE_DIR, '..', 'model', 'forecast_cache'),
+    # Cached fits not used for this long are deleted after each run, and the oldest beyond
+    # max_entries; retrains and data changes otherwise leave a full set of stale files behind
+    'cache_max_age_days': 30,
+    'cache_max_entries': 2000,
+    # Bottom level of the hierarchy; every prefix of this list is an aggregate level
+    'levels': ['Region', 'Category', 'Sub-Category'],
+    'target': 'Sales',
+    'horizon_days': 90,
+    'workers': os.cpu_count() or 1,
+    # Same hyperparameters as the tuned XGBoost model from the modeling notebook
+    'model_params': {
+        'n_estimators': 300,
+        'max_depth': 3,
+        'learning_rate': 0.01,
+        'random_state': 42,
+        'n_jobs': 1
+    }
+}
+
+NODE_SEPARATOR = ' / '
+
+def build_bottom_series(df, levels, target):
+    # One daily series per bottom node, on a shared and gap-free daily index
+    df = df.copy()
+    df['Order Date'] = pd.to_datetime(df['Order Date'])
+    df['Node'] = df[levels].astype(str).agg(NODE_SEPARATOR.join, axis=1)
+    series = df.pivot_table(index='Order Date', columns='Node', values=target,
+                            aggfunc='sum', fill_value=0.0)
+    full_index = pd.date_range(series.index.min(), series.index.max(), freq='D')
+    return series.reindex(full_index, fill_value=0.0)
+
+def series_key(node, dates, values, future_dates, params):
+    # Depends only on the node's own history, so a change to other nodes' data keeps its cached fit
+    sha = hashlib.sha256()
+    sha.update(node.encode())
+    sha.update(np.ascontiguousarray(dates.asi8).tobytes())
+    sha.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    sha.update(np.ascontiguousarray(future_dates.asi8).tobytes())
+    sha.update(json.dumps({'params': params}, sort_keys=True).encode())
+    return sha.hexdigest()
+
+def fit_node(task):
+    # Runs inside a worker process; returns (node, forecast, cache_hit)
+    node, dates, values, future_dates, params, cache_path = task
+    if cache_path and os.path.exists(cache_path):
+        forecast = joblib.load(cache_path)['forecast']
+        # Marks the entry as used, so pruning keeps it
+        os.utime(cache_path)
+        return node, forecast, True
+
+    model = XGBRegressor(**params)
+    model.fit(build_date_features(dates), values)
+    # Sales cannot be negative, which also keeps the reconciled totals sensible
+    forecast = np.clip(model.predict(build_date_features(future_dates)), 0, None)
+
+    if cache_path:
+        # Unique per writer, so workers fitting the same node never share a temp file
+        tmp_path = f"{cache_path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+        joblib.dump({'model': model, 'forecast': forecast}, tmp_path)
+        os.replace(tmp_path, cache_path)
+    return node, forecast, False
+
+def prune_cache(cache_dir, keep):
+    # Same pass as the run that wrote the new entries; keep holds the paths that run used
+    cutoff = time.time() - HIERARCHY_CONFIG['cache_max_age_days'] * 86400
+    entries, stale = [], []
+    try:
+        with os.scandir(cache_dir) as scan:
+            for entry in scan:
+                if entry.name.endswith('.pkl') and entry.path not in keep:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                elif entry.name.endswith('.tmp') and entry.stat().st_mtime < cutoff:
+                    # Left by a run that died while writing; a recent one may still be in use
+                    stale.append(entry.path)
+    except OSError:
+        return 0
+    entries.sort(reverse=True)
+    room = max(HIERARCHY_CONFIG['cache_max_entries'] - len(keep), 0)
+    expired = [path for i, (mtime, path) in enumerate(entries) if mtime < cutoff or i >= room]
+    removed = 0
+    for path in stale + expired:
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            # Another run removed it first
+            pass
+    return removed
+
+def reconcile_bottom_up(bottom_forecasts, levels):
+    # Aggregate levels are sums of their children, so every level adds up exactly
+    frames = []
+    nodes = bottom_forecasts.columns.to_series().str.split(NODE_SEPARATOR, expand=True)
+    nodes.columns = levels
+
+    total = bottom_forecasts.sum(axis=1).to_frame('Total')
+    frames.append(total.melt(ignore_index=False, var_name='Node', value_name='Forecast').assign(Level='Total'))
+
+    for depth in range(1, len(levels) + 1):
+        keys = nodes[levels[:depth]].agg(NODE_SEPARATOR.join, axis=1)
+        level_forecast = bottom_forecasts.T.groupby(keys.values).sum().T
+        frames.append(level_forecast.melt(ignore_index=False, var_name='Node', value_name='Forecast')
+                      .assign(Level=NODE_SEPARATOR.join(levels[:depth])))
+
+    result = pd.concat(frames)
+    result.index.name = 'Date'
+    return result.reset_index()[['Date', 'Level', 'Node', 'Forecast']]
+
+def forecast_hierarchy(df=None, data_path=None, horizon_days=None, workers=None,
+                       levels=None, use_cache=True):
+    data_path = data_path or HIERARCHY_CONFIG['data_path']
+    horizon_days = horizon_days or HIERARCHY_CONFIG['horizon_days']
+    workers = workers or HIERARCHY_CONFIG['workers']
+    levels = levels or HIERARCHY_CONFIG['levels']
+    params = HIERARCHY_CONFIG['model_params']
+
+    if df is None:
+        df = pd.read_csv(data_path)
+
+    started = time.perf_counter()
+    series = build_bottom_series(df, levels, HIERARCHY_CONFIG['target'])
+    future_dates = pd.date_range(series.index.max() + pd.Timedelta(days=1), periods=horizon_days, freq='D')
+
+    cache_dir = HIERARCHY_CONFIG['cache_dir'] if use_cache else None
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+
+    tasks = []
+    for node in series.columns:
+        # Each node is fit from its own first sale rather than the start of the shared index,
+        # which moves whenever any other node gains an earlier order
+        node_series = series[node]
+        sold = np.flatnonzero(node_series.values)
+        if len(sold):
+            node_series = node_series.iloc[sold[0]:]
+        values = node_series.values
+        cache_path = None
+        if cache_dir:
+            key = series_key(node, node_series.index, values, future_dates, params)
+            cache_path = os.path.join(cache_dir, f"{key}.pkl")
+        tasks.append((node, node_series.index, values, future_dates, params, cache_path))
+
+    forecasts = {}
+    hits = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Chunking keeps inter-process overhead low when there are hundreds of nodes
+        chunksize = max(1, len(tasks) // (workers * 4))
+        for node, forecast, cache_hit in pool.map(fit_node, tasks, chunksize=chunksize):
+            forecasts[node] = forecast
+            hits += cache_hit
+    pruned = prune_cache(cache_dir, {task[-1] for task in tasks}) if cache_dir else 0
+
+    bottom_forecasts = pd.DataFrame(forecasts, index=future_dates)[series.columns]
+    result = reconcile_bottom_up(bottom_forecasts, levels)
+    print(f"Forecast {len(tasks)} bottom series ({hits} from cache, {pruned} stale entries pruned) "
+          f"with {workers} workers in {time.perf_counter() - started:.1f}s")
+    return result
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Forecast daily sales for every Region x Category x Sub-Category node")
+    parser.add_argument('--data', dest='data_path', help="Order-level CSV")
+    parser.add_argument('--horizon-days', type=int)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--levels', nargs='+', help="Hierarchy levels, top to bottom")
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--output', default='hierarchical_forecast.csv')
+    args = parser.parse_args()
+
+    result = forecast_hierarchy(data_path=args.data_path, horizon_days=args.horizon_days,
+                                workers=args.workers, levels=args.levels,
+                                use_cache=not args.no_cache)
+    result.to_csv(args.output, index=False)
+    print(f"Saved {len(result):,} forecast rows to {args.output}")
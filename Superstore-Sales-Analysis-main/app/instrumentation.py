@@ -0,0 +1,273 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import flask
+from dash.exceptions import PreventUpdate
+
+# Instrumentation Configuration
+INSTRUMENTATION_CONFIG = {
+    'duration_buckets': (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    'row_buckets': (10, 100, 1000, 10000, 100000, 1000000, 10000000),
+    'byte_buckets': (1024, 10240, 102400, 1048576, 10485760),
+    'slow_threshold_seconds': float(os.environ.get('DASH_SLOW_REQUEST_MS', 500)) / 1000,
+    'slow_log_path': os.environ.get('DASH_SLOW_LOG', os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), '..', 'logs', 'slow_requests.jsonl')),
+    'slow_log_size': 200
+}
+
+class Histogram:
+    def __init__(self, name, help_text, buckets, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.label_names = label_names
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['counts'][i] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, series in sorted(self._series.items()):
+                label_str = ','.join(f'{k}="{v}"' for k, v in zip(self.label_names, labels))
+                for bound, count in zip(self.buckets, series['counts']):
+                    lines.append(f'{self.name}_bucket{{{label_str},le="{bound}"}} {count}')
+                lines.append(f'{self.name}_bucket{{{label_str},le="+Inf"}} {series["count"]}')
+                lines.append(f'{self.name}_sum{{{label_str}}} {series["sum"]}')
+                lines.append(f'{self.name}_count{{{label_str}}} {series["count"]}')
+        return lines
+
+class Counter:
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                label_str = ','.join(f'{k}="{v}"' for k, v in zip(self.label_names, labels))
+                lines.append(f'{self.name}{{{label_str}}} {value}')
+        return lines
+
+CALLBACK_DURATION = Histogram('dash_callback_duration_seconds', "Wall time of a callback",
+                              INSTRUMENTATION_CONFIG['duration_buckets'], ('callback',))
+STAGE_DURATION = Histogram('dash_callback_stage_seconds', "Time spent per callback stage",
+                           INSTRUMENTATION_CONFIG['duration_buckets'], ('callback', 'stage'))
+ROWS_SCANNED = Histogram('dash_callback_rows_scanned', "Rows scanned by a callback",
+                         INSTRUMENTATION_CONFIG['row_buckets'], ('callback',))
+RESULT_ROWS = Histogram('dash_callback_result_rows', "Rows in a callback's aggregated result",
+                        INSTRUMENTATION_CONFIG['row_buckets'], ('callback',))
+PAYLOAD_BYTES = Histogram('dash_callback_payload_bytes', "Serialized size of a callback's output",
+                          INSTRUMENTATION_CONFIG['byte_buckets'], ('callback',))
+CALLBACK_ERRORS = Counter('dash_callback_errors_total', "Exceptions raised by a callback", ('callback',))
+SLOW_REQUESTS = Counter('dash_slow_requests_total', "Callbacks slower than the slow-request threshold", ('callback',))
+
+METRICS = [CALLBACK_DURATION, STAGE_DURATION, ROWS_SCANNED, RESULT_ROWS, PAYLOAD_BYTES,
+           CALLBACK_ERRORS, SLOW_REQUESTS]
+
+# Per-request measurements; callbacks run one per thread, so a thread-local is enough
+_current = threading.local()
+# Called with the stage name as each stage starts and ends; a check may raise to end the request there
+STAGE_CHECKS = []
+slow_requests = deque(maxlen=INSTRUMENTATION_CONFIG['slow_log_size'])
+_slow_log_lock = threading.Lock()
+
+@contextmanager
+def stage(name):
+    for check in STAGE_CHECKS:
+        check(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        context = getattr(_current, 'context', None)
+        if context is not None:
+            context['stages'][name] = context['stages'].get(name, 0.0) + time.perf_counter() - started
+    for check in STAGE_CHECKS:
+        check(name)
+
+def new_context():
+    return {'stages': {}, 'rows_scanned': 0, 'result_rows': 0, 'errors': 0, 'approximate': 0}
+
+@contextmanager
+def measure():
+    # Collects stage timings and row counts of work a callback runs on another thread
+    previous = getattr(_current, 'context', None)
+    _current.context = new_context()
+    try:
+        yield _current.context
+    finally:
+        _current.context = previous
+
+def merge_context(measured):
+    # Adds measurements collected by measure() to the current callback's
+    context = getattr(_current, 'context', None)
+    if context is None:
+        return
+    for name, seconds in measured['stages'].items():
+        context['stages'][name] = context['stages'].get(name, 0.0) + seconds
+    context['rows_scanned'] += measured['rows_scanned']
+    context['result_rows'] += measured['result_rows']
+    context['errors'] += measured['errors']
+    context['approximate'] += measured['approximate']
+
+def record_rows(scanned=None, result=None):
+    context = getattr(_current, 'context', None)
+    if context is None:
+        return
+    if scanned is not None:
+        context['rows_scanned'] += scanned
+    if result is not None:
+        context['result_rows'] += result
+
+def record_error():
+    # A callback answered with an error figure instead of raising; its result is not final
+    context = getattr(_current, 'context', None)
+    if context is not None:
+        context['errors'] += 1
+
+def record_approximate():
+    # A callback answered from the sample; the exact result replaces it later
+    context = getattr(_current, 'context', None)
+    if context is not None:
+        context['approximate'] += 1
+
+def normalize_value(value):
+    # Dates arrive as full ISO timestamps or plain dates; lists arrive in click order
+    if isinstance(value, str) and len(value) >= 10 and value[4] == '-' and value[7] == '-':
+        return value[:10]
+    if isinstance(value, (list, tuple)):
+        return sorted(normalize_value(v) for v in value) if value else None
+    return value
+
+def normalize_inputs(args):
+    return [normalize_value(arg) for arg in args]
+
+def log_slow_request(entry):
+    slow_requests.append(entry)
+    path = INSTRUMENTATION_CONFIG['slow_log_path']
+    try:
+        with _slow_log_lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+    except OSError as e:
+        print(f"Could not write slow request log: {str(e)}")
+
+def instrument_callback(func):
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        _current.context = new_context()
+        started = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except PreventUpdate:
+            raise
+        except Exception:
+            CALLBACK_ERRORS.inc((name,))
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            context = _current.context
+            _current.context = None
+
+        CALLBACK_DURATION.observe((name,), elapsed)
+        for stage_name, seconds in context['stages'].items():
+            STAGE_DURATION.observe((name, stage_name), seconds)
+        ROWS_SCANNED.observe((name,), context['rows_scanned'])
+        RESULT_ROWS.observe((name,), context['result_rows'])
+
+        if elapsed >= INSTRUMENTATION_CONFIG['slow_threshold_seconds']:
+            SLOW_REQUESTS.inc((name,))
+            entry = {
+                'time': datetime.now().isoformat(timespec='seconds'),
+                'callback': name,
+                'duration_ms': round(elapsed * 1000, 1),
+                'stages_ms': {k: round(v * 1000, 1) for k, v in context['stages'].items()},
+                'rows_scanned': context['rows_scanned'],
+                'result_rows': context['result_rows'],
+                'inputs': normalize_inputs(args)
+            }
+            if flask.has_request_context():
+                # Logged once the response exists, so the entry carries its size
+                flask.g.slow_request = entry
+            else:
+                log_slow_request(entry)
+        return result
+    return wrapper
+
+def render_metrics():
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+def instrument_app(app):
+    # Every callback registered after this point is timed; background callbacks run
+    # in separate worker processes, so their measurements could not be exported here
+    register_callback = app.callback
+    # Dash output id of each instrumented callback, as sent in the request body -> callback name
+    callback_names = {}
+
+    def callback(*args, **kwargs):
+        decorator = register_callback(*args, **kwargs)
+        if kwargs.get('background'):
+            return decorator
+
+        def register(func):
+            known = set(app.callback_map)
+            registered = decorator(instrument_callback(func))
+            for output in set(app.callback_map) - known:
+                callback_names[output] = func.__name__
+            return registered
+        return register
+
+    app.callback = callback
+
+    @app.server.after_request
+    def record_payload(response):
+        # Sizes the response Dash actually sent instead of serializing every result twice
+        if not flask.request.path.endswith('/_dash-update-component'):
+            return response
+        body = flask.request.get_json(silent=True) or {}
+        name = callback_names.get(body.get('output'))
+        size = response.calculate_content_length() or 0
+        if name is not None and response.status_code == 200:
+            PAYLOAD_BYTES.observe((name,), size)
+        entry = flask.g.pop('slow_request', None)
+        if entry is not None:
+            entry['payload_bytes'] = size
+            log_slow_request(entry)
+        return response
+
+    @app.server.route('/metrics')
+    def metrics():
+        return render_metrics(), 200, {'Content-Type': 'text/plain; version=0.0.4'}
+
+    return app
@@ -0,0 +1,267 @@
+import heapq
+import itertools
+import os
+import sys
+import threading
+import weakref
+
+from instrumentation import METRICS
+
+# Memory Budget Configuration
+MEMORY_CONFIG = {
+    # Bytes the caches, indexes and rollups of one worker process may hold together
+    'budget_bytes': int(float(os.environ.get('DASH_MEMORY_BUDGET_MB', 1024)) * 1024 * 1024),
+    'route': '/_memory',
+    # Python objects per object column whose sizes estimate the column's; deep memory_usage
+    # would visit every one of them on each insert
+    'object_sample': 1000
+}
+
+def root_array(array):
+    # The array owning the buffer a view reads
+    while getattr(array, 'base', None) is not None and hasattr(array.base, 'nbytes'):
+        array = array.base
+    return array
+
+def object_bytes(values):
+    # Estimated bytes of the Python objects an object array points to, from an even sample
+    if not len(values):
+        return 0
+    sample = values[::max(len(values) // MEMORY_CONFIG['object_sample'], 1)][:MEMORY_CONFIG['object_sample']]
+    return int(sum(sys.getsizeof(item) for item in sample) / len(sample) * len(values))
+
+def frame_size(value):
+    import pandas as pd
+
+    usage = value.memory_usage(deep=False)
+    size = int(usage.sum() if hasattr(usage, 'sum') else usage)
+    if isinstance(value, pd.DataFrame):
+        columns = [column for _, column in value.items()] + [value.index]
+    elif isinstance(value, pd.Series):
+        columns = [value, value.index]
+    else:
+        columns = [value]
+    for column in columns:
+        if column.dtype == object:
+            size += object_bytes(column.to_numpy())
+    return size
+
+def estimate_size(value, seen=None, shared=None):
+    # Bytes held by a cached value: array buffers and frame columns are counted exactly (the
+    # objects of object columns from a sample), Python containers recursively, and shared
+    # objects once. Views of arrays in shared (pinned entries) hold no memory of their own
+    import numpy as np
+    import pandas as pd
+
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, np.ndarray):
+        root = root_array(value)
+        if root is not value and shared is not None and shared.get(id(root)) is root:
+            return 0
+        return value.nbytes if value.dtype != object else value.nbytes + object_bytes(value.ravel())
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        return frame_size(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k, seen, shared) + estimate_size(v, seen, shared)
+                                          for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(item, seen, shared) for item in value)
+    if hasattr(value, 'to_plotly_json'):
+        # Figures: the data and layout they would serialize
+        return estimate_size(value.to_plotly_json(), seen, shared)
+    return sys.getsizeof(value)
+
+def pinned_arrays(value):
+    # Arrays held directly by a pinned value, whose views other entries do not pay for
+    import numpy as np
+
+    if isinstance(value, np.ndarray):
+        return [root_array(value)]
+    if isinstance(value, (list, tuple)):
+        return [array for item in value for array in pinned_arrays(item)]
+    if isinstance(value, dict):
+        return [array for item in value.values() for array in pinned_arrays(item)]
+    return []
+
+class _Entry:
+    __slots__ = ('value', 'size', 'cost', 'hits', 'priority', 'pinned')
+
+    def __init__(self, value, size, cost, pinned):
+        self.value = value
+        self.size = size
+        self.cost = cost
+        self.hits = 1
+        self.priority = 0.0
+        self.pinned = pinned
+
+class ManagedCache:
+    # One named cache under the shared budget; its entries compete with every other cache's
+    def __init__(self, manager, name):
+        self.manager = manager
+        self.name = name
+        self.entries = {}
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'evicted_bytes': 0, 'rejected': 0}
+
+    def get(self, key, default=None):
+        with self.manager.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return default
+            self.stats['hits'] += 1
+            entry.hits += 1
+            self.manager.touch(self, key, entry)
+            return entry.value
+
+    def peek(self, key, default=None):
+        # Lookup that counts neither as a hit nor as a use
+        with self.manager.lock:
+            entry = self.entries.get(key)
+            return default if entry is None else entry.value
+
+    def __contains__(self, key):
+        with self.manager.lock:
+            return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def put(self, key, value, cost, size=None, pinned=False):
+        # cost: seconds it took to compute the value, i.e. what evicting it would cost again.
+        # Pinned entries (indexes the owner keeps anyway) count towards the budget but are
+        # never evicted
+        size = estimate_size(value, shared=self.manager.pinned) if size is None else size
+        self.manager.insert(self, key, _Entry(value, size, cost, pinned))
+        return value
+
+    def pop(self, key):
+        with self.manager.lock:
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                self.manager.release(entry)
+            return None if entry is None else entry.value
+
+    def clear(self):
+        with self.manager.lock:
+            for entry in self.entries.values():
+                self.manager.release(entry)
+            self.entries.clear()
+
+    def nbytes(self):
+        with self.manager.lock:
+            return sum(entry.size for entry in self.entries.values())
+
+class MemoryManager:
+    # Greedy-Dual-Size-Frequency eviction across all caches: an entry's priority is the clock
+    # plus hits * recompute cost / bytes, so cheap, large and rarely used entries go first. The
+    # clock rises to each evicted priority, which ages entries that are not used again
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self.lock = threading.RLock()
+        self.caches = {}
+        self.bytes = 0
+        self.clock = 0.0
+        self._heap = []
+        self._sequence = itertools.count()
+        # Buffers of pinned entries by id, so views of them are not counted twice
+        self.pinned = weakref.WeakValueDictionary()
+
+    def cache(self, name):
+        with self.lock:
+            if name not in self.caches:
+                self.caches[name] = ManagedCache(self, name)
+            return self.caches[name]
+
+    def touch(self, cache, key, entry):
+        entry.priority = self.clock + entry.hits * entry.cost / max(entry.size, 1)
+        if not entry.pinned:
+            heapq.heappush(self._heap, (entry.priority, next(self._sequence), cache.name, key, entry))
+
+    def release(self, entry):
+        self.bytes -= entry.size
+        if entry.pinned:
+            for array in pinned_arrays(entry.value):
+                if self.pinned.get(id(array)) is array:
+                    del self.pinned[id(array)]
+
+    def insert(self, cache, key, entry):
+        with self.lock:
+            previous = cache.entries.pop(key, None)
+            if previous is not None:
+                self.release(previous)
+                entry.hits += previous.hits
+            if not entry.pinned and entry.size > self.budget_bytes:
+                cache.stats['rejected'] += 1
+                return
+            cache.entries[key] = entry
+            self.bytes += entry.size
+            if entry.pinned:
+                for array in pinned_arrays(entry.value):
+                    self.pinned[id(array)] = array
+            self.touch(cache, key, entry)
+            self.evict()
+
+    def evict(self):
+        while self.bytes > self.budget_bytes and self._heap:
+            priority, _, name, key, entry = heapq.heappop(self._heap)
+            cache = self.caches[name]
+            # Stale heap items: the entry was used again, replaced or removed since
+            if cache.entries.get(key) is not entry or entry.priority != priority:
+                continue
+            del cache.entries[key]
+            self.bytes -= entry.size
+            self.clock = priority
+            cache.stats['evictions'] += 1
+            cache.stats['evicted_bytes'] += entry.size
+        if len(self._heap) > 4 * sum(len(c.entries) for c in self.caches.values()) + 64:
+            self._compact()
+
+    def _compact(self):
+        self._heap = [item for item in self._heap
+                      if self.caches[item[2]].entries.get(item[3]) is item[4] and item[4].priority == item[0]]
+        heapq.heapify(self._heap)
+
+    def stats(self):
+        with self.lock:
+            caches = {}
+            for name, cache in sorted(self.caches.items()):
+                lookups = cache.stats['hits'] + cache.stats['misses']
+                caches[name] = dict(cache.stats,
+                                    entries=len(cache.entries),
+                                    pinned=sum(1 for e in cache.entries.values() if e.pinned),
+                                    bytes=sum(e.size for e in cache.entries.values()),
+                                    hit_rate=cache.stats['hits'] / lookups if lookups else None)
+            return {'pid': os.getpid(), 'budget_bytes': self.budget_bytes, 'bytes': self.bytes,
+                    'caches': caches}
+
+    def render(self):
+        # Prometheus lines, rendered with the other /metrics series
+        stats = self.stats()
+        lines = ["# HELP dash_memory_budget_bytes Memory budget for caches in this worker",
+                 "# TYPE dash_memory_budget_bytes gauge",
+                 f"dash_memory_budget_bytes {stats['budget_bytes']}"]
+        series = [('bytes', 'gauge', "Bytes held per cache"),
+                  ('entries', 'gauge', "Entries held per cache"),
+                  ('hits', 'counter', "Cache lookups that found an entry"),
+                  ('misses', 'counter', "Cache lookups that found nothing"),
+                  ('evictions', 'counter', "Entries evicted to stay within the budget")]
+        for field, kind, help_text in series:
+            name = f"dash_memory_{field}" + ('_total' if kind == 'counter' else '')
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for cache_name, cache_stats in stats['caches'].items():
+                lines.append(f'{name}{{cache="{cache_name}"}} {cache_stats[field]}')
+        return lines
+
+# One manager per worker process, shared by every cache in it
+MEMORY = MemoryManager(MEMORY_CONFIG['budget_bytes'])
+METRICS.append(MEMORY)
+
+def install_memory_route(app):
+    @app.server.route(MEMORY_CONFIG['route'])
+    def memory_stats():
+        return MEMORY.stats()
+
+    return app
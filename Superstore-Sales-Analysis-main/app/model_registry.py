@@ -0,0 +1,177 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+import joblib
+
+from features import FEATURES
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Registry Configuration
+REGISTRY_CONFIG = {
+    'model_dir': os.path.join(BASE_DIR, '..', 'model'),
+    'manifest_name': 'manifest.json',
+    # How many (model, version) pairs may be held in memory at once
+    'max_loaded': 2
+}
+
+def file_checksum(path):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+class ModelRegistry:
+    def __init__(self, model_dir=None, max_loaded=None):
+        self.model_dir = model_dir or REGISTRY_CONFIG['model_dir']
+        self.manifest_path = os.path.join(self.model_dir, REGISTRY_CONFIG['manifest_name'])
+        self.max_loaded = max_loaded or REGISTRY_CONFIG['max_loaded']
+        self._lock = threading.RLock()
+        self._manifest = {'models': {}}
+        self._manifest_mtime = None
+        self._loaded = OrderedDict()
+
+    # Manifest handling
+    def _refresh(self):
+        # Re-read the manifest whenever it changes on disk so new versions are picked up live
+        try:
+            mtime = os.path.getmtime(self.manifest_path)
+        except OSError:
+            return
+        if mtime == self._manifest_mtime:
+            return
+        with open(self.manifest_path) as f:
+            self._manifest = json.load(f)
+        self._manifest_mtime = mtime
+
+        # Drop loaded versions that are no longer active so a swap frees the old model
+        active = {(name, str(entry['active'])) for name, entry in self._manifest['models'].items()}
+        for key in list(self._loaded):
+            if key not in active:
+                del self._loaded[key]
+
+    def _write_manifest(self):
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self._manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+        self._manifest_mtime = None
+        self._refresh()
+
+    def list_models(self):
+        with self._lock:
+            self._refresh()
+            return sorted(self._manifest['models'])
+
+    def info(self, name, version=None):
+        with self._lock:
+            self._refresh()
+            entry = self._manifest['models'][name]
+            version = str(version or entry['active'])
+            return dict(entry['versions'][version], name=name, version=int(version))
+
+    def loaded(self):
+        with self._lock:
+            return list(self._loaded)
+
+    # Loading
+    def get(self, name, version=None):
+        return self.get_with_info(name, version)[0]
+
+    def get_with_info(self, name, version=None):
+        # The model and its manifest entry from one snapshot, so a hot-swap between two
+        # separate lookups cannot pair one version's metrics with the next version's model
+        with self._lock:
+            self._refresh()
+            info = self.info(name, version)
+            key = (name, str(info['version']))
+            if key in self._loaded:
+                self._loaded.move_to_end(key)
+                return self._loaded[key], info
+
+            path = os.path.join(self.model_dir, info['file'])
+            if file_checksum(path) != info['sha256']:
+                raise ValueError(f"Checksum mismatch for {name} v{info['version']} ({path})")
+
+            model = joblib.load(path)
+            self._loaded[key] = model
+            while len(self._loaded) > self.max_loaded:
+                self._loaded.popitem(last=False)
+            return model, info
+
+    # Registration
+    def register(self, name, model, features=None, metrics=None, activate=True):
+        with self._lock:
+            self._refresh()
+            entry = self._manifest['models'].setdefault(name, {'active': None, 'versions': {}})
+            version = max([int(v) for v in entry['versions']] + [0]) + 1
+            file_name = f"{name}_model_v{version}.pkl"
+            path = os.path.join(self.model_dir, file_name)
+
+            tmp_path = path + '.tmp'
+            joblib.dump(model, tmp_path)
+            os.replace(tmp_path, path)
+
+            entry['versions'][str(version)] = self._version_entry(file_name, features, metrics)
+            if activate or entry['active'] is None:
+                entry['active'] = version
+            self._write_manifest()
+            return version
+
+    def activate(self, name, version):
+        with self._lock:
+            self._refresh()
+            entry = self._manifest['models'][name]
+            if str(version) not in entry['versions']:
+                raise KeyError(f"{name} has no version {version}")
+            entry['active'] = int(version)
+            self._write_manifest()
+
+    def _version_entry(self, file_name, features=None, metrics=None):
+        return {
+            'file': file_name,
+            'features': list(features or FEATURES),
+            'metrics': metrics or {},
+            'sha256': file_checksum(os.path.join(self.model_dir, file_name)),
+            'created': datetime.now().isoformat(timespec='seconds')
+        }
+
+    def init_from_directory(self):
+        # Register every "<name>_model.pkl" already in the model directory as version 1
+        with self._lock:
+            self._refresh()
+            for path in sorted(glob.glob(os.path.join(self.model_dir, '*_model.pkl'))):
+                file_name = os.path.basename(path)
+                name = file_name[:-len('_model.pkl')]
+                if name in self._manifest['models']:
+                    continue
+                self._manifest['models'][name] = {
+                    'active': 1,
+                    'versions': {'1': self._version_entry(file_name)}
+                }
+                print(f"Registered {name} v1 from {file_name}")
+            self._write_manifest()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Manage the model registry manifest")
+    parser.add_argument('--model-dir', help="Directory holding the model pickles and manifest")
+    parser.add_argument('--init', action='store_true', help="Register existing *_model.pkl files")
+    parser.add_argument('--activate', nargs=2, metavar=('NAME', 'VERSION'), help="Switch the active version")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.model_dir)
+    if args.init:
+        registry.init_from_directory()
+    if args.activate:
+        registry.activate(args.activate[0], int(args.activate[1]))
+
+    for name in registry.list_models():
+        info = registry.info(name)
+        print(f"{name}: active v{info['version']} ({info['file']}) metrics={info['metrics']}")
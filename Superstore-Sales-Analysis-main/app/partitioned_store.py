@@ -0,0 +1,172 @@
+import argparse
+import json
+import os
+import shutil
+from datetime import datetime
+
+from fast_boot import lazy_import
+
+pd = lazy_import('pandas')
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Partitioned Store Configuration
+PARTITION_CONFIG = {
+    'root': os.environ.get('DASH_PARTITIONS_PATH', os.path.join(BASE_DIR, '..', 'dataset', 'partitioned')),
+    'manifest_name': 'manifest.json',
+    'date_column': 'Order Date',
+    'row_group_size': 100_000,
+    'chunk_rows': 500_000
+}
+
+def manifest_path(root):
+    return os.path.join(root, PARTITION_CONFIG['manifest_name'])
+
+def read_manifest(root=None):
+    root = root or PARTITION_CONFIG['root']
+    try:
+        with open(manifest_path(root)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def write_manifest(root, manifest):
+    tmp_path = manifest_path(root) + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path(root))
+
+def write_partitions(df, root, part_name):
+    # One Parquet file per (year, month), sorted by date so row-group statistics prune within it
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    date_column = PARTITION_CONFIG['date_column']
+    # Taken from the whole frame: a month where a text column is all empty would otherwise be
+    # typed null on its own and no longer concatenate with the other months
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    entries = []
+    for (year, month), part in df.groupby([df[date_column].dt.year, df[date_column].dt.month]):
+        relative = os.path.join(f"year={year}", f"month={month:02d}", f"{part_name}.parquet")
+        path = os.path.join(root, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        part = part.sort_values(date_column)
+        pq.write_table(pa.Table.from_pandas(part, schema=schema, preserve_index=False), path,
+                       row_group_size=PARTITION_CONFIG['row_group_size'])
+        entries.append({
+            'path': relative,
+            'year': int(year),
+            'month': int(month),
+            'min_date': part[date_column].min().strftime('%Y-%m-%d'),
+            'max_date': part[date_column].max().strftime('%Y-%m-%d'),
+            'rows': int(len(part))
+        })
+    return entries
+
+def ingest(source_path, root=None, append=False):
+    # append=True adds the file's rows as new part files, leaving existing partitions untouched;
+    # otherwise the whole store is rebuilt next to the old one and swapped in
+    root = root or PARTITION_CONFIG['root']
+    manifest = read_manifest(root) if append else None
+    target = root if manifest is not None else root + '.tmp'
+    if manifest is None:
+        shutil.rmtree(target, ignore_errors=True)
+        os.makedirs(target)
+        manifest = {'partitions': []}
+
+    part_name = 'part-' + datetime.now().strftime('%Y%m%d%H%M%S%f')
+    for i, chunk in enumerate(pd.read_csv(source_path, chunksize=PARTITION_CONFIG['chunk_rows'])):
+        chunk[PARTITION_CONFIG['date_column']] = pd.to_datetime(chunk[PARTITION_CONFIG['date_column']])
+        manifest['partitions'].extend(write_partitions(chunk, target, f"{part_name}-{i:04d}"))
+
+    manifest['partitions'].sort(key=lambda p: (p['year'], p['month'], p['path']))
+    manifest['rows'] = sum(p['rows'] for p in manifest['partitions'])
+    manifest['version'] = part_name
+    write_manifest(target, manifest)
+
+    if target != root:
+        old_root = root + '.old'
+        shutil.rmtree(old_root, ignore_errors=True)
+        if os.path.exists(root):
+            os.rename(root, old_root)
+        os.rename(target, root)
+        shutil.rmtree(old_root, ignore_errors=True)
+    return manifest
+
+def select_partitions(manifest, start_date=None, end_date=None):
+    # Only files whose [min_date, max_date] overlaps the selected range are opened
+    start = str(start_date)[:10] if start_date else None
+    end = str(end_date)[:10] if end_date else None
+    return [p for p in manifest['partitions']
+            if (start is None or p['max_date'] >= start) and (end is None or p['min_date'] <= end)]
+
+def overlapping_rows(ranges, start_date, end_date):
+    # (start, stop) row positions of the loaded partitions that overlap the dates, merged where
+    # adjacent; ranges is the 'partition_ranges' attribute load_partitions sets
+    start, end = str(start_date)[:10], str(end_date)[:10]
+    spans = []
+    for min_date, max_date, first, stop in ranges:
+        if max_date < start or min_date > end:
+            continue
+        if spans and spans[-1][1] == first:
+            spans[-1] = (spans[-1][0], stop)
+        else:
+            spans.append((first, stop))
+    return spans
+
+def load_partitions(root=None, start_date=None, end_date=None, regions=None, categories=None,
+                    columns=None):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    root = root or PARTITION_CONFIG['root']
+    manifest = read_manifest(root)
+    if manifest is None:
+        raise FileNotFoundError(f"No partition manifest at {manifest_path(root)}")
+
+    # Same semantics as the dashboard's filter_data: dates only apply when both are set
+    date_column = PARTITION_CONFIG['date_column']
+    filters = []
+    selected = manifest['partitions']
+    if start_date and end_date:
+        filters += [(date_column, '>=', pd.Timestamp(str(start_date)[:10])),
+                    (date_column, '<=', pd.Timestamp(str(end_date)[:10]))]
+        selected = select_partitions(manifest, start_date, end_date)
+    if regions:
+        filters.append(('Region', 'in', list(regions)))
+    if categories:
+        filters.append(('Category', 'in', list(categories)))
+
+    tables = [pq.read_table(os.path.join(root, p['path']), columns=columns, filters=filters or None)
+              for p in selected]
+    if not tables and manifest['partitions']:
+        # Nothing overlaps: an empty table with the stored schema keeps the dtypes right
+        schema = pq.read_schema(os.path.join(root, manifest['partitions'][0]['path']))
+        empty = schema.empty_table()
+        tables = [empty.select(columns) if columns else empty]
+    if not tables:
+        return pd.DataFrame(columns=columns or [])
+    # Files from separate ingests are typed from their own chunk, so a column may be int64 in one
+    # and float64 (with NaN) or null in another; those are widened to a common type
+    df = pa.concat_tables(tables, promote_options='permissive').to_pandas()
+    df.attrs['version'] = manifest['version']
+    df.attrs['partitions_read'] = len(selected)
+    # Where each partition's rows ended up, so filters on the loaded frame can skip the
+    # partitions outside a date range just as the reader does
+    ranges, first = [], 0
+    for p, table in zip(selected, tables):
+        ranges.append((p['min_date'], p['max_date'], first, first + table.num_rows))
+        first += table.num_rows
+    df.attrs['partition_ranges'] = ranges
+    return df
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Write the order data as year/month Parquet partitions")
+    parser.add_argument('source', help="Order-level CSV, e.g. dataset/cleaned superstore dataset.csv")
+    parser.add_argument('--root', default=PARTITION_CONFIG['root'])
+    parser.add_argument('--append', action='store_true',
+                        help="Add the file's rows as new part files instead of rebuilding the store")
+    args = parser.parse_args()
+
+    manifest = ingest(args.source, args.root, args.append)
+    print(f"{manifest['rows']:,} rows in {len(manifest['partitions'])} partition files at {args.root}")
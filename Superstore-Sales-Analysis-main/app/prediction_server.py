@@ -0,0 +1,279 @@
+try:
+    import argparse
+    import asyncio
+    import json
+    import os
+    import time
+    from collections import deque
+    from urllib.parse import urlsplit, parse_qs
+
+    import numpy as np
+    import pandas as pd
+
+    from features import build_date_features
+    from model_registry import ModelRegistry
+except ImportError as e:
+    print(f"Error importing dependencies: {str(e)}")
+    print("Please install required packages using:")
+    print("pip install pandas numpy scikit-learn xgboost joblib")
+    raise
+
+# Server Configuration
+SERVER_CONFIG = {
+    'host': os.environ.get('PREDICTION_HOST', '127.0.0.1'),
+    'port': int(os.environ.get('PREDICTION_PORT', 8060)),
+    'model_name': os.environ.get('PREDICTION_MODEL', 'xgboost'),
+    # Single-date requests arriving within this window are answered by one predict call
+    'max_wait_ms': 5,
+    'max_batch_size': 512,
+    'max_range_days': 3660,
+    'latency_window': 10000
+}
+
+class ServerStats:
+    def __init__(self, window):
+        self.started = time.perf_counter()
+        self.latencies = {}
+        self.requests = {}
+        self.errors = 0
+        self.batches = 0
+        self.batched_items = 0
+        self.window = window
+
+    def record(self, endpoint, seconds):
+        self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+        self.latencies.setdefault(endpoint, deque(maxlen=self.window)).append(seconds)
+
+    def record_batch(self, size):
+        self.batches += 1
+        self.batched_items += size
+
+    def snapshot(self):
+        uptime = time.perf_counter() - self.started
+        endpoints = {}
+        for endpoint, values in self.latencies.items():
+            ms = np.array(values) * 1000
+            endpoints[endpoint] = {
+                'requests': self.requests[endpoint],
+                'p50_ms': round(float(np.percentile(ms, 50)), 3),
+                'p95_ms': round(float(np.percentile(ms, 95)), 3),
+                'p99_ms': round(float(np.percentile(ms, 99)), 3),
+                'max_ms': round(float(ms.max()), 3)
+            }
+        total = sum(self.requests.values())
+        return {
+            'uptime_s': round(uptime, 1),
+            'requests': total,
+            'throughput_rps': round(total / uptime, 1) if uptime else 0.0,
+            'errors': self.errors,
+            'batches': self.batches,
+            'avg_batch_size': round(self.batched_items / self.batches, 2) if self.batches else 0.0,
+            'endpoints': endpoints
+        }
+
+class MicroBatcher:
+    def __init__(self, registry, model_name, stats, max_wait_ms, max_batch_size):
+        self.registry = registry
+        self.model_name = model_name
+        self.stats = stats
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.queue = asyncio.Queue()
+        self.task = None
+
+    def start(self):
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def predict(self, date):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((date, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            dates = [date for date, _ in batch]
+            try:
+                preds = await loop.run_in_executor(None, predict_dates, self.registry,
+                                                   self.model_name, dates)
+            except Exception:
+                # Retry each date on its own, so only the request that broke the batch fails
+                await self._run_singly(batch)
+                continue
+
+            self.stats.record_batch(len(batch))
+            for (_, future), pred in zip(batch, preds):
+                if not future.done():
+                    future.set_result(float(pred))
+
+    async def _run_singly(self, batch):
+        loop = asyncio.get_running_loop()
+        for date, future in batch:
+            try:
+                preds = await loop.run_in_executor(None, predict_dates, self.registry,
+                                                   self.model_name, [date])
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            self.stats.record_batch(1)
+            if not future.done():
+                future.set_result(float(preds[0]))
+
+def parse_date(value, name):
+    # Rejected here, before the date can share a batch with other requests
+    date = pd.Timestamp(value)
+    if pd.isna(date):
+        raise ValueError(f"Invalid date for '{name}': {value!r}")
+    return date
+
+def predict_dates(registry, model_name, dates):
+    # Same features as the Streamlit app, computed for the whole batch at once
+    model, info = registry.get_with_info(model_name)
+    X = build_date_features(dates)[info['features']]
+    return model.predict(X)
+
+class PredictionServer:
+    def __init__(self, config=None):
+        self.config = dict(SERVER_CONFIG, **(config or {}))
+        self.registry = ModelRegistry()
+        self.stats = ServerStats(self.config['latency_window'])
+        self.batcher = MicroBatcher(self.registry, self.config['model_name'], self.stats,
+                                    self.config['max_wait_ms'], self.config['max_batch_size'])
+
+    # Endpoints
+    async def handle_predict(self, params):
+        date = parse_date(params['date'][0], 'date')
+        prediction = await self.batcher.predict(date)
+        return 200, {'date': date.strftime('%Y-%m-%d'), 'prediction': prediction}
+
+    async def handle_range(self, params):
+        start = parse_date(params['start'][0], 'start')
+        end = parse_date(params['end'][0], 'end')
+        dates = pd.date_range(start, end, freq='D')
+        if len(dates) == 0:
+            raise ValueError("'end' must not be before 'start'")
+        if len(dates) > self.config['max_range_days']:
+            raise ValueError(f"Range is limited to {self.config['max_range_days']} days")
+
+        loop = asyncio.get_running_loop()
+        preds = await loop.run_in_executor(None, predict_dates, self.registry,
+                                           self.config['model_name'], dates)
+        return 200, {
+            'start': start.strftime('%Y-%m-%d'),
+            'end': end.strftime('%Y-%m-%d'),
+            'predictions': [{'date': d.strftime('%Y-%m-%d'), 'prediction': float(p)}
+                            for d, p in zip(dates, preds)]
+        }
+
+    async def handle_stats(self, params):
+        return 200, self.stats.snapshot()
+
+    async def handle_health(self, params):
+        _, info = self.registry.get_with_info(self.config['model_name'])
+        return 200, {'status': 'ok', 'model': info['name'], 'version': info['version']}
+
+    # HTTP plumbing
+    async def dispatch(self, method, target):
+        routes = {
+            '/predict': self.handle_predict,
+            '/predict/range': self.handle_range,
+            '/stats': self.handle_stats,
+            '/health': self.handle_health
+        }
+        url = urlsplit(target)
+        handler = routes.get(url.path)
+        if handler is None:
+            return 404, {'error': f"Unknown endpoint {url.path}"}
+        if method != 'GET':
+            return 405, {'error': "Only GET is supported"}
+
+        started = time.perf_counter()
+        try:
+            status, body = await handler(parse_qs(url.query))
+        except KeyError as e:
+            self.stats.errors += 1
+            return 400, {'error': f"Missing query parameter {e}"}
+        except ValueError as e:
+            self.stats.errors += 1
+            return 400, {'error': str(e)}
+        except Exception as e:
+            self.stats.errors += 1
+            print(f"Error in {url.path}: {str(e)}")
+            return 500, {'error': str(e)}
+        self.stats.record(url.path, time.perf_counter() - started)
+        return status, body
+
+    async def handle_connection(self, reader, writer):
+        reasons = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+                   405: 'Method Not Allowed', 500: 'Internal Server Error'}
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                if 'content-length' in headers:
+                    await reader.readexactly(int(headers['content-length']))
+
+                status, body = await self.dispatch(method, target)
+                payload = json.dumps(body).encode()
+                keep_alive = (headers.get('connection', '').lower() != 'close' and
+                              version == 'HTTP/1.1')
+                writer.write(
+                    f"HTTP/1.1 {status} {reasons[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        self.batcher.start()
+        # Load the model up front so the first request does not pay for it
+        self.registry.get(self.config['model_name'])
+        server = await asyncio.start_server(self.handle_connection,
+                                            self.config['host'], self.config['port'])
+        print(f"Prediction server listening on http://{self.config['host']}:{self.config['port']}")
+        async with server:
+            await server.serve_forever()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Micro-batching HTTP prediction server")
+    parser.add_argument('--host')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--model', dest='model_name', help="Registered model name to serve")
+    parser.add_argument('--max-wait-ms', type=float)
+    parser.add_argument('--max-batch-size', type=int)
+    args = parser.parse_args()
+
+    overrides = {k: v for k, v in vars(args).items() if v is not None}
+    try:
+        asyncio.run(PredictionServer(overrides).serve())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,236 @@
+import atexit
+import cProfile
+import html
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+# Profiling Configuration
+PROFILING_CONFIG = {
+    # "1" profiles every callback request, "header" only those sent with the header below;
+    # either also lists the profiles on /_profiles. Unset, nothing is installed
+    'enabled': os.environ.get('DASH_PROFILE', ''),
+    # Profiles every Streamlit rerun
+    'streamlit_enabled': os.environ.get('STREAMLIT_PROFILE', '') == '1',
+    'header': 'X-Dash-Profile',
+    # "sample" writes folded stacks (flamegraph.pl, speedscope); "cprofile" writes .prof files
+    'mode': os.environ.get('DASH_PROFILE_MODE', 'sample'),
+    'sample_interval': float(os.environ.get('DASH_PROFILE_INTERVAL_MS', 2)) / 1000,
+    'output_dir': os.environ.get('DASH_PROFILE_DIR', os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), '..', 'profiles')),
+    'index_size': 50,
+    # Oldest profile files are deleted past this count, and the index is cut back to its
+    # newest entries once it outgrows index_max_bytes
+    'max_files': 500,
+    'index_max_bytes': 1024 * 1024
+}
+
+_index_lock = threading.Lock()
+# Streamlit rerun profilers not finished yet, by id
+_open_profiles = {}
+_open_lock = threading.Lock()
+
+class SamplingProfiler:
+    # Samples one thread's stack on a timer; cheap enough to leave on for a whole request
+    def __init__(self, interval, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                # The sampled thread has exited; nothing left to sample
+                return
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def save(self, path):
+        path += '.folded'
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
+
+class DeterministicProfiler:
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def save(self, path):
+        path += '.prof'
+        self.profile.dump_stats(path)
+        return path
+
+def start_profile(label):
+    if PROFILING_CONFIG['mode'] == 'cprofile':
+        profiler = DeterministicProfiler()
+    else:
+        profiler = SamplingProfiler(PROFILING_CONFIG['sample_interval'])
+    profiler.label = label
+    profiler.started = time.perf_counter()
+    profiler.start()
+    return profiler
+
+def finish_profile(profiler, extra=None):
+    profiler.stop()
+    duration = time.perf_counter() - profiler.started
+    output_dir = PROFILING_CONFIG['output_dir']
+    os.makedirs(output_dir, exist_ok=True)
+
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    safe_label = ''.join(c if c.isalnum() or c in '-_' else '_' for c in profiler.label)[:80]
+    path = profiler.save(os.path.join(output_dir, f"{stamp}-{safe_label}"))
+
+    entry = dict(extra or {}, label=profiler.label, file=os.path.basename(path),
+                 duration_ms=round(duration * 1000, 1),
+                 time=datetime.now().isoformat(timespec='seconds'))
+    index_path = os.path.join(output_dir, 'index.jsonl')
+    with _index_lock:
+        with open(index_path, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+        if os.path.getsize(index_path) > PROFILING_CONFIG['index_max_bytes']:
+            lines = tail_lines(index_path, PROFILING_CONFIG['max_files'])
+            with open(index_path + '.tmp', 'w') as f:
+                f.writelines(line + '\n' for line in lines)
+            os.replace(index_path + '.tmp', index_path)
+        prune_profiles(output_dir)
+    return entry
+
+def start_session_profile(session, label):
+    # Profiles one Streamlit rerun from its session state. A rerun cut short by st.stop(), a widget
+    # change or an error never reaches finish_session_profile, so the next rerun finishes its profile
+    finish_session_profile(session, {'interrupted': True})
+    profiler = start_profile(label)
+    session['_rerun_profiler'] = profiler
+    with _open_lock:
+        _open_profiles[id(profiler)] = profiler
+
+def finish_session_profile(session, extra=None):
+    profiler = session.pop('_rerun_profiler', None)
+    if profiler is None:
+        return None
+    with _open_lock:
+        if _open_profiles.pop(id(profiler), None) is None:
+            # Already finished at exit
+            return None
+    return finish_profile(profiler, extra)
+
+@atexit.register
+def finish_open_profiles():
+    # Reruns interrupted before the server stopped have no later rerun to finish them
+    with _open_lock:
+        profilers = list(_open_profiles.values())
+        _open_profiles.clear()
+    for profiler in profilers:
+        finish_profile(profiler, {'interrupted': True})
+
+def prune_profiles(output_dir):
+    # File names start with their timestamp, so name order is age order
+    files = sorted(name for name in os.listdir(output_dir) if name.endswith(('.folded', '.prof')))
+    for name in files[:-PROFILING_CONFIG['max_files']]:
+        try:
+            os.remove(os.path.join(output_dir, name))
+        except FileNotFoundError:
+            # Another worker pruned it first
+            pass
+
+def tail_lines(path, count):
+    # The last count lines, read backwards in blocks instead of through the whole file
+    with open(path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        data = b''
+        while position > 0 and data.count(b'\n') <= count:
+            step = min(64 * 1024, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    return [line.decode() for line in data.splitlines()[-count:] if line.strip()]
+
+def recent_profiles(limit=None):
+    index_path = os.path.join(PROFILING_CONFIG['output_dir'], 'index.jsonl')
+    if not os.path.exists(index_path):
+        return []
+    with _index_lock:
+        lines = tail_lines(index_path, limit or PROFILING_CONFIG['index_size'])
+    entries = [json.loads(line) for line in lines]
+    return sorted(entries, key=lambda e: e['duration_ms'], reverse=True)
+
+def render_index():
+    rows = ''.join(
+        f"<tr><td>{e['duration_ms']:,.1f}</td><td>{html.escape(e['label'])}</td>"
+        f"<td>{html.escape(e['time'])}</td>"
+        f"<td>{html.escape(json.dumps(e.get('inputs')))}</td>"
+        f"<td><a href='/_profiles/{html.escape(e['file'])}'>{html.escape(e['file'])}</a></td></tr>"
+        for e in recent_profiles()
+    )
+    return f"""<!DOCTYPE html>
+<html><head><title>Slowest recent requests</title>
+<style>body{{font-family:sans-serif;margin:20px}} td,th{{padding:4px 10px;text-align:left}}</style>
+</head><body>
+<h2>Slowest recent requests</h2>
+<table><tr><th>ms</th><th>Request</th><th>Time</th><th>Inputs</th><th>Profile</th></tr>{rows}</table>
+</body></html>"""
+
+def install_dash_profiling(app):
+    # Profiles record callback inputs, so neither they nor /_profiles exist unless enabled
+    if PROFILING_CONFIG['enabled'] not in ('1', 'header'):
+        return app
+    import flask
+
+    server = app.server
+
+    def wants_profile(request):
+        return (PROFILING_CONFIG['enabled'] == '1' or
+                request.headers.get(PROFILING_CONFIG['header']) == '1')
+
+    @server.before_request
+    def start_request_profile():
+        request = flask.request
+        if request.path.endswith('/_dash-update-component') and wants_profile(request):
+            flask.g.profiler = start_profile('dash')
+
+    @server.after_request
+    def finish_request_profile(response):
+        profiler = flask.g.pop('profiler', None)
+        if profiler is not None:
+            body = flask.request.get_json(silent=True) or {}
+            profiler.label = body.get('output', 'dash')
+            finish_profile(profiler, {'inputs': [i.get('value') for i in body.get('inputs', [])
+                                                 if isinstance(i, dict)]})
+        return response
+
+    @server.route('/_profiles')
+    def profiles_index():
+        return render_index()
+
+    @server.route('/_profiles/<path:name>')
+    def profile_file(name):
+        return flask.send_from_directory(os.path.abspath(PROFILING_CONFIG['output_dir']), name,
+                                         as_attachment=True)
+
+    return app
@@ -0,0 +1,249 @@
+import argparse
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from fast_boot import lazy_import
+from partitioned_store import PARTITION_CONFIG, load_partitions
+
+pd = lazy_import('pandas')
+
+try:
+    import fcntl
+except ImportError:
+    # No advisory file locks (Windows): builds are only serialized inside each process
+    fcntl = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Query Backend Configuration
+QUERY_CONFIG = {
+    # "pandas" queries the in-memory frame; "sqlite" pushes filters and aggregations down to
+    # an indexed on-disk copy of the order history; "parquet" reads only the year/month
+    # partitions that overlap the selected dates
+    'backend': os.environ.get('DASH_QUERY_BACKEND', 'pandas'),
+    'sqlite_path': os.environ.get('DASH_SQLITE_PATH', os.path.join(BASE_DIR, '..', 'cache', 'superstore.sqlite')),
+    'table': 'orders',
+    # Only the columns callbacks query are stored
+    'columns': ['Order ID', 'Order Date', 'Customer Name', 'Segment', 'Region', 'State', 'Category',
+                'Sub-Category', 'Product Name', 'Ship Mode', 'Sales', 'Quantity', 'Discount', 'Profit'],
+    'indexes': [('Order Date',), ('Region', 'Order Date'), ('Category', 'Order Date')],
+    'chunk_rows': 200_000
+}
+
+SQL_FUNCTIONS = {
+    'sum': 'SUM({})',
+    'mean': 'AVG({})',
+    'count': 'COUNT({})',
+    'nunique': 'COUNT(DISTINCT {})',
+    'min': 'MIN({})',
+    'max': 'MAX({})'
+}
+
+def quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+def normalize_date(value):
+    # The date picker sends either plain dates or full ISO timestamps
+    return str(value)[:10] if value else None
+
+def query_columns(group_by, metrics):
+    return list(dict.fromkeys(list(group_by) + [column for column, _ in metrics.values()]))
+
+def aggregate_frame(frame, group_by, metrics, order_by=None, descending=True, limit=None):
+    # metrics: {output column: (source column, function)}, as in DataFrame.agg(**metrics)
+    result = frame[query_columns(group_by, metrics)].groupby(list(group_by)).agg(**metrics).reset_index()
+    if order_by and limit:
+        result = result.nlargest(limit, order_by) if descending else result.nsmallest(limit, order_by)
+    elif order_by:
+        result = result.sort_values(order_by, ascending=not descending)
+    return result.reset_index(drop=True)
+
+class PandasBackend:
+    name = 'pandas'
+
+    def __init__(self, filter_data):
+        self.filter_data = filter_data
+
+    def aggregate(self, group_by, metrics, start_date=None, end_date=None, regions=None,
+                  categories=None, order_by=None, descending=True, limit=None):
+        filtered_df = self.filter_data(start_date, end_date, regions, categories)
+        return aggregate_frame(filtered_df, group_by, metrics, order_by, descending, limit)
+
+class PartitionedBackend:
+    name = 'parquet'
+
+    def __init__(self, root=None):
+        self.root = root or PARTITION_CONFIG['root']
+
+    def aggregate(self, group_by, metrics, start_date=None, end_date=None, regions=None,
+                  categories=None, order_by=None, descending=True, limit=None):
+        # Partition pruning, column projection and row filters all happen in the Parquet reader
+        frame = load_partitions(self.root, start_date, end_date, regions, categories,
+                                columns=query_columns(group_by, metrics))
+        return aggregate_frame(frame, group_by, metrics, order_by, descending, limit)
+
+class SQLiteBackend:
+    name = 'sqlite'
+
+    def __init__(self, source_path, db_path=None, table=None, fallback=None):
+        # source_path may be a function, called on every query, so a data file that appears or
+        # moves after startup is followed; while it returns None queries go to the fallback
+        self.source_path = source_path
+        self.db_path = db_path or QUERY_CONFIG['sqlite_path']
+        self.table = table or QUERY_CONFIG['table']
+        self.fallback = fallback
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._generation = 0
+        self._current_version = None
+
+    def resolve_source(self):
+        return self.source_path() if callable(self.source_path) else self.source_path
+
+    def source_version(self, source_path=None):
+        # The path is part of the version, so data moved to another file is rebuilt
+        source_path = source_path or self.resolve_source()
+        stat = os.stat(source_path)
+        return f"{os.path.abspath(source_path)}:{stat.st_size}-{stat.st_mtime_ns}"
+
+    def built_version(self):
+        if not os.path.exists(self.db_path):
+            return None
+        conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        try:
+            return conn.execute("SELECT value FROM meta WHERE key = 'source_version'").fetchone()[0]
+        except (sqlite3.Error, TypeError):
+            return None
+        finally:
+            conn.close()
+
+    @contextmanager
+    def build_lock(self):
+        # Held across processes while the database is checked and built, so gunicorn workers
+        # never write the same .tmp file at once; the ones that waited find it current
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(self.db_path + '.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def build(self, source_path=None):
+        # Streams the CSV in chunks, so the source never has to fit in memory. Callers other
+        # than ensure_current() must hold build_lock()
+        source_path = source_path or self.resolve_source()
+        version = self.source_version(source_path)
+        tmp_path = self.db_path + '.tmp'
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        conn = sqlite3.connect(tmp_path)
+        try:
+            for chunk in pd.read_csv(source_path, usecols=QUERY_CONFIG['columns'],
+                                     chunksize=QUERY_CONFIG['chunk_rows']):
+                # ISO dates compare correctly as text and keep range scans on the index
+                chunk['Order Date'] = pd.to_datetime(chunk['Order Date']).dt.strftime('%Y-%m-%d')
+                chunk.to_sql(self.table, conn, if_exists='append', index=False)
+            for columns in QUERY_CONFIG['indexes']:
+                index_name = 'idx_' + '_'.join(c.lower().replace(' ', '_').replace('-', '_') for c in columns)
+                conn.execute(f"CREATE INDEX {index_name} ON {quote(self.table)} "
+                             f"({', '.join(quote(c) for c in columns)})")
+            conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute("INSERT INTO meta VALUES ('source_version', ?)", (version,))
+            conn.execute("ANALYZE")
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_path, self.db_path)
+        print(f"SQLite query backend built at {self.db_path}")
+
+    def ensure_current(self, source_path=None):
+        # Rebuilt whenever the source file changes; open connections are dropped lazily
+        source_path = source_path or self.resolve_source()
+        version = self.source_version(source_path)
+        if version == self._current_version:
+            return
+        with self._lock:
+            if version != self._current_version:
+                if self.built_version() != version:
+                    with self.build_lock():
+                        if self.built_version() != version:
+                            self.build(source_path)
+                self._current_version = version
+                self._generation += 1
+
+    def connection(self, source_path=None):
+        self.ensure_current(source_path)
+        cached = getattr(self._local, 'connection', None)
+        if cached is not None and cached[0] == self._generation:
+            return cached[1]
+        if cached is not None:
+            cached[1].close()
+        # One read-only connection per thread; sqlite3 connections must not be shared
+        conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False)
+        self._local.connection = (self._generation, conn)
+        return conn
+
+    def aggregate(self, group_by, metrics, start_date=None, end_date=None, regions=None,
+                  categories=None, order_by=None, descending=True, limit=None):
+        source_path = self.resolve_source()
+        if source_path is None:
+            if self.fallback is None:
+                raise FileNotFoundError("No source file for the SQLite query backend")
+            return self.fallback.aggregate(group_by, metrics, start_date, end_date, regions,
+                                           categories, order_by, descending, limit)
+        select = [quote(column) for column in group_by]
+        for output, (column, func) in metrics.items():
+            select.append(f"{SQL_FUNCTIONS[func].format(quote(column))} AS {quote(output)}")
+
+        where, params = [], []
+        if start_date and end_date:
+            where.append('"Order Date" BETWEEN ? AND ?')
+            params += [normalize_date(start_date), normalize_date(end_date)]
+        if regions:
+            where.append(f'"Region" IN ({", ".join("?" * len(regions))})')
+            params += list(regions)
+        if categories:
+            where.append(f'"Category" IN ({", ".join("?" * len(categories))})')
+            params += list(categories)
+
+        sql = f"SELECT {', '.join(select)} FROM {quote(self.table)}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" GROUP BY {', '.join(quote(c) for c in group_by)}"
+        if order_by:
+            # Group columns break ties the same way nlargest does on the sorted pandas result
+            direction = 'DESC' if descending else 'ASC'
+            sql += f" ORDER BY {quote(order_by)} {direction}, " + ', '.join(quote(c) for c in group_by)
+        else:
+            sql += f" ORDER BY {', '.join(quote(c) for c in group_by)}"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+
+        return pd.read_sql_query(sql, self.connection(source_path), params=params)
+
+def create_backend(name, filter_data, source_path):
+    # source_path: the order CSV, or a function returning its current path (None if missing)
+    if name == 'sqlite':
+        return SQLiteBackend(source_path, fallback=PandasBackend(filter_data))
+    if name == 'parquet':
+        return PartitionedBackend()
+    if name != 'pandas':
+        print(f"Unknown query backend '{name}', using pandas")
+    return PandasBackend(filter_data)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build the SQLite copy of the order history")
+    parser.add_argument('source', help="Order-level CSV, e.g. dataset/cleaned superstore dataset.csv")
+    parser.add_argument('--db', default=QUERY_CONFIG['sqlite_path'])
+    args = parser.parse_args()
+    backend = SQLiteBackend(args.source, args.db)
+    with backend.build_lock():
+        backend.build()
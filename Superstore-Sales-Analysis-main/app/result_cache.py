@@ -0,0 +1,260 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import Counter as TupleCounter, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from approximate import exact_only
+from instrumentation import INSTRUMENTATION_CONFIG, METRICS, Counter, measure, merge_context, normalize_value
+from memory_budget import MEMORY
+
+# Result Cache Configuration
+RESULT_CACHE_CONFIG = {
+    # "1" caches callback results per data version and warms them after every load
+    'enabled': os.environ.get('DASH_RESULT_CACHE', '') == '1',
+    'warmup': os.environ.get('DASH_WARMUP', '1') == '1',
+    # Share of the machine's cores the warm-up may use, so live requests keep priority
+    'cpu_budget': float(os.environ.get('DASH_WARMUP_CPU', 0.5)),
+    'max_workers': 4,
+    # Filter combinations warmed besides the default state and each single region/category
+    'frequent_tuples': 20,
+    'recent_requests': 2000,
+    # The dashboard inputs that make up a filter state
+    'filters': {
+        'start_date': ('date-range', 'start_date'),
+        'end_date': ('date-range', 'end_date'),
+        'regions': ('region-filter', 'value'),
+        'categories': ('category-filter', 'value')
+    }
+}
+
+CACHE_LOOKUPS = Counter('dash_result_cache_lookups_total', "Result cache lookups by outcome",
+                        ('callback', 'result'))
+WARMED_RESULTS = Counter('dash_result_cache_warmed_total', "Results precomputed by the warm-up",
+                         ('callback',))
+METRICS.extend([CACHE_LOOKUPS, WARMED_RESULTS])
+
+FILTER_NAMES = {dependency: name for name, dependency in RESULT_CACHE_CONFIG['filters'].items()}
+
+_MISSING = object()
+
+def dependency_ids(args, kwargs):
+    # (component id, property) of every Input and State, in the order the callback receives them
+    from dash.dependencies import Input, State
+
+    ids = []
+    for arg in list(args) + [kwargs.get('inputs'), kwargs.get('state')]:
+        for item in (arg if isinstance(arg, (list, tuple)) else [arg]):
+            if isinstance(item, (Input, State)):
+                ids.append((item.component_id, item.component_property))
+    return ids
+
+def filter_key(state):
+    key = []
+    for name in RESULT_CACHE_CONFIG['filters']:
+        value = normalize_value(state.get(name))
+        key.append(tuple(value) if isinstance(value, list) else value)
+    return tuple(key)
+
+def cache_key(name, args):
+    return (name, json.dumps([normalize_value(arg) for arg in args], sort_keys=True, default=str))
+
+def filter_state(key):
+    return {name: list(value) if isinstance(value, tuple) else value
+            for name, value in zip(RESULT_CACHE_CONFIG['filters'], key)}
+
+class ResultCache:
+    def __init__(self, get_df):
+        self.get_df = get_df
+        self.callbacks = {}
+        self.defaults = {}
+        self.options = {}
+        self.recent = deque(maxlen=RESULT_CACHE_CONFIG['recent_requests'])
+        # Held under the shared memory budget, which weighs each result's compute time
+        self._entries = MEMORY.cache('callback_results')
+        self._lock = threading.Lock()
+        self._source = None
+        self._generation = 0
+        self._started = threading.Event()
+        # Keys whose exact result is being computed after a sampled answer
+        self._refining = set()
+
+    def wrap(self, func, dependencies):
+        name = func.__name__
+        # Only callbacks driven purely by the filters can be warmed
+        names = [FILTER_NAMES.get(dependency) for dependency in dependencies]
+        if names and None not in names:
+            self.callbacks[name] = (func, names)
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            self.check_source()
+            key = cache_key(name, args)
+            if names and None not in names:
+                self.recent.append(filter_key(dict(zip(names, args))))
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                CACHE_LOOKUPS.inc((name, 'hit'))
+                return entry
+            CACHE_LOOKUPS.inc((name, 'miss'))
+            generation = self._generation
+            started = time.perf_counter()
+            with measure() as measured:
+                result = func(*args)
+            merge_context(measured)
+            # An error figure stands for a failure that may not happen again
+            if measured['errors']:
+                return result
+            if measured['approximate']:
+                # A sampled answer must not be served as final; the exact one is kept in its place
+                self.refine_async(name, func, args, key, generation)
+            else:
+                self.store(key, result, generation, time.perf_counter() - started)
+            return result
+        return wrapper
+
+    def get(self, name, args):
+        # The cached result of a callback for these inputs, or None
+        entry = self._entries.get(cache_key(name, args), _MISSING)
+        return None if entry is _MISSING else entry
+
+    def refine_async(self, name, func, args, key, generation):
+        with self._lock:
+            if key in self._refining:
+                return
+            self._refining.add(key)
+
+        def refine():
+            try:
+                started = time.perf_counter()
+                with exact_only(), measure() as measured:
+                    result = func(*args)
+                if not measured['errors']:
+                    self.store(key, result, generation, time.perf_counter() - started)
+            except Exception as e:
+                print(f"Exact refinement of {name} failed: {str(e)}")
+            finally:
+                with self._lock:
+                    self._refining.discard(key)
+        threading.Thread(target=refine, name='cache-refine', daemon=True).start()
+
+    def store(self, key, result, generation, cost):
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries.put(key, result, cost)
+
+    def check_source(self):
+        # A new frame means new data: drop every result and warm the common views again
+        df = self.get_df()
+        with self._lock:
+            if self._source is df:
+                return
+            self._source = df
+            self._generation += 1
+            self._entries.clear()
+        if self._started.is_set() and RESULT_CACHE_CONFIG['warmup']:
+            threading.Thread(target=self.warm, name='cache-warmup', daemon=True).start()
+
+    def start(self, defaults, options):
+        # Called once every callback is registered; defaults are the layout's filter values
+        self.defaults = defaults
+        self.options = options
+        self._started.set()
+        threading.Thread(target=self.check_source, name='cache-warmup', daemon=True).start()
+
+    def refresh(self):
+        if self._started.is_set():
+            self.check_source()
+
+    def logged_states(self):
+        # Slow requests survive restarts in the slow log, so a fresh deploy still knows them
+        states = list(self.recent)
+        try:
+            with open(INSTRUMENTATION_CONFIG['slow_log_path']) as f:
+                for line in f:
+                    entry = json.loads(line)
+                    callback = self.callbacks.get(entry.get('callback'))
+                    if callback is not None and len(entry.get('inputs', [])) == len(callback[1]):
+                        states.append(filter_key(dict(zip(callback[1], entry['inputs']))))
+        except (OSError, ValueError):
+            pass
+        return states
+
+    def warm_states(self):
+        states = [self.defaults]
+        for name in ('regions', 'categories'):
+            states += [dict(self.defaults, **{name: [value]}) for value in self.options.get(name, [])]
+        frequent = TupleCounter(self.logged_states()).most_common(RESULT_CACHE_CONFIG['frequent_tuples'])
+        states += [filter_state(key) for key, _ in frequent]
+        return states
+
+    def warm(self):
+        generation = self._generation
+        started = time.perf_counter()
+        cpu_allowed = max(RESULT_CACHE_CONFIG['cpu_budget'] * (os.cpu_count() or 1), 0.05)
+        workers = min(max(int(cpu_allowed), 1), RESULT_CACHE_CONFIG['max_workers'])
+        budget = {'cpu': 0.0, 'warmed': 0}
+        budget_lock = threading.Lock()
+
+        jobs = []
+        seen = set()
+        for state in self.warm_states():
+            for name, (func, names) in self.callbacks.items():
+                args = [state.get(n) for n in names]
+                key = cache_key(name, args)
+                if key not in seen:
+                    seen.add(key)
+                    jobs.append((name, func, args, key))
+
+        def run(job):
+            name, func, args, key = job
+            if generation != self._generation:
+                return
+            if key in self._entries:
+                return
+            cpu_started = time.thread_time()
+            call_started = time.perf_counter()
+            try:
+                with exact_only(), measure() as measured:
+                    result = func(*args)
+            except Exception as e:
+                print(f"Warm-up of {name} failed: {str(e)}")
+                return
+            if measured['errors']:
+                print(f"Warm-up of {name} returned an error figure")
+                return
+            self.store(key, result, generation, time.perf_counter() - call_started)
+            WARMED_RESULTS.inc((name,))
+            # Pause until the warm-up's total CPU time fits the budget over its wall time
+            with budget_lock:
+                budget['cpu'] += time.thread_time() - cpu_started
+                budget['warmed'] += 1
+                wait = budget['cpu'] / cpu_allowed - (time.perf_counter() - started)
+            if wait > 0:
+                time.sleep(wait)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='cache-warmup') as pool:
+            list(pool.map(run, jobs))
+        if generation == self._generation:
+            print(f"Cache warm-up: {budget['warmed']} results for {len(jobs)} views in "
+                  f"{time.perf_counter() - started:.1f}s")
+
+def install_result_cache(app, cache):
+    # Same hook as instrument_app: callbacks registered afterwards read through the cache.
+    # Background callbacks run in worker processes and are left alone
+    register_callback = app.callback
+
+    def callback(*args, **kwargs):
+        decorator = register_callback(*args, **kwargs)
+        if kwargs.get('background'):
+            return decorator
+
+        def register(func):
+            return decorator(cache.wrap(func, dependency_ids(args, kwargs)))
+        return register
+
+    app.callback = callback
+    return app
@@ -0,0 +1,174 @@
+try:
+    import argparse
+    import json
+    import os
+    from datetime import datetime
+
+    import numpy as np
+    import pandas as pd
+    from sklearn.metrics import mean_absolute_error, mean_squared_error
+    from xgboost import XGBRegressor
+
+    from features import FEATURES, build_date_features
+    from model_registry import ModelRegistry
+except ImportError as e:
+    print(f"Error importing dependencies: {str(e)}")
+    print("Please install required packages using:")
+    print("pip install pandas numpy scikit-learn xgboost joblib")
+    raise
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Retraining Configuration
+RETRAIN_CONFIG = {
+    'model_name': 'xgboost',
+    'state_path': os.path.join(BASE_DIR, '..', 'model', 'xgboost_retrain_state.json'),
+    'data_path': os.path.join(BASE_DIR, '..', 'dataset', 'cleaned_superstore.csv'),
+    # The shipped model was trained on everything before the notebook's split date
+    'initial_trained_until': '2021-12-31',
+    'holdout_days': 60,
+    'window_days': 365,
+    'extra_rounds': 50,
+    'target': 'Sales'
+}
+
+def load_daily_sales(data_path):
+    df = pd.read_csv(data_path)
+    df['Order Date'] = pd.to_datetime(df['Order Date'])
+
+    # Raw order-level exports are aggregated to one row per day, like preprocessing.ipynb
+    if 'Order ID' in df.columns or df['Order Date'].duplicated().any():
+        df = df.groupby('Order Date').agg({RETRAIN_CONFIG['target']: 'sum'}).reset_index()
+
+    return df.sort_values('Order Date').reset_index(drop=True)
+
+def load_state(state_path):
+    if os.path.exists(state_path):
+        with open(state_path) as f:
+            return json.load(f)
+    return {'trained_until': RETRAIN_CONFIG['initial_trained_until'], 'history': []}
+
+def save_state(state, state_path):
+    tmp_path = state_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, state_path)
+
+def evaluate(model, daily):
+    preds = model.predict(build_date_features(daily['Order Date']))
+    y_true = daily[RETRAIN_CONFIG['target']].values
+    return {
+        'MAE': round(float(mean_absolute_error(y_true, preds)), 2),
+        'RMSE': round(float(np.sqrt(mean_squared_error(y_true, preds))), 2)
+    }
+
+def split_for_retrain(daily, trained_until, mode, holdout_days, window_days):
+    # The most recent days are held out; everything before them is eligible for training
+    holdout_start = daily['Order Date'].max() - pd.Timedelta(days=holdout_days - 1)
+    holdout = daily[daily['Order Date'] >= holdout_start]
+    trainable = daily[daily['Order Date'] < holdout_start]
+
+    if mode == 'continue':
+        train = trainable[trainable['Order Date'] > pd.Timestamp(trained_until)]
+    else:
+        window_start = holdout_start - pd.Timedelta(days=window_days)
+        train = trainable[trainable['Order Date'] >= window_start]
+
+    return train, holdout
+
+def fit_candidate(current, train, mode, extra_rounds):
+    X_train = build_date_features(train['Order Date'])
+    y_train = train[RETRAIN_CONFIG['target']].values
+    params = current.get_params()
+
+    if mode == 'continue':
+        # Add a few boosting rounds on top of the existing booster using only the new rows
+        params['n_estimators'] = extra_rounds
+        candidate = XGBRegressor(**params)
+        candidate.fit(X_train, y_train, xgb_model=current.get_booster())
+    else:
+        # Refit from scratch on the sliding window only
+        candidate = XGBRegressor(**params)
+        candidate.fit(X_train, y_train)
+
+    return candidate
+
+def retrain(mode='continue', data_path=None, model_name=None, model_dir=None, state_path=None,
+            holdout_days=None, window_days=None, extra_rounds=None, dry_run=False):
+    data_path = data_path or RETRAIN_CONFIG['data_path']
+    model_name = model_name or RETRAIN_CONFIG['model_name']
+    state_path = state_path or RETRAIN_CONFIG['state_path']
+    holdout_days = holdout_days or RETRAIN_CONFIG['holdout_days']
+    window_days = window_days or RETRAIN_CONFIG['window_days']
+    extra_rounds = extra_rounds or RETRAIN_CONFIG['extra_rounds']
+
+    daily = load_daily_sales(data_path)
+    state = load_state(state_path)
+    registry = ModelRegistry(model_dir)
+    current = registry.get(model_name)
+
+    train, holdout = split_for_retrain(daily, state['trained_until'], mode, holdout_days, window_days)
+    if train.empty:
+        print(f"No new daily rows after {state['trained_until']}; nothing to retrain.")
+        return {'promoted': False, 'reason': 'no new data'}
+    if holdout.empty:
+        print("Holdout window is empty; refusing to retrain without validation.")
+        return {'promoted': False, 'reason': 'empty holdout'}
+
+    print(f"Retraining ({mode}) on {len(train):,} daily rows, validating on {len(holdout):,} rows")
+    candidate = fit_candidate(current, train, mode, extra_rounds)
+
+    current_metrics = evaluate(current, holdout)
+    candidate_metrics = evaluate(candidate, holdout)
+    print(f"Current model:   MAE={current_metrics['MAE']:,.2f} RMSE={current_metrics['RMSE']:,.2f}")
+    print(f"Candidate model: MAE={candidate_metrics['MAE']:,.2f} RMSE={candidate_metrics['RMSE']:,.2f}")
+
+    # Only promote when neither metric regresses on the holdout
+    promoted = (candidate_metrics['MAE'] <= current_metrics['MAE'] and
+                candidate_metrics['RMSE'] <= current_metrics['RMSE'])
+
+    result = {
+        'mode': mode,
+        'run_at': datetime.now().isoformat(timespec='seconds'),
+        'train_rows': int(len(train)),
+        'holdout_rows': int(len(holdout)),
+        'current': current_metrics,
+        'candidate': candidate_metrics,
+        'promoted': bool(promoted and not dry_run)
+    }
+
+    if promoted and not dry_run:
+        # Previous versions stay in the registry, so a bad promotion can be rolled back
+        version = registry.register(model_name, candidate, features=FEATURES, metrics=candidate_metrics)
+        result['version'] = version
+        state['trained_until'] = train['Order Date'].max().strftime('%Y-%m-%d')
+        print(f"Candidate promoted as {model_name} v{version}")
+    elif promoted:
+        print("Candidate would be promoted (dry run, nothing written)")
+    else:
+        print("Candidate regressed on the holdout; keeping the current model")
+
+    if not dry_run:
+        state['history'].append(result)
+        save_state(state, state_path)
+
+    return result
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Retrain the XGBoost sales model on newly arrived daily data")
+    parser.add_argument('--mode', choices=['continue', 'window'], default='continue',
+                        help="continue: add boosting rounds on new rows only; window: refit on a sliding window")
+    parser.add_argument('--data', dest='data_path', help="Daily (or raw order-level) sales CSV")
+    parser.add_argument('--model', dest='model_name', help="Registered model name to update")
+    parser.add_argument('--model-dir', help="Model registry directory")
+    parser.add_argument('--state', dest='state_path', help="JSON file tracking the last trained date")
+    parser.add_argument('--holdout-days', type=int)
+    parser.add_argument('--window-days', type=int)
+    parser.add_argument('--extra-rounds', type=int)
+    parser.add_argument('--dry-run', action='store_true', help="Evaluate only, do not write anything")
+    args = parser.parse_args()
+
+    retrain(mode=args.mode, data_path=args.data_path, model_name=args.model_name,
+            model_dir=args.model_dir, state_path=args.state_path,
+            holdout_days=args.holdout_days, window_days=args.window_days,
+            extra_rounds=args.extra_rounds, dry_run=args.dry_run)
@@ -0,0 +1,242 @@
+import functools
+import hashlib
+import os
+import pickle
+import stat
+import threading
+import time
+
+from cancellation import Superseded
+from instrumentation import METRICS, Counter
+from result_cache import cache_key
+
+try:
+    import fcntl
+except ImportError:
+    # No advisory file locks (Windows): requests are only coalesced inside each process
+    fcntl = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Single-Flight Configuration
+SINGLE_FLIGHT_CONFIG = {
+    # "1" lets concurrent identical callback requests and data loads share one computation
+    'enabled': os.environ.get('DASH_SINGLE_FLIGHT', '') == '1',
+    # "1" also coalesces across worker processes on this host, through lock files
+    'shared': os.environ.get('DASH_SINGLE_FLIGHT_SHARED', '1') == '1' and fcntl is not None,
+    # Results are unpickled from here, so it must be private to the user running the workers
+    'directory': os.environ.get('DASH_SINGLE_FLIGHT_DIR', os.path.join(BASE_DIR, '..', 'cache', 'single-flight')),
+    # Longest a request waits for another's computation before running its own
+    'wait_seconds': 60.0,
+    'poll_seconds': 0.02,
+    # How long a finished result stays readable for requests that were waiting on it
+    'result_seconds': 10.0,
+    # Lock files of keys unused for this long are removed
+    'lock_seconds': 3600.0
+}
+
+FLIGHTS = Counter('dash_single_flight_total', "Computations run (leader) or shared (follower, shared)",
+                  ('callback', 'role'))
+METRICS.append(FLIGHTS)
+
+# Directories checked by private_directory(), with the outcome
+_checked_directories = {}
+
+def private_directory(directory):
+    # Creates the directory as 0700 and accepts it only if it is a real directory owned by this
+    # user that nobody else can write to; anyone who can plant a pickle there runs code here
+    if directory in _checked_directories:
+        return _checked_directories[directory]
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        info = os.lstat(directory)
+        private = (stat.S_ISDIR(info.st_mode) and info.st_uid == os.getuid() and
+                   not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH))
+    except OSError:
+        private = False
+    if not private:
+        print(f"Single-flight directory {directory} is not private to this user; "
+              f"requests are only coalesced within each worker")
+    _checked_directories[directory] = private
+    return private
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    # The first request for a key computes; identical requests arriving meanwhile wait for it.
+    # Within a process they wait on an event; other workers wait on the key's lock file and read
+    # the result the leader left next to it
+    def __init__(self, version=None, shared=True):
+        # Part of every key, so a reload never shares results computed on older data
+        self.version = version or (lambda: None)
+        # False coalesces within the process only, e.g. for results too large to pickle per call
+        self.shared = shared
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._swept = 0.0
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def run(self, name, key, compute):
+        key = (name, self.version(), key)
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            if flight.done.wait(SINGLE_FLIGHT_CONFIG['wait_seconds']):
+                if isinstance(flight.error, Superseded):
+                    # Only the leader's page moved on; this request still needs the result
+                    return compute()
+                FLIGHTS.inc((name, 'follower'))
+                if flight.error is not None:
+                    raise flight.error
+                return flight.result
+            return compute()
+
+        try:
+            if self.shared and SINGLE_FLIGHT_CONFIG['shared'] and \
+                    private_directory(SINGLE_FLIGHT_CONFIG['directory']):
+                flight.result = self._run_shared(name, key, compute)
+            else:
+                FLIGHTS.inc((name, 'leader'))
+                flight.result = compute()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            flight.done.set()
+            with self._lock:
+                self._flights.pop(key, None)
+
+    def _paths(self, key):
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        directory = SINGLE_FLIGHT_CONFIG['directory']
+        return tuple(os.path.join(directory, f"{digest}.{suffix}") for suffix in ('lock', 'pickle', 'wait'))
+
+    def _read_fresh(self, result_path, since):
+        # A result written while this request waited (or very recently) is for the same inputs
+        # and data version, so it can be shared
+        try:
+            if os.path.getmtime(result_path) < since - SINGLE_FLIGHT_CONFIG['result_seconds']:
+                return False, None
+            with open(result_path, 'rb') as f:
+                return True, pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError):
+            return False, None
+
+    def _run_shared(self, name, key, compute):
+        lock_path, result_path, wait_path = self._paths(key)
+        started = time.time()
+        with open(lock_path, 'a') as lock_file:
+            deadline = time.monotonic() + SINGLE_FLIGHT_CONFIG['wait_seconds']
+            waited = False
+            while True:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    os.utime(lock_path)
+                    break
+                except BlockingIOError:
+                    # Another worker is computing this key; the marker asks it to share the result
+                    if not waited:
+                        open(wait_path, 'a').close()
+                    waited = True
+                    if time.monotonic() > deadline:
+                        FLIGHTS.inc((name, 'leader'))
+                        return compute()
+                    time.sleep(SINGLE_FLIGHT_CONFIG['poll_seconds'])
+            try:
+                if waited:
+                    found, result = self._read_fresh(result_path, started)
+                    if found:
+                        FLIGHTS.inc((name, 'shared'))
+                        return result
+                FLIGHTS.inc((name, 'leader'))
+                result = compute()
+                # Serialized only when another worker is waiting for it
+                if os.path.exists(wait_path):
+                    self._write(result_path, result)
+                    self._remove(wait_path)
+                return result
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write(self, result_path, result):
+        try:
+            data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+        tmp_path = f"{result_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, result_path)
+        except OSError as e:
+            print(f"Could not share result: {str(e)}")
+        self._sweep()
+
+    def _sweep(self):
+        # Results nobody is waiting for any more, and locks of keys long unused. A request that
+        # opened a lock just before it was removed only computes its result without sharing
+        now = time.time()
+        if now - self._swept < SINGLE_FLIGHT_CONFIG['result_seconds']:
+            return
+        self._swept = now
+        try:
+            with os.scandir(SINGLE_FLIGHT_CONFIG['directory']) as entries:
+                for entry in entries:
+                    if entry.name.endswith(('.pickle', '.wait')):
+                        expired = entry.stat().st_mtime < now - SINGLE_FLIGHT_CONFIG['result_seconds']
+                    elif entry.name.endswith('.lock'):
+                        expired = entry.stat().st_mtime < now - SINGLE_FLIGHT_CONFIG['lock_seconds']
+                    else:
+                        continue
+                    if expired:
+                        self._remove(entry.path)
+        except OSError:
+            pass
+
+    def _remove(self, path):
+        try:
+            if path.endswith('.lock'):
+                with open(path, 'a') as lock_file:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    os.remove(path)
+            else:
+                os.remove(path)
+        except OSError:
+            pass
+
+    def wrap(self, func):
+        name = func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            return self.run(name, cache_key(name, args), lambda: func(*args))
+        return wrapper
+
+def install_single_flight(app, flights):
+    # Same hook as instrument_app; background callbacks already run one job per request
+    register_callback = app.callback
+
+    def callback(*args, **kwargs):
+        decorator = register_callback(*args, **kwargs)
+        if kwargs.get('background'):
+            return decorator
+
+        def register(func):
+            return decorator(flights.wrap(func))
+        return register
+
+    app.callback = callback
+    return app
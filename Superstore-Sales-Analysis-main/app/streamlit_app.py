@@ -1,12 +1,19 @@
 import pandas as pd
 import streamlit as st
-import joblib
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
 from streamlit.components.v1 import html
 import json
 from calendar import monthrange
+from features import get_date_features, build_date_features
+from model_registry import ModelRegistry
+from profiling import PROFILING_CONFIG, start_session_profile, finish_session_profile
+
+# Opt-in profile of the whole rerun (STREAMLIT_PROFILE=1), saved next to the dashboard's profiles;
+# kept in the session state so a rerun ended early by st.stop() is finished by the next one
+if PROFILING_CONFIG['streamlit_enabled']:
+    start_session_profile(st.session_state, 'streamlit')
 
 # Custom CSS and JavaScript with enhanced effects
 def inject_custom_style():
@@ -209,11 +216,29 @@ def inject_custom_style():
     </script>
     """)
 
+# One registry per server process; it re-reads the manifest on every rerun,
+# so a newly registered version is swapped in without restarting Streamlit
 @st.cache_resource
-def load_model():
-    return joblib.load(r"Superstore-Sales-Analysis-main\model\xgboost_model.pkl")
+def get_registry():
+    return ModelRegistry()
 
-model = load_model()
+registry = get_registry()
+model_names = registry.list_models()
+if not model_names:
+    # No manifest yet: nothing to serve until retrain.py registers a model
+    st.title("📈 Intelligent Sales Forecasting System")
+    st.info(f"No registered models found in {registry.model_dir}. Run retrain.py to register one.")
+    st.stop()
+selected_model = st.sidebar.selectbox(
+    "Model",
+    model_names,
+    index=model_names.index('xgboost') if 'xgboost' in model_names else 0,
+    key="model_select"
+)
+model, model_info = registry.get_with_info(selected_model)
+st.sidebar.caption(f"Version {model_info['version']} | trained {model_info['created']}")
+for metric, value in model_info['metrics'].items():
+    st.sidebar.metric(metric, f"{value:,.2f}")
 
 inject_custom_style()
 st.title("📈 Intelligent Sales Forecasting System")
@@ -260,20 +285,9 @@ with col1:
             st.session_state['predict'] = True
         st.markdown("""</div>""", unsafe_allow_html=True)
 
-def get_date_features(date):
-    return {
-        'Year': date.year,
-        'Month': date.month,
-        'Quarter': (date.month - 1) // 3 + 1,
-        'Day': date.day,
-        'DayOfWeek': date.weekday(),
-        'DayOfYear': date.timetuple().tm_yday,
-        'WeekOfYear': date.isocalendar().week
-    }
-
 if 'predict' in st.session_state:
     date_features = get_date_features(date_input)
-    input_df = pd.DataFrame([date_features])
+    input_df = pd.DataFrame([date_features])[model_info['features']]
     
     try:
         prediction = model.predict(input_df)[0]
@@ -288,9 +302,8 @@ if 'predict' in st.session_state:
 
         # Generate full year data for visualizations
         months = pd.date_range(start=f"{selected_year}-01-01", end=f"{selected_year}-12-31")
-        data = [get_date_features(d) for d in months]
-        df = pd.DataFrame(data)
-        df['Prediction'] = model.predict(df)
+        df = build_date_features(months)
+        df['Prediction'] = model.predict(df[model_info['features']])
 
         # Time Series Animation
         st.markdown("### 🎥 Sales Evolution")
@@ -331,7 +344,7 @@ if 'predict' in st.session_state:
 with col2:
     st.markdown("### 🏆 Feature Impact")
     try:
-        features = ['Year', 'Month', 'Quarter', 'Day', 'DayOfWeek', 'DayOfYear', 'WeekOfYear']
+        features = model_info['features']
         importances = model.feature_importances_
         
         fig = px.bar(x=importances, y=features, orientation='h',
@@ -396,3 +409,6 @@ document.querySelectorAll('.card').forEach(card => {
 }
 </style>
 """)
+
+if PROFILING_CONFIG['streamlit_enabled']:
+    finish_session_profile(st.session_state, {'inputs': [selected_model, date_input.isoformat()]})
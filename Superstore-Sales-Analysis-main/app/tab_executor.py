@@ -0,0 +1,142 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+import dash
+from dash.exceptions import PreventUpdate
+
+from approximate import exact_only, exact_requested
+from cancellation import REQUESTS, Superseded
+from clientside import CLIENTSIDE_CONFIG, clientside_view
+from instrumentation import INSTRUMENTATION_CONFIG, METRICS, Histogram, measure, merge_context, record_error
+
+# Tab Executor Configuration
+TAB_CONFIG = {
+    # "1" computes the graphs of a tab in one request, concurrently, over one filtered view
+    'enabled': os.environ.get('DASH_TAB_EXECUTOR', '') == '1',
+    # Pool threads shared by all tabs of a worker; the request thread computes one view itself
+    'workers': int(os.environ.get('DASH_TAB_WORKERS', min(4, os.cpu_count() or 1)))
+}
+
+TAB_SECONDS = Histogram('dash_tab_seconds', "Wall time of a tab request, and the sum of its views' times "
+                        "(what computing them one after another would take)",
+                        INSTRUMENTATION_CONFIG['duration_buckets'], ('tab', 'measure'))
+VIEW_SECONDS = Histogram('dash_tab_view_seconds', "Time per view of a tab request, by stage and in total",
+                         INSTRUMENTATION_CONFIG['duration_buckets'], ('tab', 'view', 'stage'))
+METRICS.extend([TAB_SECONDS, VIEW_SECONDS])
+
+# Views of the tab request a thread is working on, for shared()
+_current = threading.local()
+_pool = None
+_pool_lock = threading.Lock()
+
+def pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=TAB_CONFIG['workers'], thread_name_prefix='tab')
+        return _pool
+
+def shared(key, compute):
+    # Within a tab request, views asking for the same key (a filtered frame) compute it once;
+    # elsewhere this is just compute()
+    run = getattr(_current, 'run', None)
+    if run is None:
+        return compute()
+    with run['lock']:
+        entry = run['shared'].setdefault(key, {'lock': threading.Lock()})
+    with entry['lock']:
+        if 'value' not in entry:
+            entry['value'] = compute()
+        return entry['value']
+
+class TabExecutor:
+    # Collects the server views of a tab and registers them as one callback, whose views run
+    # on the pool with the request's thread state: exact mode, cancellation token, shared views.
+    # error_result(exception) is what a view that fails shows, so the other views still render;
+    # without it the view is left unchanged
+    def __init__(self, app, name, error_result=None):
+        self.app = app
+        self.name = name
+        self.error_result = error_result
+        self.views = []
+
+    def view(self, outputs, inputs, clientside=None):
+        # Registers func as a regular callback (or clientside view) unless the executor takes it
+        def decorator(func):
+            if clientside is not None and CLIENTSIDE_CONFIG['enabled']:
+                return clientside_view(self.app, clientside, outputs, inputs)(func)
+            if not TAB_CONFIG['enabled']:
+                return self.app.callback(outputs, inputs)(func)
+            self.views.append((func, outputs, inputs))
+            return func
+        return decorator
+
+    def register(self):
+        if not self.views:
+            return None
+
+        outputs, inputs, keys = [], [], []
+        for _, view_outputs, view_inputs in self.views:
+            outputs.extend(view_outputs if isinstance(view_outputs, list) else [view_outputs])
+            for dependency in view_inputs:
+                if (dependency.component_id, dependency.component_property) not in keys:
+                    keys.append((dependency.component_id, dependency.component_property))
+                    inputs.append(dependency)
+        # Positions of each view's arguments among the tab callback's inputs
+        positions = [[keys.index((d.component_id, d.component_property)) for d in view_inputs]
+                     for _, _, view_inputs in self.views]
+
+        def compute(run, func, args):
+            started = time.perf_counter()
+            _current.run = run
+            try:
+                with REQUESTS.serving(run['token']), exact_only() if run['exact'] else nullcontext(), \
+                        measure() as measured:
+                    try:
+                        result = func(*args)
+                    except Superseded:
+                        raise
+                    except PreventUpdate:
+                        # Only this view has nothing to update
+                        result = dash.no_update
+                    except Exception as e:
+                        print(f"Error in {func.__name__}: {str(e)}")
+                        record_error()
+                        result = dash.no_update if self.error_result is None else self.error_result(e)
+            finally:
+                _current.run = None
+            return result, measured, time.perf_counter() - started
+
+        def update_tab(*values):
+            started = time.perf_counter()
+            run = {'lock': threading.Lock(), 'shared': {}, 'token': REQUESTS.token(), 'exact': exact_requested()}
+            calls = [(func, [values[i] for i in view_positions])
+                     for (func, _, _), view_positions in zip(self.views, positions)]
+            # The request thread takes the first view rather than waiting idle
+            futures = [pool().submit(compute, run, func, args) for func, args in calls[1:]]
+            results = [compute(run, *calls[0])] + [future.result() for future in futures]
+
+            figures = []
+            for (func, view_outputs, _), (result, measured, seconds) in zip(self.views, results):
+                merge_context(measured)
+                for stage_name, stage_seconds in measured['stages'].items():
+                    VIEW_SECONDS.observe((self.name, func.__name__, stage_name), stage_seconds)
+                VIEW_SECONDS.observe((self.name, func.__name__, 'total'), seconds)
+                if isinstance(view_outputs, list):
+                    if result is dash.no_update or not isinstance(result, (list, tuple)):
+                        # no_update or an error result stands for each of the view's outputs
+                        result = [result] * len(view_outputs)
+                    figures.extend(result)
+                else:
+                    figures.append(result)
+            TAB_SECONDS.observe((self.name, 'wall'), time.perf_counter() - started)
+            TAB_SECONDS.observe((self.name, 'serial'), sum(seconds for _, _, seconds in results))
+            if all(figure is dash.no_update for figure in figures):
+                raise PreventUpdate
+            return figures
+
+        update_tab.__name__ = f"update_{self.name}_tab"
+        return self.app.callback(outputs, inputs)(update_tab)
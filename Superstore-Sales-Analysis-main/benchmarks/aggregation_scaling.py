@@ -0,0 +1,60 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, '..', 'app'))
+
+from aggregation import AGGREGATION_CONFIG, AggregationEngine
+from synthetic_data import SYNTHETIC_CONFIG, ensure_dataset
+
+# Aggregation Scaling Configuration
+SCALING_CONFIG = {
+    'repeats': 5,
+    # The dashboard's group-bys, as (keys, spec)
+    'queries': {
+        'sales_trend': ('Month Year', {'Sales': 'sum', 'Order Date': 'first'}),
+        'subcategories': (['Category', 'Sub-Category'], {'Sales': 'sum', 'Profit': 'sum', 'Quantity': 'sum'}),
+        'geography': ('State', {'Sales': 'sum', 'Profit': 'sum', 'Order ID': 'count', 'Customer Name': 'nunique'}),
+        'shipping': (['Ship Mode', 'Category'], {'Sales': 'sum', 'Order ID': 'count'}),
+        'products': ('Product Name', {'Sales': 'sum', 'Profit': 'sum', 'Quantity': 'sum'})
+    }
+}
+
+def best_of(func, repeats):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings), statistics.median(timings)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Time the dashboard group-bys in pandas and in the "
+                                                 "parallel aggregation engine at several worker counts")
+    parser.add_argument('--size', default='1m', choices=list(SYNTHETIC_CONFIG['sizes']))
+    parser.add_argument('--workers', nargs='+', type=int, default=[1, 2, 4, 8])
+    parser.add_argument('--repeats', type=int, default=SCALING_CONFIG['repeats'])
+    args = parser.parse_args()
+
+    df = pd.read_csv(ensure_dataset(args.size))
+    df['Order Date'] = pd.to_datetime(df['Order Date'])
+    df['Month Year'] = df['Order Date'].dt.strftime('%Y-%m')
+    print(f"{len(df):,} rows, {os.cpu_count()} CPUs")
+
+    AGGREGATION_CONFIG['enabled'] = True
+    for name, (keys, spec) in SCALING_CONFIG['queries'].items():
+        pandas_time, _ = best_of(lambda: df.groupby(keys).agg(spec).reset_index(), args.repeats)
+        line = f"{name:14s} pandas {pandas_time * 1000:7.1f} ms"
+        for workers in args.workers:
+            AGGREGATION_CONFIG['workers'] = workers
+            # A fresh engine per worker count; key codes are built by the untimed first call
+            engine = AggregationEngine(lambda: df)
+            engine.aggregate(df, keys, spec)
+            engine_time, _ = best_of(lambda: engine.aggregate(df, keys, spec), args.repeats)
+            line += f" | {workers}w {engine_time * 1000:7.1f} ms"
+        print(line)
@@ -0,0 +1,192 @@
+import argparse
+import inspect
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import warnings
+from datetime import datetime
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, '..', 'app'))
+
+import dashboard
+from partitioned_store import ingest, read_manifest
+from query_backend import QUERY_CONFIG, PandasBackend, PartitionedBackend, SQLiteBackend
+from synthetic_data import SYNTHETIC_CONFIG, ensure_dataset
+
+# Benchmark Configuration
+BENCH_CONFIG = {
+    'results_path': os.path.join(BASE_DIR, 'results', 'latest.json'),
+    'baseline_path': os.path.join(BASE_DIR, 'baseline.json'),
+    'repeats': 3,
+    # A timing regresses when it is this much slower than the baseline...
+    'threshold': 1.25,
+    # ...and the absolute difference is larger than this (filters out timer noise)
+    'min_delta_seconds': 0.01,
+    # Callbacks that are not plain filter -> figure functions
+    'skip': {'update_forecast'}
+}
+
+FILTER_ARGS = ('start_date', 'end_date', 'regions', 'categories')
+
+def build_scenarios(df):
+    # Fixed filter matrix, derived from the data so every size gets comparable views
+    start, end = df['Order Date'].min(), df['Order Date'].max()
+    last_month = end.to_period('M')
+    last_quarter = end.to_period('Q')
+    regions = sorted(df['Region'].unique())
+    categories = sorted(df['Category'].unique())
+    fmt = lambda d: d.strftime('%Y-%m-%d')
+    return {
+        'full_range': (fmt(start), fmt(end), None, None),
+        'single_month': (fmt(last_month.start_time), fmt(last_month.end_time), None, None),
+        'multi_region': (fmt(start), fmt(end), regions[:2], None),
+        'single_category': (fmt(start), fmt(end), None, categories[:1]),
+        'quarter_region_category': (fmt(last_quarter.start_time), fmt(last_quarter.end_time),
+                                    regions[:1], categories[:2]),
+        'no_dates': (None, None, regions, categories)
+    }
+
+def discover_callbacks():
+    callbacks = {}
+    for name, func in inspect.getmembers(dashboard, inspect.isfunction):
+        if not name.startswith('update_') or name in BENCH_CONFIG['skip']:
+            continue
+        params = list(inspect.signature(func).parameters)
+        if params and set(params) <= set(FILTER_ARGS):
+            callbacks[name] = (func, params)
+    return callbacks
+
+def time_call(func, args, repeats):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - started)
+    return {'median': statistics.median(timings), 'min': min(timings)}
+
+def time_load(repeats):
+    # Timed like the callbacks, so its min and median come from separate runs
+    timings = []
+    df = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        df = dashboard.load_data()
+        timings.append(time.perf_counter() - started)
+        if df is None:
+            return None, None
+    return df, {'median': statistics.median(timings), 'min': min(timings)}
+
+def run(sizes, repeats, backend):
+    callbacks = discover_callbacks()
+    results = {}
+    for size_name in sizes:
+        path = ensure_dataset(size_name)
+        dashboard.DATA_CONFIG['file_path'] = path
+
+        df, load_timing = time_load(repeats)
+        if df is None:
+            raise RuntimeError(f"load_data() failed for {path}")
+        dashboard.set_data(df)
+        if backend == 'sqlite':
+            # One database per synthetic size, built outside the timings
+            dashboard.query_backend = SQLiteBackend(path, os.path.splitext(path)[0] + '.sqlite')
+            dashboard.query_backend.ensure_current()
+        elif backend == 'parquet':
+            root = os.path.splitext(path)[0] + '_partitions'
+            if read_manifest(root) is None:
+                ingest(path, root)
+            dashboard.query_backend = PartitionedBackend(root)
+        else:
+            dashboard.query_backend = PandasBackend(dashboard.filter_data)
+        print(f"[{size_name}] load_data: {load_timing['median']:.3f}s ({len(df):,} rows)")
+
+        size_results = {'rows': len(df), 'load_data': load_timing,
+                        'callbacks': {}}
+        for scenario, values in build_scenarios(df).items():
+            filters = dict(zip(FILTER_ARGS, values))
+            for name, (func, params) in callbacks.items():
+                timing = time_call(func, [filters[p] for p in params], repeats)
+                size_results['callbacks'].setdefault(name, {})[scenario] = timing
+                print(f"[{size_name}] {name:32s} {scenario:24s} {timing['median'] * 1000:9.1f} ms")
+        results[size_name] = size_results
+    return results
+
+def flatten(results):
+    # Regressions are judged on the best run, which is far less noisy than the median
+    flat = {}
+    for size_name, size_results in results.items():
+        flat[f"{size_name}/load_data"] = size_results['load_data']['min']
+        for name, scenarios in size_results['callbacks'].items():
+            for scenario, timing in scenarios.items():
+                flat[f"{size_name}/{name}/{scenario}"] = timing['min']
+    return flat
+
+def compare(results, baseline, threshold, min_delta):
+    regressions = []
+    current = flatten(results)
+    for key, base in flatten(baseline['results']).items():
+        now = current.get(key)
+        if now is None:
+            continue
+        if now > base * threshold and now - base > min_delta:
+            regressions.append((key, base, now))
+    return regressions
+
+def save_json(data, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark load_data() and the dashboard callbacks")
+    parser.add_argument('--sizes', nargs='+', default=['10k', '1m'],
+                        choices=list(SYNTHETIC_CONFIG['sizes']))
+    parser.add_argument('--repeats', type=int, default=BENCH_CONFIG['repeats'])
+    parser.add_argument('--backend', choices=['pandas', 'sqlite', 'parquet'], default=QUERY_CONFIG['backend'])
+    parser.add_argument('--output', default=BENCH_CONFIG['results_path'])
+    parser.add_argument('--baseline', default=BENCH_CONFIG['baseline_path'])
+    parser.add_argument('--threshold', type=float, default=BENCH_CONFIG['threshold'])
+    parser.add_argument('--save-baseline', '--update-baseline', action='store_true',
+                        help="Store this run as the new baseline instead of comparing")
+    args = parser.parse_args()
+
+    # Plotly/pandas deprecation chatter would drown the timing table
+    warnings.simplefilter('ignore', FutureWarning)
+    results = run(args.sizes, args.repeats, args.backend)
+    report = {
+        'meta': {
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'repeats': args.repeats,
+            'backend': args.backend
+        },
+        'results': results
+    }
+    save_json(report, args.output)
+    print(f"Results written to {args.output}")
+
+    if args.save_baseline:
+        save_json(report, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, BENCH_CONFIG['min_delta_seconds'])
+        for key, base, now in regressions:
+            print(f"REGRESSION {key}: {base * 1000:.1f} ms -> {now * 1000:.1f} ms")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.2f}x of {args.baseline}")
+    else:
+        # A missing baseline must not pass as "no regressions"
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        sys.exit(2)
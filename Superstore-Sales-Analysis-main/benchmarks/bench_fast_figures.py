@@ -0,0 +1,49 @@
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+import warnings
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, '..', 'app'))
+sys.path.insert(0, os.path.join(BASE_DIR, '..', 'tests'))
+
+from synthetic_data import SYNTHETIC_CONFIG, ensure_dataset
+# The views are defined next to the test that checks them against Plotly
+from test_fast_figures import VIEWS, load_orders, prepare
+
+# Fast Figure Benchmark Configuration
+BENCH_CONFIG = {
+    'repeats': 20
+}
+
+def measure(build, repeats):
+    build()
+    started = time.perf_counter()
+    for _ in range(repeats):
+        build()
+    seconds = (time.perf_counter() - started) / repeats
+    tracemalloc.start()
+    build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Time the fast figure builders against Plotly and "
+                                                 "report peak allocations")
+    parser.add_argument('--size', default='10k', choices=list(SYNTHETIC_CONFIG['sizes']))
+    parser.add_argument('--repeats', type=int, default=BENCH_CONFIG['repeats'])
+    args = parser.parse_args()
+    warnings.simplefilter('ignore', FutureWarning)
+
+    frames = prepare(load_orders(ensure_dataset(args.size)))
+
+    print(f"{'view':18s} {'plotly ms':>10s} {'fast ms':>8s} {'plotly KiB':>11s} {'fast KiB':>9s}")
+    for name, frame_name, plotly_figure, fast_figure in VIEWS:
+        frame = frames[frame_name]
+        plotly_time, plotly_peak = measure(lambda: plotly_figure(frame), args.repeats)
+        fast_time, fast_peak = measure(lambda: fast_figure(frame), args.repeats)
+        print(f"{name:18s} {plotly_time * 1000:10.2f} {fast_time * 1000:8.2f} "
+              f"{plotly_peak / 1024:11.0f} {fast_peak / 1024:9.0f}")
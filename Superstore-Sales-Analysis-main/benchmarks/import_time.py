@@ -0,0 +1,127 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from datetime import datetime
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.join(BASE_DIR, '..', 'app')
+
+# Import-Time Report Configuration
+IMPORT_CONFIG = {
+    'module': 'dashboard',
+    'repeats': 5,
+    'top': 15,
+    'results_path': os.path.join(BASE_DIR, 'results', 'import_time.json'),
+    'baseline_path': os.path.join(BASE_DIR, 'import_baseline.json'),
+    # Fails when a cold import is this much slower than the baseline...
+    'threshold': 1.25,
+    # ...or slower than this regardless of any baseline
+    'budget_seconds': {'fast_boot': 1.5, 'default': 4.0}
+}
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+def measure(module, fast_boot):
+    # A fresh interpreter per run, so nothing is already in sys.modules
+    env = dict(os.environ, DASH_FAST_BOOT='1' if fast_boot else '0')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+                            cwd=APP_DIR, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    modules = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append({'module': name, 'self': int(self_us) / 1e6,
+                            'cumulative': int(cumulative_us) / 1e6,
+                            'depth': (len(indent) - 1) // 2})
+    # The total is the main thread's wall time; with fast boot the loader thread's imports are
+    # interleaved into the same log, so the per-module rows are only indicative in that mode
+    total = next(m['cumulative'] for m in reversed(modules) if m['module'] == module)
+    return total, modules
+
+def report(module, fast_boot, repeats, top):
+    runs = [measure(module, fast_boot) for _ in range(repeats)]
+    total, modules = min(runs, key=lambda run: run[0])
+    # Top-level imports show which dependency is responsible; self time shows where it is spent
+    direct = sorted((m for m in modules if m['depth'] == 1), key=lambda m: m['cumulative'], reverse=True)
+    by_self = sorted(modules, key=lambda m: m['self'], reverse=True)
+    return {
+        'total_seconds': total,
+        'runs_seconds': sorted(run[0] for run in runs),
+        'modules_imported': len(modules),
+        'top_direct': [{'module': m['module'], 'cumulative': m['cumulative']} for m in direct[:top]],
+        'top_self': [{'module': m['module'], 'self': m['self']} for m in by_self[:top]]
+    }
+
+def print_report(name, result):
+    print(f"\n[{name}] import {IMPORT_CONFIG['module']}: {result['total_seconds'] * 1000:.0f} ms "
+          f"({result['modules_imported']} modules)")
+    print(f"  {'direct import':40s} {'cumulative ms':>14s}")
+    for m in result['top_direct']:
+        print(f"  {m['module']:40s} {m['cumulative'] * 1000:14.1f}")
+    print(f"  {'module':40s} {'self ms':>14s}")
+    for m in result['top_self']:
+        print(f"  {m['module']:40s} {m['self'] * 1000:14.1f}")
+
+def check(results, baseline, threshold):
+    failures = []
+    for name, result in results.items():
+        total = result['total_seconds']
+        budget = IMPORT_CONFIG['budget_seconds'][name]
+        if total > budget:
+            failures.append(f"{name}: {total:.3f}s exceeds the {budget:.1f}s budget")
+        base = (baseline or {}).get('results', {}).get(name)
+        if base and total > base['total_seconds'] * threshold:
+            failures.append(f"{name}: {base['total_seconds']:.3f}s -> {total:.3f}s")
+    return failures
+
+def save_json(data, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Report and guard the dashboard's cold import time")
+    parser.add_argument('--repeats', type=int, default=IMPORT_CONFIG['repeats'])
+    parser.add_argument('--top', type=int, default=IMPORT_CONFIG['top'])
+    parser.add_argument('--modes', nargs='+', default=['fast_boot', 'default'],
+                        choices=list(IMPORT_CONFIG['budget_seconds']))
+    parser.add_argument('--output', default=IMPORT_CONFIG['results_path'])
+    parser.add_argument('--baseline', default=IMPORT_CONFIG['baseline_path'])
+    parser.add_argument('--threshold', type=float, default=IMPORT_CONFIG['threshold'])
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="Store this run as the new baseline instead of comparing")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.modes:
+        results[name] = report(IMPORT_CONFIG['module'], name == 'fast_boot', args.repeats, args.top)
+        print_report(name, results[name])
+
+    data = {'meta': {'time': datetime.now().isoformat(timespec='seconds'),
+                     'python': sys.version.split()[0], 'repeats': args.repeats},
+            'results': results}
+    save_json(data, args.output)
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        save_json(data, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        sys.exit(0)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    failures = check(results, baseline, args.threshold)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    if failures:
+        sys.exit(1)
+    print("Import time within budget" + (f" and {args.threshold:.2f}x of {args.baseline}" if baseline else ""))
@@ -0,0 +1,282 @@
+import argparse
+import json
+import os
+import random
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import requests
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.join(BASE_DIR, '..', 'app')
+
+# Load Test Configuration
+LOAD_TEST_CONFIG = {
+    'host': '127.0.0.1',
+    'port': 8099,
+    'workers': 4,
+    'users': 10,
+    'duration_seconds': 60,
+    # Pause between a user's actions; 0 turns every user into a closed-loop stress client
+    'think_time_seconds': (0.5, 2.0),
+    # A date-range drag fires this many consecutive end_date updates
+    'drag_steps': 5,
+    'drag_step_seconds': 0.1,
+    'startup_timeout_seconds': 120,
+    'results_path': os.path.join(BASE_DIR, 'results', 'load_test.json')
+}
+
+def start_server(port, workers):
+    # gunicorn is how the dashboard is deployed; fall back to the built-in server without it
+    if shutil.which('gunicorn'):
+        cmd = ['gunicorn', 'dashboard:server', '--workers', str(workers), '--threads', '4',
+               '--bind', f"127.0.0.1:{port}", '--timeout', '300', '--log-level', 'warning']
+    else:
+        print("gunicorn not found; starting the single-process development server")
+        cmd = [sys.executable, 'dashboard.py']
+    env = dict(os.environ, PORT=str(port))
+    return subprocess.Popen(cmd, cwd=APP_DIR, env=env, start_new_session=True)
+
+def wait_for_server(base_url, timeout):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(f"{base_url}/_dash-layout", timeout=5).ok:
+                return
+        except requests.ConnectionError:
+            pass
+        time.sleep(1)
+    raise RuntimeError(f"Server at {base_url} did not come up within {timeout}s")
+
+def stop_server(process):
+    if process is None:
+        return
+    os.killpg(process.pid, signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+
+def collect_props(node, props):
+    # Walk the serialized layout and record every component's initial property values
+    if isinstance(node, list):
+        for child in node:
+            collect_props(child, props)
+    elif isinstance(node, dict) and 'props' in node:
+        component_props = node['props']
+        if 'id' in component_props and isinstance(component_props['id'], str):
+            props[component_props['id']] = {k: v for k, v in component_props.items() if k != 'children'}
+        collect_props(component_props.get('children'), props)
+    return props
+
+def parse_outputs(output):
+    # "a.prop" for single outputs, "..a.prop...b.prop.." for multi-output callbacks
+    if output.startswith('..'):
+        parts = output[2:-2].split('...')
+    else:
+        parts = [output]
+    return [{'id': part.rsplit('.', 1)[0], 'property': part.rsplit('.', 1)[1]} for part in parts]
+
+class DashSession:
+    def __init__(self, base_url, callbacks, props, stats):
+        self.base_url = base_url
+        self.callbacks = callbacks
+        self.props = json.loads(json.dumps(props))
+        self.stats = stats
+        self.http = requests.Session()
+        self.pool = ThreadPoolExecutor(max_workers=4)
+
+    def payload(self, callback, changed):
+        outputs = parse_outputs(callback['output'])
+        value_of = lambda dep: dict(dep, value=self.props.get(dep['id'], {}).get(dep['property']))
+        return {
+            'output': callback['output'],
+            'outputs': outputs if len(outputs) > 1 else outputs[0],
+            'inputs': [value_of(dep) for dep in callback['inputs']],
+            'state': [value_of(dep) for dep in callback['state']],
+            'changedPropIds': changed
+        }
+
+    def fire(self, callback, changed):
+        started = time.perf_counter()
+        try:
+            response = self.http.post(f"{self.base_url}/_dash-update-component",
+                                      json=self.payload(callback, changed), timeout=300)
+            ok = response.status_code in (200, 204)
+        except requests.RequestException:
+            ok = False
+        self.stats.record(callback['output'], time.perf_counter() - started, ok)
+
+    def set_props(self, action, changes):
+        # Like the Dash renderer: update the props, then fire every dependent callback in parallel
+        changed = []
+        for (component_id, prop), value in changes.items():
+            self.props.setdefault(component_id, {})[prop] = value
+            changed.append(f"{component_id}.{prop}")
+        affected = [cb for cb in self.callbacks
+                    if any(f"{dep['id']}.{dep['property']}" in changed for dep in cb['inputs'])]
+        started = time.perf_counter()
+        list(self.pool.map(lambda cb: self.fire(cb, changed), affected))
+        self.stats.record_action(action, time.perf_counter() - started)
+
+    def initial_load(self):
+        started = time.perf_counter()
+        list(self.pool.map(lambda cb: self.fire(cb, []), self.callbacks))
+        self.stats.record_action('initial_load', time.perf_counter() - started)
+
+class LoadStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.actions = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, output, seconds, ok):
+        with self.lock:
+            self.latencies[output].append(seconds)
+            if not ok:
+                self.errors[output] += 1
+
+    def record_action(self, action, seconds):
+        with self.lock:
+            self.actions[action].append(seconds)
+
+    def summary(self, elapsed):
+        def percentiles(values):
+            ms = np.array(values) * 1000
+            return {'count': len(values), 'p50_ms': round(float(np.percentile(ms, 50)), 1),
+                    'p95_ms': round(float(np.percentile(ms, 95)), 1),
+                    'p99_ms': round(float(np.percentile(ms, 99)), 1)}
+        total = sum(len(v) for v in self.latencies.values())
+        return {
+            'elapsed_seconds': round(elapsed, 1),
+            'requests': total,
+            'throughput_rps': round(total / elapsed, 2) if elapsed else 0.0,
+            'errors': sum(self.errors.values()),
+            'callbacks': {output: dict(percentiles(values), errors=self.errors[output])
+                          for output, values in sorted(self.latencies.items())},
+            'actions': {action: percentiles(values) for action, values in sorted(self.actions.items())}
+        }
+
+def run_user(session, deadline, config, rng):
+    date_props = session.props['date-range']
+    min_date = pd.Timestamp(date_props['start_date'])
+    max_date = pd.Timestamp(date_props['end_date'])
+    regions = [o['value'] for o in session.props['region-filter']['options']]
+    categories = [o['value'] for o in session.props['category-filter']['options']]
+    tabs = [child['props'].get('value') or f"tab-{i + 1}"
+            for i, child in enumerate(session.props.get('main-tabs', {}).get('_children', []))]
+
+    session.initial_load()
+    while time.time() < deadline:
+        action = rng.choice(['date_drag', 'date_drag', 'toggle_region', 'toggle_category', 'tab_switch'])
+        if action == 'date_drag':
+            # Dragging the end of the range emits a burst of small steps
+            start = min_date + pd.Timedelta(days=rng.randint(0, 900))
+            end = start + pd.Timedelta(days=rng.randint(30, 400))
+            session.set_props(action, {('date-range', 'start_date'): start.strftime('%Y-%m-%d')})
+            for _ in range(config['drag_steps']):
+                end = min(end + pd.Timedelta(days=rng.randint(5, 30)), max_date)
+                session.set_props(action, {('date-range', 'end_date'): end.strftime('%Y-%m-%d')})
+                time.sleep(config['drag_step_seconds'])
+        elif action == 'toggle_region':
+            selected = set(session.props['region-filter'].get('value') or [])
+            selected ^= {rng.choice(regions)}
+            session.set_props(action, {('region-filter', 'value'): sorted(selected) or None})
+        elif action == 'toggle_category':
+            selected = set(session.props['category-filter'].get('value') or [])
+            selected ^= {rng.choice(categories)}
+            session.set_props(action, {('category-filter', 'value'): sorted(selected) or None})
+        elif tabs:
+            session.set_props(action, {('main-tabs', 'value'): rng.choice(tabs)})
+
+        low, high = config['think_time_seconds']
+        if high > 0:
+            time.sleep(rng.uniform(low, high))
+
+def run_load_test(base_url, config):
+    dependencies = requests.get(f"{base_url}/_dash-dependencies", timeout=30).json()
+    # Clientside and background callbacks never hit /_dash-update-component synchronously
+    callbacks = [cb for cb in dependencies if not cb.get('clientside_function') and not cb.get('long')]
+    layout = requests.get(f"{base_url}/_dash-layout", timeout=30).json()
+    props = collect_props(layout, {})
+    tabs_node = find_component(layout, 'main-tabs')
+    if tabs_node is not None:
+        props['main-tabs']['_children'] = tabs_node['props'].get('children', [])
+
+    stats = LoadStats()
+    deadline = time.time() + config['duration_seconds']
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=config['users']) as users:
+        sessions = [users.submit(run_user, DashSession(base_url, callbacks, props, stats),
+                                 deadline, config, random.Random(i))
+                    for i in range(config['users'])]
+        for session in sessions:
+            # Surface a crashed simulated user instead of silently under-reporting load
+            session.result()
+    return stats.summary(time.perf_counter() - started)
+
+def find_component(node, component_id):
+    if isinstance(node, list):
+        for child in node:
+            found = find_component(child, component_id)
+            if found is not None:
+                return found
+    elif isinstance(node, dict) and 'props' in node:
+        if node['props'].get('id') == component_id:
+            return node
+        return find_component(node['props'].get('children'), component_id)
+    return None
+
+def print_summary(summary):
+    print(f"\n{summary['requests']:,} requests in {summary['elapsed_seconds']}s "
+          f"({summary['throughput_rps']} req/s, {summary['errors']} errors)")
+    print(f"{'callback':70s} {'count':>7s} {'p50':>9s} {'p95':>9s} {'p99':>9s}")
+    for output, s in summary['callbacks'].items():
+        print(f"{output[:70]:70s} {s['count']:7d} {s['p50_ms']:9.1f} {s['p95_ms']:9.1f} {s['p99_ms']:9.1f}")
+    print(f"\n{'action':70s} {'count':>7s} {'p50':>9s} {'p95':>9s} {'p99':>9s}")
+    for action, s in summary['actions'].items():
+        print(f"{action:70s} {s['count']:7d} {s['p50_ms']:9.1f} {s['p95_ms']:9.1f} {s['p99_ms']:9.1f}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Replay concurrent analyst sessions against the dashboard")
+    parser.add_argument('--url', help="Use an already running server instead of starting one")
+    parser.add_argument('--port', type=int, default=LOAD_TEST_CONFIG['port'])
+    parser.add_argument('--workers', type=int, default=LOAD_TEST_CONFIG['workers'],
+                        help="gunicorn worker processes for the started server")
+    parser.add_argument('--users', type=int, default=LOAD_TEST_CONFIG['users'])
+    parser.add_argument('--duration', type=int, default=LOAD_TEST_CONFIG['duration_seconds'])
+    parser.add_argument('--think-time', type=float, nargs=2, metavar=('MIN', 'MAX'),
+                        default=LOAD_TEST_CONFIG['think_time_seconds'])
+    parser.add_argument('--output', default=LOAD_TEST_CONFIG['results_path'])
+    args = parser.parse_args()
+
+    config = dict(LOAD_TEST_CONFIG, users=args.users, duration_seconds=args.duration,
+                  think_time_seconds=tuple(args.think_time))
+    process = None
+    base_url = args.url
+    try:
+        if base_url is None:
+            base_url = f"http://{LOAD_TEST_CONFIG['host']}:{args.port}"
+            process = start_server(args.port, args.workers)
+            wait_for_server(base_url, LOAD_TEST_CONFIG['startup_timeout_seconds'])
+        print(f"Running {config['users']} users against {base_url} for {config['duration_seconds']}s")
+        summary = run_load_test(base_url, config)
+    finally:
+        stop_server(process)
+
+    summary['config'] = {'url': base_url, 'users': config['users'], 'workers': args.workers,
+                         'think_time_seconds': list(config['think_time_seconds'])}
+    print_summary(summary)
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(summary, f, indent=2)
+    print(f"\nResults written to {args.output}")
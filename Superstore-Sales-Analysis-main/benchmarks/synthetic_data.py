@@ -0,0 +1,91 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Synthetic Data Configuration
+SYNTHETIC_CONFIG = {
+    'source_path': os.path.join(BASE_DIR, '..', 'dataset', 'cleaned superstore dataset.csv'),
+    'output_dir': os.path.join(BASE_DIR, 'data'),
+    'sizes': {'10k': 10_000, '1m': 1_000_000, '10m': 10_000_000},
+    # Per-line noise applied to Sales/Profit so rows are not exact copies of the source
+    'amount_noise': 0.15,
+    'seed': 42
+}
+
+ORDER_COLUMNS = ['Order Date', 'Ship Mode', 'Customer ID', 'Customer Name', 'Segment', 'Country',
+                 'City', 'State', 'Postal Code', 'Region']
+LINE_COLUMNS = ['Product ID', 'Category', 'Sub-Category', 'Product Name', 'Sales', 'Quantity',
+                'Discount', 'Profit']
+
+def load_templates(source_path):
+    source = pd.read_csv(source_path)
+    source['Order Date'] = pd.to_datetime(source['Order Date'])
+    source['Ship Date'] = pd.to_datetime(source['Ship Date'])
+
+    # Order-level attributes (date, customer, location, ship mode) are sampled together so the
+    # joint distribution and the date skew of the real data are preserved
+    orders = source.drop_duplicates('Order ID').copy()
+    orders['Ship Days'] = (orders['Ship Date'] - orders['Order Date']).dt.days
+    orders['Lines'] = orders['Order ID'].map(source.groupby('Order ID').size())
+    orders['Prefix'] = orders['Order ID'].str[:2]
+    lines = source[LINE_COLUMNS].reset_index(drop=True)
+    return source.columns.tolist(), orders.reset_index(drop=True), lines
+
+def generate(n_rows, source_path=None, seed=None):
+    columns, orders, lines = load_templates(source_path or SYNTHETIC_CONFIG['source_path'])
+    rng = np.random.default_rng(SYNTHETIC_CONFIG['seed'] if seed is None else seed)
+
+    # Draw whole orders until there are enough line items, then trim to the exact size
+    expected_orders = int(n_rows / orders['Lines'].mean() * 1.1) + 10
+    order_idx = rng.integers(0, len(orders), size=expected_orders)
+    lines_per_order = orders['Lines'].values[order_idx]
+    n_orders = int(np.searchsorted(np.cumsum(lines_per_order), n_rows)) + 1
+    order_idx = order_idx[:n_orders]
+    row_order = np.repeat(np.arange(n_orders), lines_per_order[:n_orders])[:n_rows]
+    row_template = order_idx[row_order]
+
+    data = {}
+    for col in ORDER_COLUMNS:
+        data[col] = orders[col].values[row_template]
+
+    order_dates = pd.DatetimeIndex(data['Order Date'])
+    ship_days = orders['Ship Days'].values[row_template]
+    data['Ship Date'] = (order_dates + pd.to_timedelta(ship_days, unit='D')).strftime('%Y-%m-%d')
+    data['Order ID'] = (pd.Series(orders['Prefix'].values[row_template]) + '-' +
+                        pd.Series(order_dates.year.astype(str)) + '-' +
+                        pd.Series(row_order + 100000).astype(str)).values
+    data['Order Date'] = order_dates.strftime('%Y-%m-%d')
+
+    line_idx = rng.integers(0, len(lines), size=n_rows)
+    for col in LINE_COLUMNS:
+        data[col] = lines[col].values[line_idx]
+    scale = rng.lognormal(0.0, SYNTHETIC_CONFIG['amount_noise'], size=n_rows)
+    data['Sales'] = np.round(data['Sales'] * scale, 4)
+    data['Profit'] = np.round(data['Profit'] * scale, 4)
+    data['Profit Margin %'] = np.round(data['Profit'] / data['Sales'] * 100, 2)
+
+    return pd.DataFrame(data)[columns]
+
+def synthetic_path(size_name):
+    return os.path.join(SYNTHETIC_CONFIG['output_dir'], f"superstore_{size_name}.csv")
+
+def ensure_dataset(size_name):
+    # Generated files are reused across runs; delete them to regenerate
+    path = synthetic_path(size_name)
+    if not os.path.exists(path):
+        os.makedirs(SYNTHETIC_CONFIG['output_dir'], exist_ok=True)
+        print(f"Generating {size_name} synthetic rows at {path}")
+        generate(SYNTHETIC_CONFIG['sizes'][size_name]).to_csv(path, index=False)
+    return path
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate schema-faithful synthetic Superstore orders")
+    parser.add_argument('sizes', nargs='*', default=['10k', '1m'],
+                        choices=list(SYNTHETIC_CONFIG['sizes']))
+    args = parser.parse_args()
+    for size_name in args.sizes:
+        print(ensure_dataset(size_name))
@@ -0,0 +1,87 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, '..', 'app'))
+
+from aggregation import AGGREGATION_CONFIG, AggregationEngine
+
+# The dashboard's group-bys, plus the functions only some views use, as (keys, spec)
+QUERIES = {
+    'sales_trend': ('Month Year', {'Sales': 'sum', 'Order Date': 'first'}),
+    'subcategories': (['Category', 'Sub-Category'], {'Sales': 'sum', 'Profit': 'sum', 'Quantity': 'sum'}),
+    'geography': ('State', {'Sales': 'sum', 'Profit': 'sum', 'Order ID': 'count', 'Customer Name': 'nunique'}),
+    'shipping': (['Ship Mode', 'Category'], {'Sales': 'sum', 'Order ID': 'count'}),
+    'discounts': ('Region', {'Discount': ['mean', 'min', 'max'], 'Quantity': 'sum'})
+}
+
+def make_orders(n_rows=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 1000, n_rows), unit='D')
+    df = pd.DataFrame({
+        'Order ID': [f"O-{i}" for i in rng.integers(0, n_rows // 3, n_rows)],
+        'Order Date': dates,
+        'Month Year': dates.strftime('%Y-%m'),
+        'Region': rng.choice(['East', 'West', 'Central', 'South'], n_rows),
+        'State': rng.choice([f"State {i}" for i in range(40)], n_rows),
+        'Category': rng.choice(['Furniture', 'Technology', 'Office Supplies'], n_rows),
+        'Sub-Category': rng.choice([f"Sub {i}" for i in range(17)], n_rows),
+        'Ship Mode': rng.choice(['First Class', 'Second Class', 'Standard Class', 'Same Day'], n_rows),
+        'Customer Name': rng.choice([f"Customer {i}" for i in range(800)], n_rows).astype(object),
+        'Sales': rng.gamma(2.0, 100.0, n_rows),
+        'Profit': rng.normal(20.0, 50.0, n_rows),
+        'Quantity': rng.integers(1, 10, n_rows),
+        'Discount': rng.choice([0.0, 0.1, 0.2, np.nan], n_rows)
+    })
+    # Missing keys and values are dropped or skipped as groupby does
+    df.loc[df.index % 97 == 0, 'State'] = None
+    df.loc[df.index % 89 == 0, 'Customer Name'] = None
+    return df
+
+@pytest.fixture
+def engine_config(monkeypatch):
+    # Small frames split into several partitions on a few threads
+    monkeypatch.setitem(AGGREGATION_CONFIG, 'enabled', True)
+    monkeypatch.setitem(AGGREGATION_CONFIG, 'min_rows', 0)
+    monkeypatch.setitem(AGGREGATION_CONFIG, 'min_partition_rows', 1_000)
+    monkeypatch.setitem(AGGREGATION_CONFIG, 'workers', 4)
+
+def assert_matches_pandas(result, frame, keys, spec):
+    expected = frame.groupby(keys).agg(spec).reset_index()
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected, check_dtype=False,
+                                  check_exact=False, rtol=1e-9)
+
+@pytest.mark.parametrize('keys, spec', QUERIES.values(), ids=list(QUERIES))
+def test_full_frame_matches_pandas(engine_config, keys, spec):
+    df = make_orders()
+    engine = AggregationEngine(lambda: df)
+    assert engine.plan(df, [keys] if isinstance(keys, str) else keys, spec, df) is not None
+    assert_matches_pandas(engine.aggregate(df, keys, spec), df, keys, spec)
+
+@pytest.mark.parametrize('keys, spec', QUERIES.values(), ids=list(QUERIES))
+def test_filtered_rows_match_pandas(engine_config, keys, spec):
+    df = make_orders()
+    engine = AggregationEngine(lambda: df)
+    filtered = engine.track(df[(df['Region'] != 'East') & (df['Sales'] > 50)], df)
+    assert_matches_pandas(engine.aggregate(filtered, keys, spec), filtered, keys, spec)
+
+def test_rows_of_a_replaced_frame_fall_back_to_pandas(engine_config):
+    # A refresh swaps the frame between filtering and aggregating
+    old, new = make_orders(seed=1), make_orders(seed=2)
+    current = {'df': old}
+    engine = AggregationEngine(lambda: current['df'])
+    filtered = engine.track(old[old['Region'] == 'West'], old)
+    current['df'] = new
+    keys, spec = QUERIES['subcategories']
+    assert engine.plan(filtered, keys, spec, filtered) is None
+    assert_matches_pandas(engine.aggregate(filtered, keys, spec), filtered, keys, spec)
+
+def test_untracked_frames_fall_back_to_pandas(engine_config):
+    df = make_orders()
+    engine = AggregationEngine(lambda: df)
+    keys, spec = QUERIES['shipping']
+    assert engine.plan(df.iloc[:5_000], keys, spec, df.iloc[:5_000]) is None
@@ -0,0 +1,233 @@
+import json
+import math
+import os
+import sys
+import warnings
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import pytest
+from plotly.io.json import to_json_plotly
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, '..', 'app'))
+
+import fast_figures as ff
+
+# Fast Figure Test Configuration
+CHECK_CONFIG = {
+    'source_path': os.path.join(BASE_DIR, '..', 'dataset', 'cleaned superstore dataset.csv'),
+    # Sums may be added up in a different order than Plotly Express does
+    'rel_tolerance': 1e-9
+}
+
+def normalize(fig):
+    # Both kinds of figure as the JSON Dash sends to the browser
+    return json.loads(to_json_plotly(fig))
+
+def difference(a, b, path='figure'):
+    # First place where two normalized figures differ, or None
+    if isinstance(a, dict) and isinstance(b, dict):
+        for key in sorted(set(a) | set(b)):
+            if key not in a or key not in b:
+                return f"{path}.{key}: only in {'plotly' if key in a else 'fast'}"
+            found = difference(a[key], b[key], f"{path}.{key}")
+            if found:
+                return found
+        return None
+    if isinstance(a, list) and isinstance(b, list):
+        if len(a) != len(b):
+            return f"{path}: {len(a)} vs {len(b)} items"
+        for i, (x, y) in enumerate(zip(a, b)):
+            found = difference(x, y, f"{path}[{i}]")
+            if found:
+                return found
+        return None
+    if isinstance(a, float) or isinstance(b, float):
+        if isinstance(a, (int, float)) and isinstance(b, (int, float)) and \
+                math.isclose(a, b, rel_tol=CHECK_CONFIG['rel_tolerance'], abs_tol=1e-12):
+            return None
+    if a != b:
+        return f"{path}: {a!r} vs {b!r}"
+    return None
+
+def prepare(df):
+    # The aggregates each dashboard view draws, computed with pandas
+    sums = {'Sales': 'sum', 'Profit': 'sum', 'Quantity': 'sum'}
+    monthly = df.groupby('Month Year').agg({'Sales': 'sum', 'Profit': 'sum', 'Order Date': 'first'}).reset_index()
+    monthly['Profit Margin'] = monthly['Profit'] / monthly['Sales'] * 100
+    subcategories = df.groupby(['Category', 'Sub-Category']).agg(
+        dict(sums, Discount='mean')).reset_index()
+    subcategories['Profit Margin'] = subcategories['Profit'] / subcategories['Sales'] * 100
+    subcategories['Revenue per Unit'] = subcategories['Sales'] / subcategories['Quantity']
+    subcategories['Profit per Unit'] = subcategories['Profit'] / subcategories['Quantity']
+    estimated = subcategories.assign(**{'Sales MOE': subcategories['Sales'] * 0.05,
+                                        'Profit MOE': subcategories['Profit'].abs() * 0.05})
+    states = df.groupby('State').agg({'Sales': 'sum', 'Profit': 'sum', 'Order ID': 'count',
+                                      'Customer Name': 'nunique'}).reset_index()
+    states['State_Code'] = states['State'].str[:2].str.upper()
+    states['Avg Order Value'] = states['Sales'] / states['Order ID']
+    states['Profit Margin'] = states['Profit'] / states['Sales'] * 100
+    shipping = df.assign(**{'Shipping Days': (pd.to_datetime(df['Ship Date']) - df['Order Date']).dt.days})
+    products = df.groupby('Product Name').agg(sums).reset_index()
+    products['Profit Margin'] = products['Profit'] / products['Sales'] * 100
+    products['Profit per Unit'] = products['Profit'] / products['Quantity']
+    customers = df.groupby('Customer Name').agg(sums).reset_index().nlargest(15, 'Sales')
+    customers['Profit Margin'] = customers['Profit'] / customers['Sales'] * 100
+    segments = df.groupby('Segment').agg(
+        Customers=('Customer Name', 'nunique'), Sales=('Sales', 'sum'),
+        **{'Avg Recency (days)': ('Quantity', 'mean')}).reset_index()
+    return {
+        'raw': df, 'monthly': monthly, 'subcategories': subcategories, 'estimated': estimated,
+        'states': states, 'shipping': shipping,
+        'regions': df.groupby('Region').agg({'Sales': 'sum', 'Profit': 'sum'}).reset_index(),
+        'products': products.nlargest(10, 'Sales'), 'profitable': products.nlargest(20, 'Profit'),
+        'ship_modes': df.groupby(['Ship Mode', 'Category']).agg({'Sales': 'sum'}).reset_index(),
+        'customers': customers, 'segments': segments
+    }
+
+def choropleth(geo, fast):
+    customdata = np.stack((geo['Sales'], geo['Profit'], geo['Profit Margin'], geo['Customer Name'],
+                           geo['Order ID'], geo['Avg Order Value']), axis=-1)
+    hover = "<b>%{text}</b><br>Sales: $%{customdata[0]:,.0f}<extra></extra>"
+    layout = dict(title={'text': 'Sales Distribution by State', 'y': 0.95, 'x': 0.5},
+                  geo=dict(scope='usa', showlakes=True), height=600, margin=dict(l=0, r=0, t=30, b=0))
+    if fast:
+        return ff.figure([dict(type='choropleth', locations=geo['State_Code'].to_numpy(), z=geo['Sales'].to_numpy(),
+                               locationmode='USA-states', colorscale=ff.colorscale('Viridis'),
+                               colorbar={'title': {'text': "Sales ($)"}}, text=geo['State'].to_numpy(),
+                               customdata=customdata, hovertemplate=hover)], layout)
+    fig = go.Figure(data=go.Choropleth(locations=geo['State_Code'], z=geo['Sales'], locationmode='USA-states',
+                                       colorscale='Viridis', colorbar_title="Sales ($)", text=geo['State'],
+                                       customdata=customdata))
+    fig.update_layout(template='plotly_white', **layout)
+    fig.update_traces(hovertemplate=hover)
+    return fig
+
+def boxes(rows, fast):
+    modes = rows['Ship Mode'].unique()
+    if fast:
+        return ff.figure([dict(type='box', name=mode, boxpoints='outliers',
+                               y=rows['Shipping Days'].to_numpy()[(rows['Ship Mode'] == mode).to_numpy()])
+                          for mode in modes],
+                         dict(title={'text': 'Shipping Days'}, yaxis={'title': {'text': 'Days to Ship'}},
+                              showlegend=True))
+    fig = go.Figure()
+    for mode in modes:
+        fig.add_trace(go.Box(y=rows[rows['Ship Mode'] == mode]['Shipping Days'], name=mode, boxpoints='outliers'))
+    fig.update_layout(title='Shipping Days', yaxis_title='Days to Ship', showlegend=True, template='plotly_white')
+    return fig
+
+def combo(customers, fast):
+    names = customers['Customer Name']
+    if fast:
+        return ff.figure([
+            dict(type='bar', x=names.to_numpy(), y=customers['Sales'].to_numpy(), name='Sales',
+                 marker=dict(color='#1f77b4')),
+            dict(type='scatter', x=names.to_numpy(), y=customers['Profit Margin'].to_numpy(), name='Profit Margin %',
+                 yaxis='y2', line=dict(color='#ff7f0e', width=2))
+        ], dict(title={'text': 'Top 15'}, xaxis={'title': {'text': "Customer"}, 'tickangle': -45},
+                yaxis2=dict(title={'text': 'Profit Margin %'}, overlaying='y', side='right'), barmode='group'))
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=names, y=customers['Sales'], name='Sales', marker_color='#1f77b4'))
+    fig.add_trace(go.Scatter(x=names, y=customers['Profit Margin'], name='Profit Margin %', yaxis='y2',
+                             line=dict(color='#ff7f0e', width=2)))
+    fig.update_layout(title='Top 15', xaxis_title="Customer", xaxis_tickangle=-45, barmode='group',
+                      yaxis2=dict(title='Profit Margin %', overlaying='y', side='right'), template='plotly_white')
+    return fig
+
+# (name, frame, Plotly Express / graph_objects figure, fast figure): the dashboard's charts
+VIEWS = [
+    ('line', 'monthly',
+     lambda f: px.line(f, x='Month Year', y='Sales', title='Monthly Sales Trend', template='plotly_white')
+     .update_layout(xaxis_title="Month", hovermode='x unified', showlegend=True),
+     lambda f: ff.update_layout(ff.line(f, x='Month Year', y='Sales', title='Monthly Sales Trend'),
+                                xaxis={'title': {'text': "Month"}}, hovermode='x unified', showlegend=True)),
+    ('line_error', 'monthly',
+     lambda f: px.line(f, x='Month Year', y='Sales', error_y='Profit', title='T', template='plotly_white'),
+     lambda f: ff.line(f, x='Month Year', y='Sales', error_y='Profit', title='T')),
+    ('treemap', 'subcategories',
+     lambda f: px.treemap(f, path=[px.Constant("All Categories"), 'Category', 'Sub-Category'], values='Sales',
+                          color='Profit', title='T', template='plotly_white', color_continuous_scale='RdYlBu')
+     .update_traces(textinfo="label+value"),
+     lambda f: ff.treemap(f, path=['Category', 'Sub-Category'], root="All Categories", values='Sales',
+                          color='Profit', title='T', color_continuous_scale='RdYlBu', textinfo="label+value")),
+    ('treemap_estimate', 'estimated',
+     lambda f: px.treemap(f, path=[px.Constant("All Categories"), 'Category', 'Sub-Category'], values='Sales',
+                          color='Profit', hover_data=['Sales MOE', 'Profit MOE'], title='T',
+                          template='plotly_white', color_continuous_scale='RdYlBu'),
+     lambda f: ff.treemap(f, path=['Category', 'Sub-Category'], root="All Categories", values='Sales',
+                          color='Profit', hover_data=['Sales MOE', 'Profit MOE'], title='T',
+                          color_continuous_scale='RdYlBu')),
+    ('choropleth', 'states', lambda f: choropleth(f, False), lambda f: choropleth(f, True)),
+    ('box', 'shipping', lambda f: boxes(f, False), lambda f: boxes(f, True)),
+    ('bar_wide', 'regions',
+     lambda f: px.bar(f, x='Region', y=['Sales', 'Profit'], title='T', barmode='group', template='plotly_white'),
+     lambda f: ff.bar(f, x='Region', y=['Sales', 'Profit'], title='T', barmode='group')),
+    ('bar_horizontal', 'products',
+     lambda f: px.bar(f, x='Sales', y='Product Name', title='T', orientation='h', template='plotly_white'),
+     lambda f: ff.bar(f, x='Sales', y='Product Name', title='T', orientation='h')),
+    ('bar_discrete', 'ship_modes',
+     lambda f: px.bar(f, x='Category', y='Sales', color='Ship Mode', title='T', template='plotly_white',
+                      barmode='group'),
+     lambda f: ff.bar(f, x='Category', y='Sales', color='Ship Mode', title='T', barmode='group')),
+    ('bar_continuous', 'segments',
+     lambda f: px.bar(f, x='Segment', y='Customers', color='Sales', hover_data=['Sales', 'Avg Recency (days)'],
+                      title='T', template='plotly_white', color_continuous_scale='Blues'),
+     lambda f: ff.bar(f, x='Segment', y='Customers', color='Sales', hover_data=['Sales', 'Avg Recency (days)'],
+                      title='T', color_continuous_scale='Blues')),
+    ('sunburst_rows', 'raw',
+     lambda f: px.sunburst(f, path=['Category', 'Sub-Category'], values='Sales', title='T', template='plotly_white'),
+     lambda f: ff.sunburst(f.groupby(['Category', 'Sub-Category'])['Sales'].sum().reset_index(),
+                           path=['Category', 'Sub-Category'], values='Sales', title='T')),
+    ('sunburst_estimate', 'estimated',
+     lambda f: px.sunburst(f, path=['Category', 'Sub-Category'], values='Sales', hover_data=['Sales MOE'],
+                           title='T', template='plotly_white'),
+     lambda f: ff.sunburst(f, path=['Category', 'Sub-Category'], values='Sales', hover_data=['Sales MOE'],
+                           title='T')),
+    ('sunburst_color', 'subcategories',
+     lambda f: px.sunburst(f, path=['Category', 'Sub-Category'], values='Sales', color='Profit Margin',
+                           hover_data=['Profit Margin', 'Discount', 'Revenue per Unit', 'Profit per Unit'],
+                           title='T', template='plotly_white', color_continuous_scale='RdYlBu')
+     .update_layout(height=600, coloraxis_colorbar_title="Profit Margin %"),
+     lambda f: ff.update_layout(
+         ff.sunburst(f, path=['Category', 'Sub-Category'], values='Sales', color='Profit Margin',
+                     hover_data=['Profit Margin', 'Discount', 'Revenue per Unit', 'Profit per Unit'],
+                     title='T', color_continuous_scale='RdYlBu'),
+         height=600, coloraxis={'colorbar': {'title': {'text': "Profit Margin %"}}})),
+    ('scatter', 'profitable',
+     lambda f: px.scatter(f, x='Sales', y='Profit', size='Quantity', color='Profit Margin', hover_name='Product Name',
+                          hover_data=['Profit Margin', 'Profit per Unit'], title='T', template='plotly_white',
+                          color_continuous_scale='RdYlBu').update_layout(xaxis_title="Total Sales ($)"),
+     lambda f: ff.update_layout(
+         ff.scatter(f, x='Sales', y='Profit', size='Quantity', color='Profit Margin', hover_name='Product Name',
+                    hover_data=['Profit Margin', 'Profit per Unit'], title='T', color_continuous_scale='RdYlBu'),
+         xaxis={'title': {'text': "Total Sales ($)"}})),
+    ('bar_scatter', 'customers', lambda f: combo(f, False), lambda f: combo(f, True))
+]
+
+def load_orders(path=None):
+    df = pd.read_csv(path or CHECK_CONFIG['source_path'])
+    df['Order Date'] = pd.to_datetime(df['Order Date'])
+    df['Month Year'] = df['Order Date'].dt.strftime('%Y-%m')
+    return df
+
+@pytest.fixture(scope='module')
+def frames():
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', FutureWarning)
+        return prepare(load_orders())
+
+@pytest.mark.parametrize('empty', [False, True], ids=['selection', 'empty'])
+@pytest.mark.parametrize('name, frame_name, plotly_figure, fast_figure', VIEWS, ids=[v[0] for v in VIEWS])
+def test_matches_plotly(frames, name, frame_name, plotly_figure, fast_figure, empty):
+    # Every view has to match on a selection and on one without rows
+    frame = frames[frame_name]
+    if empty:
+        frame = frame.iloc[:0]
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', FutureWarning)
+        expected = normalize(plotly_figure(frame))
+    assert difference(expected, normalize(fast_figure(frame))) is None